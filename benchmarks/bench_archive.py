@@ -0,0 +1,83 @@
+"""Online backup and archive sizes/times: what syncing two banks moves, full against incremental.
+
+Builds a synthetic bank, times backup_db() and a full write_archive() per compression
+(.jsonl.gz always, .jsonl.zst when zstandard is installed), then changes --changes questions
+and writes an incremental archive. A second bank is brought up to date from the full archive
+and then the incremental one, as a school machine syncing from another would be.
+Usage: python benchmarks/bench_archive.py [--size 1k|100k|1m] [--changes N]
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from synthetic_bank import DEFAULT_SEED, build_bank, parse_size
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def use_bank(path):
+    core.close_db()
+    core.DB_NAME = path
+    core.init_db()
+
+
+def change_questions(count):
+    """Edits every other one of the first questions and deletes the rest, through the normal writes."""
+    questions = core.get_questions_by_ids(range(1, count + 1))
+    for soru_id, question in questions.items():
+        if soru_id % 2:
+            core.update_question(soru_id, question[1] + " (güncellendi)", list(question[2:7]), question[7],
+                                 question[8])
+        else:
+            core.delete_question(soru_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="100k", help="1k, 100k, 1m veya soru sayısı")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--changes", type=int, default=200, help="Artımlı arşivden önce değiştirilecek soru sayısı")
+    args = parser.parse_args()
+    extensions = [".jsonl.gz"] + ([".jsonl.zst"] if importlib.util.find_spec("zstandard") else [])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = os.path.join(tmp, "kaynak.db"), os.path.join(tmp, "hedef.db")
+        count = parse_size(args.size)
+        print(f"{count:,} soruluk banka oluşturuluyor...", file=sys.stderr)
+        build_bank(source, count, args.seed)
+        use_bank(source)
+        core.get_pool().connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        print(f"{'veritabanı dosyası':<28} {os.path.getsize(source) / 1024:>12,.0f} KB")
+        size, seconds = timed(lambda: core.backup_db(os.path.join(tmp, "yedek.db")))
+        print(f"{'backup_db':<28} {size / 1024:>12,.0f} KB {seconds * 1000:>10.0f} ms")
+        for extension in extensions:
+            report, seconds = timed(lambda: core.write_archive(os.path.join(tmp, "tam" + extension)))
+            print(f"{'tam arşiv ' + extension:<28} {report.bytes / 1024:>12,.0f} KB {seconds * 1000:>10.0f} ms")
+        change_questions(args.changes)
+        report, seconds = timed(lambda: core.write_archive(os.path.join(tmp, "artim" + extensions[-1]),
+                                                           incremental=True))
+        print(f"{'artımlı arşiv ' + extensions[-1]:<28} {report.bytes / 1024:>12,.1f} KB {seconds * 1000:>10.0f} ms"
+              f"  ({report.questions} soru, {report.deleted} silinen)")
+
+        use_bank(target)
+        report, seconds = timed(lambda: core.apply_archive(os.path.join(tmp, "tam" + extensions[-1])))
+        print(f"{'tam arşivi uygula':<28} {'':>15} {seconds * 1000:>10.0f} ms  ({report.questions} soru)")
+        report, seconds = timed(lambda: core.apply_archive(os.path.join(tmp, "artim" + extensions[-1])))
+        print(f"{'artımlı arşivi uygula':<28} {'':>15} {seconds * 1000:>10.0f} ms  ({report.questions} soru, "
+              f"{report.deleted} silinen)")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Question images: PDF export with the shared print image cache against a copy per use, and list thumbnails.
+
+Builds a synthetic bank, stores --images distinct PNG images and puts one of them (in turn) in each
+of the first --rows questions, then exports those questions to PDF twice: with AttachmentImages as
+printing uses it (each image decoded once and embedded once), and with a cache that keeps nothing,
+so every question decodes and embeds its own copy, as inserting the image bytes per document would.
+Thumbnails compare decode_thumbnail() with decoding the full image and scaling it, for the PNG images
+and JPEG copies of them (a JPEG is decoded at the list's size directly). Runs on the offscreen Qt platform.
+Usage: python benchmarks/bench_attachments.py [--size 1k|100k|1m] [--rows N] [--images N] [--repeat N]
+"""
+import argparse
+import html
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from synthetic_bank import DEFAULT_SEED, build_bank, parse_size
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def make_images(count, image_format="PNG"):
+    """count distinct 800x500 drawings (figures of a size teachers paste into questions)."""
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QPointF
+    from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+    images = []
+    for i in range(count):
+        image = QImage(800, 500, QImage.Format_RGB32)
+        image.fill(QColor("white"))
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        for j in range(40):
+            painter.setPen(QPen(QColor.fromHsv((i * 37 + j * 11) % 360, 200, 180), 1 + j % 4))
+            painter.drawLine(QPointF(20 * j, 0), QPointF(800 - 13 * j, 500 - (j * i) % 500))
+        painter.drawText(40, 460, f"Şekil {i + 1}")
+        painter.end()
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, image_format)
+        images.append(bytes(data))
+    return images
+
+
+def attach_images(rows, images):
+    """Stores the images and rewrites the first rows questions as rich text showing one of them."""
+    digests = [core.add_attachment(data) for data in images]
+    questions = core.get_questions_by_ids(range(1, rows + 1))
+    for soru_id, question in questions.items():
+        text = (f'{core.RICH_TEXT_PREFIX}{html.escape(question[1])}<br>'
+                f'<img src="{core.attachment_url(digests[soru_id % len(digests)])}">')
+        core.update_question(soru_id, text, list(question[2:7]), question[7], question[8])
+    return len(questions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1k", help="1k, 100k, 1m veya soru sayısı")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--rows", type=int, default=300, help="Resim eklenip PDF'e yazılacak ilk soru sayısı")
+    parser.add_argument("--images", type=int, default=8, help="Farklı resim sayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QImage
+    from PyQt5.QtWidgets import QApplication
+    import soruBankası as gui
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, pdf_path = os.path.join(tmp, "resimli.db"), os.path.join(tmp, "resimli.pdf")
+        count = parse_size(args.size)
+        print(f"{count:,} soruluk banka oluşturuluyor...", file=sys.stderr)
+        build_bank(path, count, args.seed)
+        core.DB_NAME = path
+        core.init_db()
+        images = make_images(args.images)
+        rows = attach_images(args.rows, images)
+        print(f"{rows} soru, {len(images)} resim ({sum(map(len, images)) / 1024:,.0f} KB)")
+        print_filter = core.QuestionFilter(max_id=args.rows)
+
+        def export(shared):
+            def run():
+                gui.print_images = gui.AttachmentImages()  # a fresh cache, so the decoding is measured too
+                if not shared:
+                    gui.print_images.MAX_BYTES = 0  # keeps only the last image: every question decodes its own
+                gui.export_questions_pdf(pdf_path, question_filter=print_filter)
+            return run
+
+        print(f"{'durum':<30} {'medyan ms':>11} {'PDF KB':>10}")
+        for name, shared in (("pdf, paylaşılan resim", True), ("pdf, her kullanımda kopya", False)):
+            milliseconds = median_ms(export(shared), args.repeat)
+            print(f"{name:<30} {milliseconds:>11.0f} {os.path.getsize(pdf_path) / 1024:>10,.0f}")
+        gui.print_images = gui.AttachmentImages()
+
+        size = gui.ThumbnailCache.SIZE
+        for image_format, data_list in (("PNG", images), ("JPEG", make_images(args.images, "JPEG"))):
+            decode = lambda: [gui.decode_thumbnail(data, size) for data in data_list]
+            scale = lambda: [QImage.fromData(data).scaled(size, gui.Qt.KeepAspectRatio, gui.Qt.SmoothTransformation)
+                             for data in data_list]
+            for name, func in (("decode_thumbnail", decode), ("tam çöz + ölçekle", scale)):
+                milliseconds = median_ms(func, args.repeat) / len(data_list)
+                print(f"{f'küçük resim {image_format}, {name}':<30} {milliseconds:>11.2f}  (resim başına)")
+        core.close_db()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Pooled connection layer vs. the old connect-per-call data functions.
+
+Usage: python benchmarks/bench_db_pool.py [--rows N] [--reads N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+SAMPLE = ("Türkiye'nin başkenti neresidir?", ["İstanbul", "Ankara", "İzmir", "Bursa", ""], 1, "Coğrafya")
+
+
+def legacy_add(db_name, soru_metni, secenekler, dogru_secenek_index, kategori):
+    conn = sqlite3.connect(db_name)
+    conn.create_function("duz_metin", 1, core.plain_text, deterministic=True)  # the search index triggers use it
+    try:
+        conn.execute(core.INSERT_QUESTION_SQL,
+                     core._question_params(soru_metni, secenekler, dogru_secenek_index, kategori))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def legacy_get_all(db_name):
+    conn = sqlite3.connect(db_name)
+    try:
+        return conn.execute(core.SELECT_ALL_QUESTIONS_SQL).fetchall()
+    finally:
+        conn.close()
+
+
+def legacy_has_questions(db_name):
+    return bool(legacy_get_all(db_name))
+
+
+def timed(label, count, func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(count):
+            func()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<38} {count / elapsed:>12,.0f} ops/sec")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+        for db_name in (legacy_db, pooled_db):
+            core.DB_NAME = db_name
+            with contextlib.redirect_stdout(io.StringIO()):
+                core.init_db()
+        core.close_db()
+
+        results = {}
+        results["legacy insert"] = timed("connect-per-call add_question_to_db", args.rows,
+                                         lambda: legacy_add(legacy_db, *SAMPLE))
+        results["legacy read"] = timed("connect-per-call get_all_questions", args.reads,
+                                       lambda: legacy_get_all(legacy_db))
+        results["legacy exists"] = timed("connect-per-call emptiness check", args.reads,
+                                         lambda: legacy_has_questions(legacy_db))
+
+        core.DB_NAME = pooled_db
+        results["pooled insert"] = timed("pooled add_question_to_db", args.rows,
+                                         lambda: core.add_question_to_db(*SAMPLE))
+        results["pooled read"] = timed("pooled get_all_questions", args.reads, core.get_all_questions)
+        results["pooled exists"] = timed("pooled has_questions", args.reads, core.has_questions)
+        core.close_db()
+
+    for kind in ("insert", "read", "exists"):
+        print(f"speedup {kind:<7} x{results['pooled ' + kind] / results['legacy ' + kind]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""MinHash/LSH near-duplicate lookups vs. pairwise comparison over a synthetic bank.
+
+A fraction of the questions are copies of earlier ones with one word replaced and the
+options reordered; the report shows how many of those planted pairs are found.
+Usage: python benchmarks/bench_duplicates.py [--rows N] [--planted N] [--checks N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from bench_search import make_vocabulary
+
+
+def build_bank(rows, planted, seed=11):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    questions = [(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))) + "?",
+                  [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(5)])
+                 for _ in range(rows)]
+    pairs = []
+    for _ in range(planted):
+        original = rng.randrange(rows)
+        words = questions[original][0].split()
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        options = list(questions[original][1])
+        rng.shuffle(options)
+        questions.append((" ".join(words), options))
+        pairs.append((original + 1, len(questions)))
+    return questions, pairs
+
+
+def pairwise_seconds(questions, sample):
+    """Times an exact shingle-Jaccard all-pairs pass over `sample` questions."""
+    def shingles(text):
+        return {text[i:i + core.DUPLICATE_SHINGLE_SIZE] for i in range(max(len(text) - 4, 1))}
+    sets = [shingles(core.canonical_question_text(text, options)) for text, options in questions[:sample]]
+    start = time.perf_counter()
+    for i in range(len(sets)):
+        for j in range(i + 1, len(sets)):
+            len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--planted", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=1000)
+    parser.add_argument("--pairwise-sample", type=int, default=1500)
+    args = parser.parse_args()
+
+    questions, pairs = build_bank(args.rows, args.planted)
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "duplicates.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        core.insert_questions_bulk([core._question_params(text, options, 0, "Genel")
+                                    for text, options in questions], sign=False)
+        total = len(questions)
+        print(f"{total:,} soru, {len(pairs)} yerleştirilmiş benzer çift")
+
+        start = time.perf_counter()
+        core.sync_duplicate_index()
+        build = time.perf_counter() - start
+        print(f"{'indeks kurulumu':<34} {build:>9.2f} sn ({build / total * 1e6:.0f} µs/soru)")
+
+        rng = random.Random(3)
+        sample = [questions[rng.randrange(total)] for _ in range(args.checks)]
+        start = time.perf_counter()
+        for text, options in sample:
+            core.find_similar_questions(text, options)
+        print(f"{'tek soru kontrolü (LSH)':<34} {(time.perf_counter() - start) / args.checks * 1e6:>9.0f} µs")
+
+        sample_seconds = pairwise_seconds(questions, args.pairwise_sample)
+        per_pair = sample_seconds / (args.pairwise_sample * (args.pairwise_sample - 1) / 2)
+        print(f"{'tek soru kontrolü (ikili, tahmini)':<34} {per_pair * total * 1e6:>9.0f} µs")
+
+        start = time.perf_counter()
+        groups = core.find_duplicate_groups()
+        group_of = {soru_id: number for number, (ids, _) in enumerate(groups) for soru_id in ids}
+        recall = sum(1 for a, b in pairs if a in group_of and group_of.get(b) == group_of[a])
+        print(f"{'toplu rapor (LSH)':<34} {time.perf_counter() - start:>9.2f} sn, "
+              f"{len(groups)} grup, bulunan çift %{recall / len(pairs) * 100:.1f}")
+        print(f"{'toplu rapor (ikili, tahmini)':<34} {per_pair * total * (total - 1) / 2:>9.0f} sn")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
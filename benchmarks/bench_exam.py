@@ -0,0 +1,70 @@
+"""Indexed exam sampling vs. ORDER BY RANDOM(), plus booklet throughput per worker count.
+
+Usage: python benchmarks/bench_exam.py [--rows N] [--per-category N] [--variants N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+CATEGORIES = ("Matematik", "Fizik", "Kimya", "Biyoloji", "Tarih", "Coğrafya", "Türkçe", "Genel")
+
+
+def fill(rows, seed=3):
+    rng = random.Random(seed)
+    core.insert_questions_bulk(
+        core._question_params(f"Soru {i}: aşağıdakilerden hangisi doğrudur?",
+                              [f"Seçenek {i}-{j}" for j in range(rng.randint(3, 5))],
+                              rng.randrange(3), rng.choice(CATEGORIES))
+        for i in range(rows))
+
+
+def order_by_random(weights):
+    conn = core.get_pool().connection()
+    return [(kategori, conn.execute(f"SELECT {core.QUESTION_COLUMNS} FROM sorular WHERE kategori = ? "
+                                    "ORDER BY RANDOM() LIMIT ?", (kategori, count)).fetchall())
+            for kategori, count in weights.items()]
+
+
+def timed_ms(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--per-category", type=int, default=10)
+    parser.add_argument("--variants", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "exam.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        fill(args.rows)
+        weights = dict.fromkeys(CATEGORIES, args.per_category)
+        rng = random.Random(1)
+        print(f"{args.rows:,} soru, kategori başına {args.per_category} soru")
+        print(f"ORDER BY RANDOM()      {timed_ms(lambda: order_by_random(weights)):>9.2f} ms/sınav")
+        print(f"indeksli örnekleme     {timed_ms(lambda: core.draw_exam_questions(weights, rng=rng)):>9.2f} ms/sınav")
+
+        for workers in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            core.generate_exam_batch(weights, os.path.join(tmp, f"out{workers}"), variants=args.variants,
+                                     seed=1, output_format="json", workers=workers)
+            print(f"{args.variants} kitapçık, {workers} süreç  {time.perf_counter() - start:>9.2f} sn")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Vectorized exam grading vs. a per-sheet Python loop over simulated answer sheets.
+
+Sheets come from a simple ability model (better students pick the key more often), spread
+over several booklets with shuffled options, so the booklet-to-question mapping is
+exercised as in a real exam. Exits with status 1 when grading takes longer than --budget.
+Usage: python benchmarks/bench_grading.py [--sheets N] [--questions N] [--booklets N] [--budget SEC]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+
+def make_answer_key(questions, booklets, rng):
+    """{kitapcik: [(soru_id, cevap, secenek_sirasi), ...]} as load_answer_key() returns it."""
+    correct = {soru_id: rng.randrange(5) for soru_id in range(1, questions + 1)}
+    key = {}
+    for index in range(booklets):
+        order = list(correct)
+        rng.shuffle(order)
+        entries = []
+        for soru_id in order:
+            options = list(range(5))
+            rng.shuffle(options)
+            entries.append((soru_id, chr(65 + options.index(correct[soru_id])), "".join(chr(65 + j) for j in options)))
+        key[core.booklet_label(index)] = entries
+    return key
+
+
+def make_sheets(key, count, seed):
+    generator = numpy.random.default_rng(seed)
+    labels = list(key)
+    questions = len(key[labels[0]])
+    ability = generator.random(count)
+    booklet = generator.integers(len(labels), size=count)
+    keys = numpy.array([[ord(cevap) for _, cevap, _ in key[label]] for label in labels], dtype=numpy.uint8)
+    draw = generator.random((count, questions))
+    marks = numpy.where(draw < 0.2 + 0.7 * ability[:, None], keys[booklet],
+                        generator.integers(65, 70, size=(count, questions), dtype=numpy.uint8))
+    marks[generator.random((count, questions)) < 0.04] = ord(" ")
+    return [(f"ogr{i}", labels[b], row.tobytes().decode("ascii")) for i, (b, row) in enumerate(zip(booklet, marks))]
+
+
+def grade_in_python(key, sheets):
+    """The straightforward version: one dict lookup and comparison per answer."""
+    scores, item_correct = [], {}
+    for _, kitapcik, cevaplar in sheets:
+        score = 0
+        for position, (soru_id, cevap, _) in enumerate(key[kitapcik]):
+            if cevaplar[position:position + 1].upper() == cevap:
+                score += 1
+                item_correct[soru_id] = item_correct.get(soru_id, 0) + 1
+        scores.append(score)
+    return scores, item_correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=100_000)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--booklets", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=1.0, help="Vektörel puanlama için üst sınır (sn)")
+    args = parser.parse_args()
+
+    key = make_answer_key(args.questions, args.booklets, random.Random(7))
+    sheets = make_sheets(key, args.sheets, 7)
+    print(f"{args.sheets:,} kağıt, {args.questions} soru, {args.booklets} kitapçık")
+
+    start = time.perf_counter()
+    report = core.grade_answer_sheets(key, sheets)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    scores, _ = grade_in_python(key, sheets)
+    python_loop = time.perf_counter() - start
+    assert scores == report.correct.tolist()
+    print(f"{'vektörel puanlama + madde analizi':<36} {vectorized:>7.3f} sn")
+    print(f"{'Python döngüsü (yalnız puan)':<36} {python_loop:>7.3f} sn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cevaplar.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("ogrenci", "kitapcik", "cevaplar"))
+            writer.writerows(sheets)
+        start = time.perf_counter()
+        sheets = list(core.iter_answer_sheets(path))
+        print(f"{'CSV okuma':<36} {time.perf_counter() - start:>7.3f} sn")
+
+        core.DB_NAME = os.path.join(tmp, "grading.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        core.insert_questions_bulk(core._question_params(f"Soru {i}?", list("abcde"), 0, "Genel")
+                                   for i in range(args.questions))
+        start = time.perf_counter()
+        stored = core.store_item_analysis(report)
+        print(f"{'madde analizini kaydetme':<36} {time.perf_counter() - start:>7.3f} sn ({stored} soru)")
+        core.close_db()
+
+    within = vectorized <= args.budget
+    print(f"Puanlama {'bütçe içinde' if within else 'BÜTÇEYİ AŞTI'} ({vectorized:.3f} / {args.budget:.1f} sn)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
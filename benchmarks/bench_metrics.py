@@ -0,0 +1,69 @@
+"""Cost of the soru_bankasi_metrics hooks with tracing off and on.
+
+Times a no-op call bare, wrapped by timed() and inside span(), then a cached page read
+(get_questions_page) with tracing off and on, to show what the hooks add on hot paths.
+Usage: python benchmarks/bench_metrics.py [--calls N] [--rows N] [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+import soru_bankasi_metrics as metrics
+from bench_search import fill, timed_ms
+
+
+def noop():
+    return None
+
+timed_noop = metrics.timed("bench.noop")(noop)
+
+def span_noop():
+    with metrics.span("bench.span"):
+        return None
+
+
+def ns_per_call(func, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for enabled in (False, True):
+        metrics.enable(enabled)
+        state = "açık" if enabled else "kapalı"
+        print(f"{'boş çağrı':<34} {ns_per_call(noop, args.calls):>8.0f} ns")
+        print(f"{'timed(), ölçüm ' + state:<34} {ns_per_call(timed_noop, args.calls):>8.0f} ns")
+        print(f"{'span(), ölçüm ' + state:<34} {ns_per_call(span_noop, args.calls):>8.0f} ns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "metrics.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        fill(args.rows)
+        core.get_questions_page(0, False, 200, 0)
+        for enabled in (False, True):
+            metrics.enable(enabled)
+            page_ms, _ = timed_ms(lambda: core.get_questions_page(0, False, 200, 0), args.repeat)
+            print(f"{'200 satırlık sayfa, ölçüm ' + ('açık' if enabled else 'kapalı'):<34} {page_ms:>8.3f} ms")
+        metrics.enable(False)
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
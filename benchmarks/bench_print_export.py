@@ -0,0 +1,124 @@
+"""Streaming PDF export vs. the single in-memory QTextDocument print path.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+Usage: python benchmarks/bench_print_export.py [--rows N]
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+
+
+def legacy_prepare_document(m, questions_to_print):
+    """The pre-streaming document builder, kept verbatim as the baseline (formats rebuilt per question)."""
+    document = m.QTextDocument()
+    cursor = m.QTextCursor(document)
+    try: base_font_family = "Segoe UI"; m.QFont(base_font_family)
+    except: base_font_family = "Arial"
+    title_format = m.QTextCharFormat(); title_font = m.QFont(base_font_family, 16, m.QFont.Bold)
+    title_format.setFont(title_font); title_format.setForeground(m.QBrush(m.QColor(m.NAVY_PRIMARY)))
+    cursor.insertText("Mini Soru Bankası - Soru Listesi\n\n", title_format)
+    question_font_bold = m.QFont(base_font_family, 12, m.QFont.Bold)
+    question_font_normal = m.QFont(base_font_family, 12)
+    option_font = m.QFont(base_font_family, 10)
+    option_font_bold_correct = m.QFont(base_font_family, 10, m.QFont.Bold)
+    category_font = m.QFont(base_font_family, 9, m.QFont.Normal, italic=True)
+    for i, q_data in enumerate(questions_to_print):
+        q_fmt_b = m.QTextCharFormat(); q_fmt_b.setFont(question_font_bold); q_fmt_b.setForeground(m.QBrush(m.QColor(m.TEXT_NAVY_HEADER)))
+        cursor.insertText(f"Soru {i+1} (ID: {q_data[0]}): ", q_fmt_b)
+        q_fmt_n = m.QTextCharFormat(); q_fmt_n.setFont(question_font_normal); q_fmt_n.setForeground(m.QBrush(m.QColor(m.TEXT_ON_LIGHT_BG)))
+        cursor.insertText(f"{q_data[1]}\n", q_fmt_n)
+        correct_option_index = q_data[7]
+        for j in range(5):
+            option_text = q_data[2+j]
+            if option_text or (j == correct_option_index and correct_option_index is not None):
+                opt_char_format = m.QTextCharFormat()
+                prefix = "    "; option_label = f"{chr(65+j)})"
+                current_option_text = option_text if option_text else "[BOŞ]"
+                opt_char_format.setForeground(m.QBrush(m.QColor(m.TEXT_ON_LIGHT_BG)))
+                if j == correct_option_index:
+                    opt_char_format.setFont(option_font_bold_correct)
+                    opt_char_format.setForeground(m.QBrush(m.QColor(m.RED_PRIMARY)))
+                    prefix = "  * "
+                else: opt_char_format.setFont(option_font)
+                cursor.insertText(f"{prefix}{option_label} {current_option_text}\n", opt_char_format)
+        if q_data[8] and q_data[8].lower() != "genel":
+            cat_fmt = m.QTextCharFormat(); cat_fmt.setFont(category_font); cat_fmt.setForeground(m.QBrush(m.QColor(m.NAVY_ACCENT)))
+            cursor.insertText(f"    Kategori: {q_data[8]}\n", cat_fmt)
+        cursor.insertBlock()
+    return document
+
+
+def run_mode(mode, db_name, pdf_path):
+    m = importlib.import_module("soruBankası")
+    core.DB_NAME = db_name
+    app = m.ensure_headless_gui_app()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "legacy":
+            document = legacy_prepare_document(m, core.get_all_questions())
+            printer = m.create_pdf_printer(pdf_path)
+            document.print_(printer)
+            del printer
+        else:
+            m.export_questions_pdf(pdf_path)
+    elapsed = time.perf_counter() - start
+    with open(pdf_path, "rb") as f:
+        pages = len(re.findall(rb"/Type\s*/Page[^s]", f.read()))
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"mode": mode, "seconds": elapsed, "pages": pages, "peak_rss_mb": peak_rss_mb}))
+    del app
+
+
+def build_db(db_name, rows):
+    core.DB_NAME = db_name
+    rng = random.Random(7)
+    words = ("ışık", "hız", "öğrenci", "şehir", "güneş", "çiçek", "dağ", "Osmanlı", "devlet", "enerji", "hücre", "iklim")
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.init_db()
+    core.insert_questions_bulk(
+        core._question_params(" ".join(rng.choice(words) for _ in range(rng.randint(8, 40))) + "?",
+                              [" ".join(rng.choice(words) for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(2, 5))],
+                              rng.randrange(2), rng.choice(("Genel", "Fizik", "Tarih")))
+        for _ in range(rows))
+    core.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--mode", choices=("legacy", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.db, os.path.join(os.path.dirname(args.db), f"{args.mode}.pdf"))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "print.db")
+        build_db(db_name, args.rows)
+        print(f"{args.rows:,} soru")
+        print(f"{'yol':<8} {'saniye':>8} {'sayfa':>7} {'sayfa/sn':>9} {'tepe RSS MB':>12}")
+        for mode in ("legacy", "stream"):
+            output = subprocess.run([sys.executable, __file__, "--mode", mode, "--db", db_name],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<8} {result['seconds']:>8.2f} {result['pages']:>7} "
+                  f"{result['pages'] / result['seconds']:>9.1f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Repeated print preview repaints with and without the per-question layout cache.
+
+A PDF printer stands in for the preview's paint device; each repaint renders the
+whole list the way QPrintPreviewDialog.paintRequested does.
+Usage: python benchmarks/bench_print_preview.py [--rows N] [--repaints N]
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+soru_bankasi = importlib.import_module("soruBankası")
+from bench_print_export import build_db
+
+
+def repaint_ms(renderer, pdf_path, repaints):
+    timings = []
+    for _ in range(repaints):
+        printer = soru_bankasi.create_pdf_printer(pdf_path)
+        start = time.perf_counter()
+        renderer.render(printer)
+        timings.append((time.perf_counter() - start) * 1000)
+        del printer
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repaints", type=int, default=3)
+    args = parser.parse_args()
+
+    app = soru_bankasi.ensure_headless_gui_app()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "preview.db")
+        pdf_path = os.path.join(tmp, "preview.pdf")
+        build_db(db_name, args.rows)
+        core.DB_NAME = db_name
+        formats = soru_bankasi.PrintFormats()
+        uncached = soru_bankasi.StreamingPrintRenderer(formats)
+        cached = soru_bankasi.StreamingPrintRenderer(formats, soru_bankasi.PrintLayoutCache(formats))
+
+        print(f"{args.rows:,} soru")
+        print(f"{'yol':<28} {'ms/yeniden çizim':>18}")
+        timings = repaint_ms(uncached, pdf_path, args.repaints)
+        print(f"{'önbelleksiz':<28} {sum(timings) / len(timings):>18.1f}")
+        timings = repaint_ms(cached, pdf_path, args.repaints + 1)
+        print(f"{'önbellek (ilk çizim)':<28} {timings[0]:>18.1f}")
+        print(f"{'önbellek (değişiklik yok)':<28} {sum(timings[1:]) / len(timings[1:]):>18.1f}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.add_question_to_db("Önizleme sırasında eklenen soru?", ["Evet", "Hayır"], 0, "Genel")
+        timings = repaint_ms(cached, pdf_path, 1)
+        print(f"{'önbellek (1 soru eklendi)':<28} {timings[0]:>18.1f}")
+        soru_bankasi.close_db()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Memory per question and read times of the shared QuestionCache vs. plain row tuples.
+
+Reports tracemalloc bytes per question for a fetchall() of every row, for the cache's
+resident columns and for the cache with question texts held, then page reads and a
+full id-order scan with and without the cache.
+Usage: python benchmarks/bench_question_cache.py [--rows N] [--repeat N]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from bench_search import fill, timed_ms
+
+
+def allocated(func):
+    """Returns (result, bytes still allocated by func once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def sql_page(offset, limit=200):
+    return core.get_pool().connection().execute(
+        f"SELECT {core.QUESTION_COLUMNS} FROM sorular ORDER BY id LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+
+
+def keyset_scan(batch_size=500):
+    conn, last_id, count = core.get_pool().connection(), -1, 0
+    while True:
+        rows = conn.execute(f"SELECT {core.QUESTION_COLUMNS} FROM sorular WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch_size)).fetchall()
+        count += len(rows)
+        if len(rows) < batch_size:
+            return count
+        last_id = rows[-1][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "cache.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        fill(args.rows)
+        total = args.rows
+        print(f"{total:,} soru")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows, size = allocated(core.get_all_questions)
+        print(f"{'tüm satırlar (tuple listesi)':<34} {size / total:>8.0f} bayt/soru")
+        del rows
+
+        cache = core.QuestionCache(core.DB_NAME, max_text_chars=10 ** 9)
+        _, size = allocated(lambda: len(cache.rows([])))
+        print(f"{'önbellek, yalnız sütun dizileri':<34} {size / total:>8.0f} bayt/soru")
+        _, size = allocated(lambda: len(cache.rows(range(1, total + 1))))
+        print(f"{'önbellek, metinler dahil':<34} {size / total:>8.0f} bayt/soru (ek)")
+
+        cache = core.get_question_cache()
+        offsets = [(i * 7919) % max(total - 200, 1) for i in range(args.repeat)]
+        pages = iter(offsets * 2)
+        sql_ms, _ = timed_ms(lambda: sql_page(next(pages)), args.repeat)
+        core.get_questions_page(0, False, 200, offsets[0])
+        pages = iter(offsets * 2)
+        for offset in offsets:
+            core.get_questions_page(0, False, 200, offset)
+        cached_ms, _ = timed_ms(lambda: core.get_questions_page(0, False, 200, next(pages)), args.repeat)
+        print(f"{'200 satırlık sayfa, SQL':<34} {sql_ms:>8.2f} ms")
+        print(f"{'200 satırlık sayfa, önbellek':<34} {cached_ms:>8.2f} ms ({len(cache._texts):,} metin önbellekte)")
+
+        start = time.perf_counter()
+        keyset_scan()
+        print(f"{'tam tarama, SQL keyset':<34} {(time.perf_counter() - start) * 1000:>8.0f} ms")
+        start = time.perf_counter()
+        scanned = sum(1 for _ in core.iter_all_questions())
+        print(f"{'tam tarama, önbellek':<34} {(time.perf_counter() - start) * 1000:>8.0f} ms "
+              f"({scanned:,} soru, önbellekte kalan metin {len(cache._texts):,})")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
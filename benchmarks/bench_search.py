@@ -0,0 +1,85 @@
+"""FTS5 search vs. a LIKE '%...%' scan over a synthetic bank.
+
+Usage: python benchmarks/bench_search.py [--rows N] [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+WORDS = ("ışık", "hızı", "İstanbul", "Ankara", "şehir", "öğrenci", "güneş", "çiçek", "dağ", "ırmak",
+         "hangisidir", "aşağıdakilerden", "nedir", "kaç", "toplam", "sayı", "Osmanlı", "devlet",
+         "enerji", "kuvvet", "hücre", "bölge", "iklim", "ülke", "savaş", "antlaşma", "kimya", "element")
+CATEGORIES = ("Matematik", "Fizik", "Kimya", "Biyoloji", "Tarih", "Coğrafya", "Türkçe", "Genel")
+SYLLABLES = ("ka", "le", "mi", "şı", "ğa", "tür", "öz", "çe", "ba", "lık", "dır", "ün", "se", "ro", "ya", "gü")
+QUERIES = ("ışık", "istanbul", "osmanli devlet", "ogrenci", "antlaşma")
+
+
+def make_vocabulary(rng, size=5000):
+    generated = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)}
+    return list(WORDS) + sorted(generated)
+
+
+def fill(rows, seed=42):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    def question():
+        text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))) + "?"
+        options = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))) for _ in range(5)]
+        return core._question_params(text, options, rng.randrange(5), rng.choice(CATEGORIES))
+    with core.get_pool().transaction() as conn:
+        conn.executemany(core.INSERT_QUESTION_SQL, (question() for _ in range(rows)))
+
+
+def fts_search(text, limit=100):
+    """What the list view runs per keystroke: match count plus the first ranked page."""
+    return core.count_questions(text), core.search_questions(text, limit)
+
+
+def like_search(text, limit=100):
+    conn = core.get_pool().connection()
+    params = (f"%{text}%",) * len(core.QUESTION_SEARCH_COLUMNS)
+    where_sql = " OR ".join(f"{column} LIKE ?" for column in core.QUESTION_SEARCH_COLUMNS)
+    count = conn.execute(f"SELECT count(*) FROM sorular WHERE {where_sql}", params).fetchone()[0]
+    rows = conn.execute(f"SELECT {core.QUESTION_COLUMNS} FROM sorular WHERE {where_sql} ORDER BY id LIMIT ?",
+                        params + (limit,)).fetchall()
+    return count, rows
+
+
+def timed_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "search.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        start = time.perf_counter()
+        fill(args.rows)
+        print(f"{args.rows:,} soru eklendi ({time.perf_counter() - start:.2f}s, FTS triggers dahil)")
+        print(f"{'sorgu':<18} {'FTS ms':>9} {'LIKE ms':>9} {'FTS eşleşme':>12} {'LIKE eşleşme':>13}")
+        for query in QUERIES:
+            fts_ms, (fts_count, _) = timed_ms(lambda: fts_search(query), args.repeat)
+            like_ms, (like_count, _) = timed_ms(lambda: like_search(query), args.repeat)
+            print(f"{query:<18} {fts_ms:>9.2f} {like_ms:>9.2f} {fts_count:>12} {like_count:>13}")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Load test of the HTTP/JSON server: requests/sec and latency percentiles under concurrent clients.
+
+Starts `soru_bankasi_cli.py serve` on a temporary database, then runs --clients keep-alive
+connections for --seconds each phase: a read-mostly mix (list pages revalidated with
+If-None-Match, searches, single questions, 5% inserts), then single-question POSTs vs.
+the same inserts sent 50 at a time through /api/toplu.
+Usage: python benchmarks/bench_server.py [--rows N] [--clients N] [--seconds S]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from bench_search import make_vocabulary
+
+CLI = os.path.join(os.path.dirname(ROOT), "soru_bankasi_cli.py")
+
+
+class Client:
+    """Minimal keep-alive HTTP/1.1 client that remembers ETags per path."""
+
+    def __init__(self, port):
+        self.port = port
+        self.etags = {}
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+    async def request(self, method, path, body=None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        headers = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+        if method == "GET" and path in self.etags:
+            headers += f"If-None-Match: {self.etags[path]}\r\n"
+        self.writer.write(headers.encode() + b"\r\n" + data)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+            elif name.lower() == "etag":
+                self.etags[path] = value.strip()
+        if length:
+            await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        self.writer.close()
+
+
+def question_body(rng, vocabulary):
+    return {"soru_metni": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 16))) + "?",
+            "secenekler": [rng.choice(vocabulary) for _ in range(4)], "dogru_secenek_index": 0,
+            "kategori": rng.choice(("Tarih", "Fizik", "Türkçe"))}
+
+
+async def run_phase(port, clients, seconds, pick):
+    """Each client loops pick(rng) -> (kind, method, path, body); returns {kind: [latency s]}, statuses, elapsed."""
+    latencies, statuses = {}, {}
+    deadline = time.perf_counter() + seconds
+
+    async def worker(seed):
+        rng = random.Random(seed)
+        client = Client(port)
+        await client.connect()
+        while time.perf_counter() < deadline:
+            kind, method, path, body = pick(rng)
+            start = time.perf_counter()
+            status = await client.request(method, path, body)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+        client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def report(title, latencies, statuses, elapsed, unit_per_request=1):
+    total = sum(len(values) for values in latencies.values())
+    print(f"{title}: {total / elapsed:,.0f} istek/sn"
+          + (f" ({total * unit_per_request / elapsed:,.0f} soru/sn)" if unit_per_request > 1 else "")
+          + f", durumlar {dict(sorted(statuses.items()))}")
+    for kind, values in sorted(latencies.items()):
+        print(f"  {kind:<14} {len(values):>7}  p50 {percentile(values, 0.5) * 1000:7.2f} ms"
+              f"  p99 {percentile(values, 0.99) * 1000:7.2f} ms")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def status(port):
+    client = Client(port)
+    await client.connect()
+    client.writer.write(b"GET /api/durum HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    data = await client.reader.read()
+    client.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+async def main_async(args, port):
+    rng = random.Random(5)
+    vocabulary = make_vocabulary(rng)
+    words = [w for w in vocabulary[:200]]
+
+    def mixed(rng):
+        roll = rng.random()
+        if roll < 0.50:
+            return "liste (ETag)", "GET", f"/api/sorular?limit=50&offset={rng.randrange(20) * 50}", None
+        if roll < 0.70:
+            return "arama", "GET", f"/api/ara?q={rng.choice(words)}&limit=20", None
+        if roll < 0.95:
+            return "tek soru", "GET", f"/api/sorular/{rng.randint(1, args.rows)}", None
+        return "ekleme", "POST", "/api/sorular", question_body(rng, vocabulary)
+
+    def single_writes(rng):
+        return "ekleme", "POST", "/api/sorular", question_body(rng, vocabulary)
+
+    def batched_writes(rng):
+        return "toplu (50)", "POST", "/api/toplu", {"istekler": [
+            {"method": "POST", "path": "/api/sorular", "body": question_body(rng, vocabulary)} for _ in range(50)]}
+
+    print(f"{args.rows:,} soru, {args.clients} istemci, aşama başına {args.seconds} sn")
+    report("karışık yük", *await run_phase(port, args.clients, args.seconds, mixed))
+    before = await status(port)
+    report("tek tek ekleme", *await run_phase(port, args.clients, args.seconds, single_writes))
+    after = await status(port)
+    writes, batches = after["yazma"] - before["yazma"], after["yazma_grubu"] - before["yazma_grubu"]
+    print(f"  yazıcı: {writes} yazma {batches} işlemde (işlem başına {writes / max(batches, 1):.1f})")
+    report("toplu ekleme", *await run_phase(port, args.clients, args.seconds, batched_writes), unit_per_request=50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "server.db")
+        core.DB_NAME = db
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        rng = random.Random(1)
+        vocabulary = make_vocabulary(rng)
+        core.insert_questions_bulk(core._question_params(*question_body(rng, vocabulary).values())
+                                   for _ in range(args.rows))
+        core.sync_duplicate_index()
+        core.close_db()
+
+        port = free_port()
+        server = subprocess.Popen([sys.executable, CLI, "--db", db, "serve", "--port", str(port),
+                                   "--readers", str(args.readers)], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            server.stdout.readline()  # the "listening" line
+            # Keep draining: DEBUG lines printed into a full pipe would block the server.
+            threading.Thread(target=server.stdout.read, daemon=True).start()
+            asyncio.run(main_async(args, port))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Cold start time of the headless entry points vs. the Qt GUI module, each in a fresh interpreter.
+
+The CLI must stay under STARTUP_BUDGET_MS and the core module must not pull in PyQt5.
+Usage: python benchmarks/bench_startup.py [--repeat N] [--rows N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+
+STARTUP_BUDGET_MS = 100
+CLI = os.path.join(ROOT, "soru_bankasi_cli.py")
+
+
+def median_ms(command, repeat):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    loaded = subprocess.run([sys.executable, "-c", "import sys, soru_bankasi_cli; "
+                             "print(','.join(m for m in sys.modules if m.startswith('PyQt5')))"],
+                            env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True, check=True).stdout.strip()
+    print(f"CLI ile yüklenen Qt modülleri: {loaded or 'yok'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "startup.db")
+        core.DB_NAME = db
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        core.insert_questions_bulk(core._question_params(f"Soru {i}?", ["A", "B", "C"], 0, f"Kategori {i % 20}")
+                                   for i in range(args.rows))
+        core.close_db()
+
+        cases = (
+            ("python (boş)", [sys.executable, "-c", "pass"]),
+            ("import soru_bankasi_core", [sys.executable, "-c", "import soru_bankasi_core"]),
+            ("cli stats", [sys.executable, CLI, "--db", db, "stats"]),
+            ("cli search", [sys.executable, CLI, "--db", db, "search", "4242", "--limit", "5"]),
+            ("import soruBankası (Qt)", [sys.executable, "-c", "import soruBankası"]),
+        )
+        print(f"{args.rows:,} soru, {args.repeat} tekrar, medyan")
+        for name, command in cases:
+            elapsed = median_ms(command, args.repeat)
+            flag = "  (bütçe aşıldı)" if name.startswith("cli") and elapsed > STARTUP_BUDGET_MS else ""
+            print(f"{name:<28} {elapsed:>8.1f} ms{flag}")
+
+
+if __name__ == "__main__":
+    main()
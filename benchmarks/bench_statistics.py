@@ -0,0 +1,73 @@
+"""Statistics dashboard from the istatistikler aggregates vs. the equivalent GROUP BY scans.
+
+Also times single-row inserts with and without the statistics triggers, since that is
+where the aggregates are paid for.
+Usage: python benchmarks/bench_statistics.py [--rows N] [--repeat N] [--inserts N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+from bench_search import fill, timed_ms
+
+
+def scan_statistics():
+    """What the dashboard would need without aggregates: one pass per counter family."""
+    conn = core.get_pool().connection()
+    filled = " + ".join(f"(coalesce(secenek{j}, '') <> '')" for j in range(1, 6))
+    correct = " ".join(f"WHEN {j} THEN secenek{j + 1}" for j in range(5))
+    return {
+        "toplam": conn.execute("SELECT count(*) FROM sorular").fetchone()[0],
+        "kategori": conn.execute("SELECT coalesce(kategori, ''), count(*) FROM sorular GROUP BY 1").fetchall(),
+        "cevap": conn.execute("SELECT dogru_secenek_index, count(*) FROM sorular GROUP BY 1").fetchall(),
+        "secenek_sayisi": conn.execute(f"SELECT {filled}, count(*) FROM sorular GROUP BY 1").fetchall(),
+        "dogru_sik_bos": conn.execute(f"SELECT count(*) FROM sorular WHERE dogru_secenek_index BETWEEN 0 AND 4 "
+                                      f"AND coalesce(CASE dogru_secenek_index {correct} END, '') = ''").fetchone()[0],
+    }
+
+
+def insert_ms(count):
+    params = core._question_params("Ölçüm sorusu?", ["a", "b", "c", "d", "e"], 0, "Genel")
+    start = time.perf_counter()
+    for _ in range(count):
+        with core.get_pool().transaction() as conn:
+            conn.execute(core.INSERT_QUESTION_SQL, params)
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--inserts", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core.DB_NAME = os.path.join(tmp, "statistics.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.init_db()
+        fill(args.rows)
+        print(f"{args.rows:,} soru")
+        aggregate_ms, statistics = timed_ms(core.get_statistics, args.repeat)
+        scan_ms, _ = timed_ms(scan_statistics, args.repeat)
+        print(f"{'pano, istatistikler tablosu':<32} {aggregate_ms:>9.3f} ms ({sum(map(len, statistics.values()))} satır)")
+        print(f"{'pano, GROUP BY taramaları':<32} {scan_ms:>9.3f} ms")
+
+        with_triggers = insert_ms(args.inserts)
+        core.get_pool().connection().execute("DROP TRIGGER sorular_istatistik_ai")
+        without_triggers = insert_ms(args.inserts)
+        print(f"{'tek ekleme, tetikleyicili':<32} {with_triggers:>9.3f} ms")
+        print(f"{'tek ekleme, tetikleyicisiz':<32} {without_triggers:>9.3f} ms")
+        core.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Benchmark suite over a synthetic Turkish bank, with JSON results and a regression check against a baseline.
+
+The bank comes from synthetic_bank (1k, 100k or 1M questions, deterministic per seed). Cases:
+  insert             bulk insert of the whole bank in import-sized batches (runs once, text generation excluded)
+  get_all_questions  the full fetchall() the older code paths use
+  load_questions     the list view's load_questions() until its first page is shown (offscreen QPA)
+  print_layout       laying out every question's print document, as print preview does
+  export_pdf         the streaming PDF export
+The print cases cover the first --print-rows questions. Every case reports its median, fastest
+and first (cold) run. --output writes the results as JSON; keep one as the baseline and pass it
+to --baseline later: a case whose median got slower than --tolerance makes the run exit with status 1.
+Usage: python benchmarks/bench_suite.py [--size 1k|100k|1m] [--repeat N] [--case NAME ...]
+       [--db PATH] [--output FILE] [--baseline FILE] [--tolerance FRACTION] [--trace]
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+import soru_bankasi_core as core
+import soru_bankasi_metrics as metrics
+from synthetic_bank import DEFAULT_SEED, build_bank, parse_size
+
+CASES = ("insert", "get_all_questions", "load_questions", "print_layout", "export_pdf")
+GUI_CASES = ("load_questions", "print_layout", "export_pdf")
+
+
+def measure(func, repeat):
+    """Runs func repeat times; func may return a dict of extra figures (pages...) kept from the last run."""
+    timings, extra = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extra = func()
+        timings.append(time.perf_counter() - start)
+    result = {"median_s": statistics.median(timings), "min_s": min(timings), "first_s": timings[0],
+              "runs": len(timings)}
+    result.update(extra or {})
+    return result
+
+
+def gui_cases(tmp, print_filter):
+    """The Qt cases, built on first use so a data-only run never imports PyQt5."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QEventLoop, QT_VERSION_STR
+    from PyQt5.QtWidgets import QApplication
+    import soruBankası as gui
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    pdf_path = os.path.join(tmp, "suite.pdf")
+    widget = gui.ViewPrintQuestionsWidget()
+    formats = gui.PrintFormats()
+    printer = gui.create_pdf_printer(pdf_path)
+
+    def load_questions():
+        loop = QEventLoop()
+        on_busy_changed = lambda busy: busy or loop.quit()
+        widget.loader.busy_changed.connect(on_busy_changed)
+        widget.load_questions()
+        loop.exec_()
+        widget.loader.busy_changed.disconnect(on_busy_changed)
+        return {"rows_shown": widget.question_model.rowCount()}
+
+    def print_layout():
+        cache = gui.PrintLayoutCache(formats)  # a fresh cache, so every question is laid out again
+        return {"documents": sum(1 for _ in cache.documents(printer, print_filter))}
+
+    def export_pdf():
+        pages = gui.export_questions_pdf(pdf_path, question_filter=print_filter)
+        return {"pages": pages, "pdf_bytes": os.path.getsize(pdf_path)}
+
+    cases = {"load_questions": load_questions, "print_layout": print_layout, "export_pdf": export_pdf}
+    return app, QT_VERSION_STR, cases
+
+
+def run_suite(args, tmp):
+    count = parse_size(args.size)
+    results = {}
+    if args.db and os.path.exists(args.db):
+        core.DB_NAME = args.db
+        core.init_db()
+    else:
+        path = args.db or os.path.join(tmp, "suite.db")
+        print(f"{count:,} soruluk banka oluşturuluyor...", file=sys.stderr)
+        start = time.perf_counter()
+        insert_seconds = build_bank(path, count, args.seed)
+        if "insert" in args.case:
+            results["insert"] = {"median_s": insert_seconds, "min_s": insert_seconds, "first_s": insert_seconds,
+                                 "runs": 1, "rows": count,
+                                 "generate_ms": round((time.perf_counter() - start - insert_seconds) * 1000)}
+    rows = core.count_questions()
+    print_filter = core.QuestionFilter(max_id=args.print_rows)
+    meta = {"size": args.size, "rows": rows, "seed": args.seed, "repeat": args.repeat, "print_rows": args.print_rows,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "platform": platform.platform(), "sqlite": sqlite3.sqlite_version,
+            "schema_version": core.SCHEMA_VERSION, "trace": args.trace}
+
+    cases = {"get_all_questions": lambda: {"rows": len(core.get_all_questions())}}
+    if any(name in GUI_CASES for name in args.case):
+        app, meta["qt"], qt_cases = gui_cases(tmp, print_filter)
+        cases.update(qt_cases)
+    for name in args.case:
+        if name == "insert":
+            continue
+        print(f"{name}...", file=sys.stderr)
+        metrics.reset()
+        results[name] = measure(cases[name], args.repeat)
+        if args.trace:
+            results[name]["spans"] = {span_name: {"count": span_count, "total_ms": total_ms, "p95_ms": p95}
+                                      for span_name, span_count, total_ms, _, p95, _ in metrics.span_statistics()}
+    core.close_db()
+    return {"meta": meta, "cases": results}
+
+
+def print_results(results):
+    print(f"{results['meta']['rows']:,} soru, {results['meta']['repeat']} tekrar")
+    print(f"{'durum':<20} {'medyan ms':>11} {'en iyi ms':>11} {'ilk ms':>11}  ayrıntı")
+    for name, result in results["cases"].items():
+        details = ", ".join(f"{key}={value:,}" for key, value in result.items()
+                            if key not in ("median_s", "min_s", "first_s", "runs", "spans"))
+        print(f"{name:<20} {result['median_s'] * 1000:>11.1f} {result['min_s'] * 1000:>11.1f} "
+              f"{result['first_s'] * 1000:>11.1f}  {details}")
+
+
+def compare(results, baseline, tolerance):
+    """Prints each case's median against the baseline's; returns the names that regressed."""
+    if (baseline["meta"].get("rows"), baseline["meta"].get("print_rows")) != (results["meta"]["rows"],
+                                                                               results["meta"]["print_rows"]):
+        print(f"Uyarı: taban çizgisi farklı bir bankayla alınmış ({baseline['meta'].get('rows')} soru, "
+              f"yazdırma {baseline['meta'].get('print_rows')}).")
+    regressions = []
+    print(f"{'durum':<20} {'taban ms':>11} {'şimdi ms':>11} {'oran':>7}")
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            print(f"{name:<20} {'-':>11} {result['median_s'] * 1000:>11.1f} {'yeni':>7}")
+            continue
+        ratio = result["median_s"] / base["median_s"]
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<20} {base['median_s'] * 1000:>11.1f} {result['median_s'] * 1000:>11.1f} {ratio:>7.2f}"
+              f"{'  YAVAŞLADI' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1k", help="1k, 100k, 1m veya soru sayısı")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--print-rows", type=int, default=2000, help="Yazdırma durumlarının kapsadığı ilk soru sayısı")
+    parser.add_argument("--db", help="Bu dosyadaki bankayı kullan; yoksa oluşturup sakla "
+                                     "(1m bankayı her çalıştırmada yeniden kurmamak için)")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak JSON sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Yavaşlama sayılacak medyan artışı (0.2 = %%20)")
+    parser.add_argument("--trace", action="store_true", help="Her durum için ölçüm (span) dökümünü de kaydet")
+    args = parser.parse_args()
+
+    metrics.enable(args.trace)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(args, tmp)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print(f"Yavaşlayan durumlar: {', '.join(regressions)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
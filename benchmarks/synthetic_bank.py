@@ -0,0 +1,241 @@
+"""Deterministic synthetic question banks with Turkish text for the benchmarks.
+
+A seed always yields the same questions in the same order, and a smaller bank is a prefix
+of a larger one, so 1k/100k/1M runs are comparable across runs and machines. Category
+weights, stem lengths (short arithmetic items up to Türkçe paragraph questions) and option
+shapes (numbers, years, cities, symbols, full sentences; mostly five options, some four, a
+few Doğru/Yanlış) follow a typical school question bank.
+Usage: python benchmarks/synthetic_bank.py DB [--size 1k|100k|1m|N] [--seed N]
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 42
+
+NOUNS = ("öğrenci", "öğretmen", "şehir", "köy", "ırmak", "dağ", "güneş", "ışık", "çiçek", "ağaç", "kitap",
+         "yazar", "devlet", "ülke", "bölge", "iklim", "enerji", "kuvvet", "hücre", "madde", "toplum", "kültür",
+         "dil", "savaş", "antlaşma", "ekonomi", "tarım", "sanayi", "nüfus", "deniz", "göl", "orman", "rüzgâr",
+         "yağmur", "bilim", "deney", "gözlem", "düşünce", "insan", "doğa", "zaman", "eser", "şiir", "roman")
+ADJECTIVES = ("büyük", "küçük", "önemli", "farklı", "yeni", "eski", "güçlü", "sıcak", "soğuk", "hızlı", "doğal",
+              "temel", "genel", "özel", "kısa", "uzun", "derin", "yüksek", "düşük", "kalabalık", "sessiz", "güzel",
+              "çağdaş", "geleneksel", "bilimsel", "ekonomik", "siyasi", "gündelik", "sınırlı", "köklü")
+VERBS = ("etkiler", "değiştirir", "oluşturur", "gösterir", "belirler", "artırır", "azaltır", "korur", "yansıtır",
+         "anlatır", "açıklar", "sağlar", "destekler", "geliştirir", "sınırlar", "biçimlendirir")
+CONNECTORS = ("Bu nedenle", "Ancak", "Öte yandan", "Özellikle", "Bununla birlikte", "Kısacası", "Örneğin", "Ayrıca")
+VERBAL_QUESTIONS = ("Buna göre aşağıdakilerden hangisi söylenebilir?", "Buna göre aşağıdakilerden hangisi söylenemez?",
+                    "Aşağıdakilerden hangisi bu bilgiyle ilgili doğru bir ifadedir?",
+                    "Bu durumun temel nedeni aşağıdakilerden hangisidir?")
+PARAGRAPH_QUESTIONS = ("Bu parçada asıl anlatılmak istenen aşağıdakilerden hangisidir?",
+                       "Bu parçanın ana düşüncesi aşağıdakilerden hangisidir?",
+                       "Bu parçadan aşağıdaki yargılardan hangisi çıkarılamaz?",
+                       "Bu parçada yazarın yakındığı durum aşağıdakilerden hangisidir?")
+TOPICS = {
+    "Fizik": ("kuvvet", "hareket", "enerji", "basınç", "ışık", "ses dalgası", "elektrik akımı", "manyetizma"),
+    "Kimya": ("atom", "periyodik tablo", "kimyasal bağ", "asit ve baz", "karışım", "tepkime hızı", "mol kavramı"),
+    "Biyoloji": ("hücre zarı", "fotosentez", "solunum", "kalıtım", "ekosistem", "sindirim", "dolaşım sistemi"),
+    "Tarih": ("Osmanlı Devleti", "Kurtuluş Savaşı", "Selçuklu Devleti", "Tanzimat Fermanı", "Lale Devri"),
+    "Coğrafya": ("iklim tipleri", "nüfus dağılışı", "akarsu aşındırması", "göç", "tarım ürünleri", "yer şekilleri"),
+    "Felsefe": ("bilgi felsefesi", "ahlak felsefesi", "varlık felsefesi", "sanat felsefesi", "siyaset felsefesi"),
+    "Genel": ("trafik kuralları", "ilk yardım", "çevre bilinci", "dijital okuryazarlık", "tasarruf",
+              "sağlıklı beslenme"),
+}
+EVENTS = (("İstanbul'un Fethi", 1453), ("Malazgirt Meydan Muharebesi", 1071), ("Mohaç Meydan Muharebesi", 1526),
+          ("Tanzimat Fermanı'nın ilanı", 1839), ("I. Meşrutiyet'in ilanı", 1876), ("Lozan Antlaşması", 1923),
+          ("Cumhuriyet'in ilanı", 1923), ("TBMM'nin açılışı", 1920), ("Sakarya Meydan Muharebesi", 1921),
+          ("Karlofça Antlaşması", 1699), ("Preveze Deniz Savaşı", 1538), ("Çanakkale Savaşı", 1915))
+REGIONS = {
+    "Marmara": ("İstanbul", "Bursa", "Edirne", "Kocaeli", "Tekirdağ", "Çanakkale", "Balıkesir"),
+    "Ege": ("İzmir", "Aydın", "Muğla", "Denizli", "Manisa", "Uşak", "Kütahya"),
+    "Akdeniz": ("Antalya", "Mersin", "Adana", "Hatay", "Isparta", "Burdur", "Osmaniye"),
+    "İç Anadolu": ("Ankara", "Konya", "Kayseri", "Eskişehir", "Sivas", "Niğde", "Yozgat"),
+    "Karadeniz": ("Trabzon", "Samsun", "Rize", "Ordu", "Giresun", "Sinop", "Artvin"),
+    "Doğu Anadolu": ("Erzurum", "Van", "Malatya", "Elazığ", "Kars", "Ağrı", "Muş"),
+    "Güneydoğu Anadolu": ("Gaziantep", "Diyarbakır", "Şanlıurfa", "Mardin", "Batman", "Siirt", "Kilis"),
+}
+ELEMENTS = (("Demir", "Fe"), ("Bakır", "Cu"), ("Gümüş", "Ag"), ("Altın", "Au"), ("Kurşun", "Pb"), ("Sodyum", "Na"),
+            ("Potasyum", "K"), ("Kalsiyum", "Ca"), ("Çinko", "Zn"), ("Cıva", "Hg"), ("Kükürt", "S"), ("Fosfor", "P"))
+ENGLISH = (("I ___ to school by bus every morning.", ("go", "goes", "went", "going", "gone")),
+           ("She ___ her homework before dinner yesterday.",
+            ("finished", "finishes", "finish", "finishing", "has finish")),
+           ("If it rains tomorrow, we ___ at home.", ("will stay", "stayed", "would stayed", "stays", "staying")),
+           ("They have lived in Ankara ___ 2015.", ("since", "for", "ago", "during", "while")),
+           ("There isn't ___ milk left in the fridge.", ("any", "some", "many", "a few", "no")))
+SPELLING_ERRORS = (("herkez", "herkes"), ("yanlız", "yalnız"), ("birşey", "bir şey"), ("şöför", "şoför"),
+                   ("orjinal", "orijinal"), ("yalnış", "yanlış"), ("egzos", "egzoz"))
+# (category, weight); weights roughly follow the share of each subject in a school bank.
+CATEGORY_WEIGHTS = (("Matematik", 22), ("Türkçe", 20), ("Fizik", 9), ("Kimya", 7), ("Biyoloji", 7), ("Tarih", 10),
+                    ("Coğrafya", 8), ("Felsefe", 3), ("İngilizce", 6), ("Genel", 8))
+
+
+def parse_size(text):
+    """'1k', '100k', '1m' or a plain count such as 25_000."""
+    text = str(text).strip().lower()
+    return SIZES[text] if text in SIZES else int(text.replace("_", ""))
+
+
+def _capitalize(text):
+    """str.capitalize() with the Turkish dotted capital (ilk -> İlk), keeping the rest as is."""
+    return ("İ" if text[0] == "i" else text[0].upper()) + text[1:]
+
+def _sentence(rng):
+    return (f"{_capitalize(rng.choice(ADJECTIVES))} {rng.choice(NOUNS)}, {rng.choice(ADJECTIVES)} bir "
+            f"{rng.choice(NOUNS)} ile {rng.choice(NOUNS)} arasındaki ilişkiyi {rng.choice(VERBS)}.")
+
+def _paragraph(rng, sentences):
+    parts = [_sentence(rng)]
+    for _ in range(sentences - 1):
+        sentence = _sentence(rng)
+        if rng.random() < 0.4:
+            sentence = f"{rng.choice(CONNECTORS)} {sentence[0].lower()}{sentence[1:]}"
+        parts.append(sentence)
+    return " ".join(parts)
+
+def _numbers_around(rng, answer, spread=None, count=5):
+    spread = spread or max(3, abs(answer) // 4)
+    values = {answer}
+    while len(values) < count:
+        values.add(answer + rng.randint(-spread, spread))
+    return [str(value) for value in values]
+
+
+def _matematik(rng):
+    kind = rng.randrange(3)
+    if kind == 0:
+        a, b = rng.randint(12, 999), rng.randint(12, 999)
+        name, answer = rng.choice((("toplamı", a + b), ("farkı", a - b), ("çarpımı", a * b)))
+        return f"{a} ile {b} sayılarının {name} kaçtır?", _numbers_around(rng, answer), str(answer)
+    if kind == 1:
+        x, a, b = rng.randint(-20, 20), rng.randint(2, 12), rng.randint(-50, 50)
+        return (f"{a}x + ({b}) = {a * x + b} denklemini sağlayan x değeri kaçtır?",
+                _numbers_around(rng, x, 6), str(x))
+    a, b = rng.randint(3, 40), rng.randint(3, 40)
+    name, answer, unit = rng.choice((("alanı", a * b, "cm²"), ("çevresi", 2 * (a + b), "cm")))
+    options = [f"{value} {unit}" for value in _numbers_around(rng, answer)]
+    return (f"Kenar uzunlukları {a} cm ve {b} cm olan bir dikdörtgenin {name} kaç {unit}'dir?",
+            options, f"{answer} {unit}")
+
+def _fizik(rng):
+    if rng.random() < 0.5:
+        return _verbal(rng, "Fizik")
+    mass, acceleration = rng.randint(2, 20), rng.randint(1, 9)
+    return (f"Sürtünmesiz yatay bir düzlemde durmakta olan {mass} kg kütleli cisme {mass * acceleration} N "
+            "büyüklüğünde yatay bir kuvvet uygulanıyor. Buna göre cismin ivmesi kaç m/s² olur?",
+            _numbers_around(rng, acceleration, 4), str(acceleration))
+
+def _kimya(rng):
+    if rng.random() < 0.6:
+        return _verbal(rng, "Kimya")
+    name, symbol = rng.choice(ELEMENTS)
+    options = [symbol] + rng.sample([s for _, s in ELEMENTS if s != symbol], 4)
+    return f"{name} elementinin sembolü aşağıdakilerden hangisidir?", options, symbol
+
+def _tarih(rng):
+    if rng.random() < 0.5:
+        return _verbal(rng, "Tarih")
+    event, year = rng.choice(EVENTS)
+    return f"{event} hangi yılda gerçekleşmiştir?", _numbers_around(rng, year, 40), str(year)
+
+def _cografya(rng):
+    if rng.random() < 0.5:
+        return _verbal(rng, "Coğrafya")
+    region = rng.choice(list(REGIONS))
+    answer = rng.choice(REGIONS[region])
+    others = [city for name, cities in REGIONS.items() if name != region for city in cities]
+    return f"Aşağıdaki illerden hangisi {region} Bölgesi'nde yer alır?", [answer] + rng.sample(others, 4), answer
+
+def _turkce(rng):
+    if rng.random() < 0.25:
+        wrong, right = rng.choice(SPELLING_ERRORS)
+        sentences = [_sentence(rng) for _ in range(5)]
+        answer = f"{sentences[0][:-1]}, {wrong} bunu biliyordu."
+        options = [answer] + [f"{s[:-1]}, {rng.choice(SPELLING_ERRORS)[1]} bunu biliyordu." for s in sentences[1:]]
+        return "Aşağıdaki cümlelerin hangisinde yazım yanlışı vardır?", options, answer
+    stem = f"{_paragraph(rng, rng.randint(3, 7))}\n{rng.choice(PARAGRAPH_QUESTIONS)}"
+    options = [_sentence(rng) for _ in range(5)]
+    return stem, options, options[0]
+
+def _ingilizce(rng):
+    sentence, options = rng.choice(ENGLISH)
+    return f"Choose the correct option to complete the sentence.\n{sentence}", list(options), options[0]
+
+def _verbal(rng, category):
+    topic = rng.choice(TOPICS.get(category, TOPICS["Genel"]))
+    stem = f"{_capitalize(topic)} konusunda: {_paragraph(rng, rng.randint(1, 3))} {rng.choice(VERBAL_QUESTIONS)}"
+    options = [_sentence(rng) if rng.random() < 0.5
+               else f"{_capitalize(rng.choice(ADJECTIVES))} {rng.choice(NOUNS)} {rng.choice(VERBS)}." for _ in range(5)]
+    return stem, options, options[0]
+
+GENERATORS = {"Matematik": _matematik, "Türkçe": _turkce, "Fizik": _fizik, "Kimya": _kimya, "Tarih": _tarih,
+              "Coğrafya": _cografya, "İngilizce": _ingilizce}
+
+
+def generate_question(rng):
+    """(soru_metni, secenekler, dogru_secenek_index, kategori) for one random question."""
+    category = rng.choices([name for name, _ in CATEGORY_WEIGHTS], weights=[w for _, w in CATEGORY_WEIGHTS])[0]
+    generator = GENERATORS.get(category)
+    stem, options, answer = generator(rng) if generator else _verbal(rng, category)
+    roll = rng.random()
+    if roll < 0.03:
+        options, answer = ["Doğru", "Yanlış"], rng.choice(("Doğru", "Yanlış"))
+        stem = f"{_sentence(rng)} (Doğru/Yanlış)"
+    elif roll < 0.13:
+        options = [answer] + [option for option in options if option != answer][:3]
+    else:
+        options = [answer] + [option for option in options if option != answer][:4]
+    rng.shuffle(options)
+    return stem, options, options.index(answer), category
+
+def iter_questions(count, seed=DEFAULT_SEED):
+    """Yields count insert rows (_question_params tuples); the first n rows do not depend on count."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield core._question_params(*generate_question(rng))
+
+
+def build_bank(path, count, seed=DEFAULT_SEED, batch_size=core.IMPORT_BATCH_SIZE, progress=None):
+    """Creates the database at path (soru_bankasi_core.DB_NAME is pointed at it) and inserts count
+    generated questions in batches, the way an import does; progress(done) is called per batch.
+    Returns the seconds spent in insert_questions_bulk, without generating the text."""
+    core.DB_NAME = path
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.init_db()
+    rows, done, insert_seconds = iter_questions(count, seed), 0, 0.0
+    while done < count:
+        batch = list(itertools.islice(rows, batch_size))
+        start = time.perf_counter()
+        core.insert_questions_bulk(batch)
+        insert_seconds += time.perf_counter() - start
+        done += len(batch)
+        if progress:
+            progress(done)
+    return insert_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db")
+    parser.add_argument("--size", default="100k", help="1k, 100k, 1m veya soru sayısı")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    if os.path.exists(args.db):
+        parser.error(f"{args.db} zaten var")
+    count = parse_size(args.size)
+    start = time.perf_counter()
+    insert_seconds = build_bank(args.db, count, args.seed)
+    core.close_db()
+    print(f"{count:,} soru yazıldı: {args.db} ({time.perf_counter() - start:.1f} sn, "
+          f"eklemeler {insert_seconds:.1f} sn)")
+
+
+if __name__ == "__main__":
+    main()
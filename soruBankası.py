@@ -1,14 +1,37 @@
 import sys
-import sqlite3
-import os 
+import os
+import html
+import re
+import threading
+import time
+from collections import OrderedDict
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLabel, QLineEdit, QPushButton, QTableView,
                              QDialog, QTextEdit, QRadioButton, QButtonGroup, QMessageBox,
-                             QAction, QMenu, QSizePolicy, QHeaderView, QStackedWidget, QSpacerItem)
+                             QAction, QMenu, QSizePolicy, QHeaderView, QStackedWidget, QSpacerItem,
+                             QFileDialog, QProgressDialog, QProgressBar, QFormLayout, QSpinBox, QTableWidget,
+                             QTableWidgetItem, QGridLayout, QCheckBox, QToolButton)
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
-from PyQt5.QtGui import (QPainter, QFont, QTextDocument, QTextCharFormat,
-                         QTextCursor, QColor, QBrush, QPalette, QPixmap, QIcon)
-from PyQt5.QtCore import Qt, QUrl, QSize, QDate
+from PyQt5.QtGui import (QGuiApplication, QPainter, QFont, QTextDocument, QTextCharFormat, QTextImageFormat,
+                         QTextCursor, QColor, QBrush, QPalette, QPixmap, QPixmapCache, QIcon, QImage, QImageReader)
+from PyQt5.QtCore import (Qt, QUrl, QSize, QDate, QRectF, QAbstractTableModel, QModelIndex, QTimer, QObject,
+                          QRunnable, QThreadPool, QCoreApplication, QBuffer, QByteArray, QIODevice, pyqtSignal)
+
+import soru_bankasi_core
+import soru_bankasi_metrics as metrics
+from soru_bankasi_metrics import log
+from soru_bankasi_core import (ARCHIVE_FILE_TYPES, QUESTION_SORT_COLUMNS, QUESTION_TABLE_HEADERS, RICH_TEXT_PREFIX,
+                               STATISTICS_QUALITY_LABELS, DataVersionWatcher, QuestionFilter, apply_archive,
+                               attachment_refs, attachment_url, backup_db, close_db, correct_option_label, count_questions,
+                               find_duplicate_groups, format_duplicate_report, generate_exam_batch, get_attachment,
+                               get_category_counts, get_change_cursor, get_changes_since, grade_exam, has_questions,
+                               import_questions, init_db, is_rich_text, iter_all_questions, plain_text,
+                               reset_bank_identity, restore_db, sync_duplicate_index, validate_question, write_archive)
+from soru_bankasi_cli import main
+
+# Where the question list and the add dialog read and write: the local database, or a
+# soru_bankasi_client.RemoteBank (same function names, over HTTP) when run_gui gets a server.
+bank = soru_bankasi_core
 
 NAVY_PRIMARY = "#0A2240"
 NAVY_ACCENT = "#1A3873"  
@@ -21,68 +44,6 @@ TEXT_ON_LIGHT_BG = "#212121"
 TEXT_NAVY_HEADER = NAVY_PRIMARY
 BORDER_COLOR = "#B0BEC5" 
 
-DB_NAME = 'soru_bankasi.db'
-
-def init_db():
-    print("DEBUG: init_db çağrıldı.")
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sorular (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            soru_metni TEXT NOT NULL,
-            secenek1 TEXT,
-            secenek2 TEXT,
-            secenek3 TEXT,
-            secenek4 TEXT,
-            secenek5 TEXT,
-            dogru_secenek_index INTEGER,
-            kategori TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
-    print(f"DEBUG: init_db tamamlandı. Veritabanı dosyası ({DB_NAME}) şu dizinde olmalı veya oluşturulmuş olmalı: {os.getcwd()}")
-
-
-def add_question_to_db(soru_metni, secenekler, dogru_secenek_index, kategori="Genel"):
-    print(f"DEBUG: add_question_to_db: Soru='{soru_metni[:20]}...'")
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        current_secenekler = list(secenekler)
-        while len(current_secenekler) < 5:
-            current_secenekler.append("")
-        cursor.execute('''
-            INSERT INTO sorular (soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5, dogru_secenek_index, kategori)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (soru_metni, current_secenekler[0], current_secenekler[1], current_secenekler[2], current_secenekler[3], current_secenekler[4], dogru_secenek_index, kategori))
-        conn.commit()
-        print("DEBUG: Soru veritabanına eklendi.")
-        return True
-    except sqlite3.Error as e:
-        print(f"DEBUG: add_question_to_db - Veritabanı hatası: {e}")
-        return False
-    finally:
-        conn.close()
-
-def get_all_questions():
-    print("DEBUG: get_all_questions çağrıldı.")
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5, dogru_secenek_index, kategori FROM sorular ORDER BY id")
-        sorular = cursor.fetchall()
-        print(f"DEBUG: Veritabanından {len(sorular)} adet soru çekildi.")
-        return sorular
-    except sqlite3.Error as e:
-        print(f"DEBUG: get_all_questions içinde veritabanı hatası: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
-
 
 class WelcomeWidget(QWidget):
     def __init__(self, add_question_callback, view_questions_callback, parent=None):
@@ -172,6 +133,111 @@ class WelcomeWidget(QWidget):
         main_layout.addLayout(buttons_layout)
         main_layout.addStretch(3)
 
+def document_markup(document):
+    """The stored form of an edited field: its plain text when it has no formatting or images,
+    otherwise RICH_TEXT_PREFIX and a compact fragment (b, i, u, sup, sub, br and ek: images)."""
+    parts, rich = [], False
+    block = document.begin()
+    while block.isValid():
+        if block != document.begin():
+            parts.append("<br>")
+        fragments = block.begin()
+        while not fragments.atEnd():
+            fragment = fragments.fragment()
+            char_format = fragment.charFormat()
+            if char_format.isImageFormat():
+                name = char_format.toImageFormat().name()
+                if name.startswith(attachment_url("")):
+                    parts.append(f'<img src="{html.escape(name)}">')
+                    rich = True
+            else:
+                alignment = char_format.verticalAlignment()
+                tags = [tag for tag, on in (("b", char_format.fontWeight() > QFont.Normal), ("i", char_format.fontItalic()),
+                                            ("u", char_format.fontUnderline()),
+                                            ("sup", alignment == QTextCharFormat.AlignSuperScript),
+                                            ("sub", alignment == QTextCharFormat.AlignSubScript)) if on]
+                rich = rich or bool(tags)
+                text = html.escape(fragment.text(), quote=False).replace("\u2028", "<br>")
+                parts.append("".join(f"<{tag}>" for tag in tags) + text + "".join(f"</{tag}>" for tag in reversed(tags)))
+            fragments += 1
+        block = block.next()
+    return RICH_TEXT_PREFIX + "".join(parts) if rich else document.toPlainText()
+
+
+class RichTextEdit(QTextEdit):
+    """Question text editor with bold/italic/underline/superscript/subscript and images. An inserted
+    or pasted image is stored in the bank right away (bank.add_attachment) and shown from the
+    document's resources; document_markup() turns the content into the stored form."""
+    EDITOR_IMAGE_WIDTH = 240
+    focused = pyqtSignal()
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.focused.emit()
+
+    def toggle_format(self, kind):
+        current = self.currentCharFormat()
+        char_format = QTextCharFormat()
+        if kind == "b":
+            char_format.setFontWeight(QFont.Normal if current.fontWeight() > QFont.Normal else QFont.Bold)
+        elif kind == "i":
+            char_format.setFontItalic(not current.fontItalic())
+        elif kind == "u":
+            char_format.setFontUnderline(not current.fontUnderline())
+        elif kind in ("sup", "sub"):
+            alignment = QTextCharFormat.AlignSuperScript if kind == "sup" else QTextCharFormat.AlignSubScript
+            char_format.setVerticalAlignment(QTextCharFormat.AlignNormal if current.verticalAlignment() == alignment
+                                             else alignment)
+        self.mergeCurrentCharFormat(char_format)
+        self.setFocus()
+
+    def insert_image_data(self, data):
+        """Stores the image and inserts it at the cursor; raises ValueError for unsupported data."""
+        image = QImage.fromData(data)
+        if image.isNull():
+            raise ValueError("Resim okunamadı.")
+        name = attachment_url(bank.add_attachment(data))
+        self.document().addResource(QTextDocument.ImageResource, QUrl(name), image)
+        image_format = QTextImageFormat()
+        image_format.setName(name)
+        if image.width() > self.EDITOR_IMAGE_WIDTH:
+            image_format.setWidth(self.EDITOR_IMAGE_WIDTH)
+        self.textCursor().insertImage(image_format)
+
+    def canInsertFromMimeData(self, source):
+        return source.hasImage() or super().canInsertFromMimeData(source)
+
+    def insertFromMimeData(self, source):
+        if not source.hasImage():
+            super().insertFromMimeData(source)
+            return
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        QImage(source.imageData()).save(buffer, "PNG")
+        try:
+            self.insert_image_data(bytes(data))
+        except ValueError as e:
+            QMessageBox.warning(self, "Resim", str(e))
+
+
+class RichLineEdit(RichTextEdit):
+    """A RichTextEdit one line high for the options; Enter moves on to the next field."""
+    EDITOR_IMAGE_WIDTH = 80
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setTabChangesFocus(True)
+        self.setFixedHeight(42)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            self.focusNextChild()
+            return
+        super().keyPressEvent(event)
+
+
 class AddQuestionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -211,10 +277,31 @@ class AddQuestionDialog(QDialog):
 
         self.soru_label = QLabel("SORU METNİ:")
         self.soru_label.setStyleSheet(f"font-weight: bold; margin-top: 5px; color: {TEXT_NAVY_HEADER};")
-        self.soru_input = QTextEdit()
+        self.soru_input = RichTextEdit()
         self.soru_input.setPlaceholderText("Sorunuzu buraya detaylı bir şekilde yazınız...")
         self.soru_input.setFixedHeight(100)
+        self.active_input = self.soru_input
+        self.soru_input.focused.connect(lambda: self.set_active_input(self.soru_input))
+        format_layout = QHBoxLayout()
+        format_layout.setSpacing(4)
+        for text, tip, kind in (("K", "Kalın", "b"), ("İ", "İtalik", "i"), ("A", "Altı çizili", "u"),
+                                ("x²", "Üst simge", "sup"), ("x₂", "Alt simge", "sub")):
+            button = QToolButton()
+            button.setText(text)
+            button.setToolTip(f"{tip} (soru metninde ya da seçili seçenekte)")
+            if kind == "u":
+                font = button.font()
+                font.setUnderline(True)
+                button.setFont(font)
+            button.clicked.connect(lambda checked, kind=kind: self.active_input.toggle_format(kind))
+            format_layout.addWidget(button)
+        image_button = QToolButton()
+        image_button.setText("Resim Ekle...")
+        image_button.clicked.connect(self.insert_image)
+        format_layout.addWidget(image_button)
+        format_layout.addStretch(1)
         self.layout.addWidget(self.soru_label)
+        self.layout.addLayout(format_layout)
         self.layout.addWidget(self.soru_input)
 
         self.dogru_sik_label = QLabel("SEÇENEKLER VE DOĞRU YANIT:")
@@ -234,8 +321,9 @@ class AddQuestionDialog(QDialog):
             label.setFixedWidth(30)
             label.setStyleSheet(f"font-weight: normal; color: {NAVY_ACCENT};")
 
-            line_edit = QLineEdit()
+            line_edit = RichLineEdit()
             line_edit.setPlaceholderText(f"Seçenek {chr(65+i)}")
+            line_edit.focused.connect(lambda line_edit=line_edit: self.set_active_input(line_edit))
             self.secenek_inputs.append(line_edit)
 
             radio_button = QRadioButton("Doğru Şık")
@@ -273,28 +361,882 @@ class AddQuestionDialog(QDialog):
         button_box_layout.addStretch()
         button_box_layout.addWidget(self.add_button_q)
         self.layout.addLayout(button_box_layout)
+        self.loader = BackgroundLoader(self)
+
+    def done(self, result):
+        self.loader.cancel_all()  # a duplicate check still running must not save after the dialog is closed
+        super().done(result)
+
+    def set_active_input(self, editor):
+        """The format buttons and Resim Ekle act on the editor that last had the focus."""
+        self.active_input = editor
+
+    def insert_image(self):
+        editor = self.active_input
+        path, _ = QFileDialog.getOpenFileName(self, "Resim Seç", "", "Resimler (*.png *.jpg *.jpeg *.gif *.bmp)")
+        if not path:
+            return
+        try:
+            with open(path, "rb") as f:
+                editor.insert_image_data(f.read())
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Resim", f"Resim eklenemedi:\n{e}")
 
     def add_question_dialog_save(self):
-        soru_metni = self.soru_input.toPlainText().strip()
-        secenekler = [inp.text().strip() for inp in self.secenek_inputs]
+        soru_metni = document_markup(self.soru_input.document()).strip()
+        secenekler = [document_markup(inp.document()).strip() for inp in self.secenek_inputs]
         kategori = self.kategori_input.text().strip() or "Genel"
         dogru_secenek_index = self.radio_group.checkedId()
 
-        if not soru_metni: QMessageBox.warning(self, "Eksik Bilgi", "Soru metni boş olamaz."); return
-        filled_options_count = sum(1 for s in secenekler if s)
-        if dogru_secenek_index != -1 and filled_options_count < 1:
-             QMessageBox.warning(self, "Eksik Bilgi", "Lütfen en az bir yanıt seçeneği girin (doğru şık dahil)."); return
-        if sum(1 for s in secenekler if s) == 0: QMessageBox.warning(self, "Eksik Bilgi", "Lütfen en az bir yanıt seçeneği girin."); return
-        if dogru_secenek_index == -1: QMessageBox.warning(self, "Eksik Bilgi", "Lütfen doğru şıkkı işaretleyin."); return
-        if not secenekler[dogru_secenek_index]: QMessageBox.warning(self, "Eksik Bilgi", f"İşaretlediğiniz {chr(65+dogru_secenek_index)}. yanıt boş olamaz."); return
-
-        if add_question_to_db(soru_metni, secenekler, dogru_secenek_index, kategori):
-            QMessageBox.information(self, "Başarılı", "Soru başarıyla eklendi.")
-            self.accept()
+        error = validate_question(soru_metni, secenekler, dogru_secenek_index)
+        if error: QMessageBox.warning(self, "Eksik Bilgi", error); return
+
+        def find_similar(task):
+            similar = bank.find_similar_questions(soru_metni, secenekler, limit=3)
+            return similar, bank.get_questions_by_ids(soru_id for soru_id, _ in similar) if similar else {}
+
+        def save(similar, rows):
+            self.add_button_q.setEnabled(True)
+            if not self.confirm_if_duplicate(similar, rows): return
+            if bank.add_question_to_db(soru_metni, secenekler, dogru_secenek_index, kategori):
+                QMessageBox.information(self, "Başarılı", "Soru başarıyla eklendi.")
+                self.accept()
+            else:
+                QMessageBox.critical(self, "Hata", "Soru eklenirken bir veritabanı hatası oluştu.")
+
+        def check_failed(error):
+            log.error("Benzer soru kontrolü yapılamadı: %s", error)
+            save([], {})
+
+        # The lookup (and the incremental index sync it may do) runs off the GUI thread; the
+        # button stays disabled until it answers so the question cannot be saved twice.
+        self.add_button_q.setEnabled(False)
+        self.loader.submit("duplicate-check", find_similar, lambda result: save(*result), check_failed)
+
+    def confirm_if_duplicate(self, similar, rows):
+        """similar: find_similar_questions' [(soru_id, similarity), ...]; rows: those questions by id."""
+        if not similar:
+            return True
+        lines = "\n".join(f"• ID {soru_id} (%{similarity * 100:.0f} benzer): {plain_text(rows[soru_id][1])[:80]}"
+                          for soru_id, similarity in similar if soru_id in rows)
+        answer = QMessageBox.question(
+            self, "Benzer Soru Bulundu",
+            f"Bu soruya çok benzeyen soru(lar) zaten kayıtlı:\n\n{lines}\n\nYine de kaydetmek istiyor musunuz?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        return answer == QMessageBox.Yes
+
+class ExamBuilderDialog(QDialog):
+    """Collects per-kategori question counts, booklet count and output folder for generate_exam_batch."""
+
+    def __init__(self, category_counts, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sınav Oluştur")
+        self.setMinimumWidth(420)
+        self.setStyleSheet(f"""
+            QDialog {{ background-color: {WHITE_PRIMARY}; }}
+            QLabel {{ font-size: 13px; color: {TEXT_NAVY_HEADER}; }}
+            QSpinBox, QLineEdit {{
+                border: 1px solid {BORDER_COLOR}; border-radius: 4px;
+                padding: 5px; font-size: 13px;
+                background-color: {WHITE_PRIMARY}; color: {TEXT_ON_LIGHT_BG};
+            }}
+        """)
+        self.layout = QVBoxLayout(self)
+        self.layout.setSpacing(12)
+        self.layout.setContentsMargins(20, 20, 20, 20)
+
+        categories_label = QLabel("KATEGORİ BAŞINA SORU SAYISI:")
+        categories_label.setStyleSheet(f"font-weight: bold; color: {TEXT_NAVY_HEADER};")
+        self.layout.addWidget(categories_label)
+        form = QFormLayout()
+        self.category_spins = {}
+        for kategori, count in sorted(category_counts.items()):
+            spin = QSpinBox()
+            spin.setRange(0, count)
+            spin.setSuffix(f" / {count}")
+            self.category_spins[kategori] = spin
+            form.addRow(kategori, spin)
+        self.variants_spin = QSpinBox()
+        self.variants_spin.setRange(1, 500)
+        self.variants_spin.setValue(3)
+        form.addRow("Kitapçık sayısı", self.variants_spin)
+        self.layout.addLayout(form)
+
+        folder_layout = QHBoxLayout()
+        self.folder_input = QLineEdit(os.path.join(os.getcwd(), "sinav"))
+        browse_button = QPushButton("Gözat...")
+        browse_button.clicked.connect(self.choose_folder)
+        folder_layout.addWidget(self.folder_input)
+        folder_layout.addWidget(browse_button)
+        self.layout.addLayout(folder_layout)
+
+        self.create_button = QPushButton("SINAVI OLUŞTUR")
+        self.create_button.setFixedHeight(40)
+        self.create_button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {RED_PRIMARY}; color: {TEXT_ON_DARK_BG};
+                padding: 10px; font-weight: bold; font-size: 14px;
+                border-radius: 5px; border: none;
+            }}
+            QPushButton:hover {{ background-color: {RED_ACCENT}; }}
+            QPushButton:pressed {{ background-color: {RED_PRIMARY}; }}
+        """)
+        self.create_button.clicked.connect(self.accept_if_valid)
+        button_box_layout = QHBoxLayout()
+        button_box_layout.addStretch()
+        button_box_layout.addWidget(self.create_button)
+        self.layout.addLayout(button_box_layout)
+
+    def choose_folder(self):
+        path = QFileDialog.getExistingDirectory(self, "Çıktı Klasörü Seç", self.folder_input.text())
+        if path:
+            self.folder_input.setText(path)
+
+    def counts(self):
+        return {kategori: spin.value() for kategori, spin in self.category_spins.items() if spin.value()}
+
+    def output_dir(self):
+        return self.folder_input.text().strip()
+
+    def variants(self):
+        return self.variants_spin.value()
+
+    def accept_if_valid(self):
+        if not self.counts():
+            QMessageBox.warning(self, "Eksik Bilgi", "En az bir kategoriden soru seçiniz."); return
+        if not self.output_dir():
+            QMessageBox.warning(self, "Eksik Bilgi", "Çıktı klasörünü seçiniz."); return
+        self.accept()
+
+class TaskCancelled(Exception):
+    pass
+
+class BackgroundTask(QRunnable):
+    def __init__(self, loader, key, func, on_result, on_error=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.key = key
+        self.func = func
+        self.on_result = on_result
+        self.on_error = on_error
+        self.span_name = f"task.{key[0] if isinstance(key, tuple) else key}"
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, fraction):
+        self.loader.task_progress.emit(self.key, fraction)
+
+    def run(self):
+        result = error = None
+        try:
+            self.check_cancelled()
+            with metrics.span(self.span_name):
+                result = self.func(self)
+        except Exception as e:
+            error = e
+        self.loader._task_done.emit(self, result, error)
+
+
+class BackgroundLoader(QObject):
+    """Runs functions on QThreadPool and delivers their results back on the GUI thread.
+
+    Tasks are submitted under a key; submitting again under the same key cancels the
+    previous task (dropping it from the queue if it has not started yet) so only the
+    latest request's result is ever delivered. func receives the BackgroundTask and may
+    call check_cancelled()/report_progress() on it.
+    """
+    busy_changed = pyqtSignal(bool)
+    task_progress = pyqtSignal(object, float)
+    _task_done = pyqtSignal(object, object, object)
+
+    def __init__(self, parent=None, thread_pool=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._active = {}
+        self._running = set()
+        self._task_done.connect(self._on_task_done)
+
+    def submit(self, key, func, on_result, on_error=None):
+        self._discard(key)
+        task = BackgroundTask(self, key, func, on_result, on_error)
+        self._active[key] = task
+        self._running.add(task)
+        self.thread_pool.start(task)
+        self.busy_changed.emit(True)
+        return task
+
+    def cancel(self, key):
+        if self._discard(key):
+            self.busy_changed.emit(self.is_busy())
+
+    def cancel_all(self):
+        for key in list(self._active):
+            self._discard(key)
+        self.busy_changed.emit(False)
+
+    def is_busy(self, key=None):
+        return key in self._active if key is not None else bool(self._active)
+
+    def _discard(self, key):
+        task = self._active.pop(key, None)
+        if task is None:
+            return False
+        task.cancel()
+        if self.thread_pool.tryTake(task):
+            self._running.discard(task)
+        return True
+
+    def _on_task_done(self, task, result, error):
+        self._running.discard(task)
+        if self._active.get(task.key) is not task:
+            return
+        del self._active[task.key]
+        self.busy_changed.emit(self.is_busy())
+        if isinstance(error, TaskCancelled):
+            return
+        if error is None:
+            task.on_result(result)
+        elif task.on_error:
+            task.on_error(error)
         else:
-            QMessageBox.critical(self, "Hata", "Soru eklenirken bir veritabanı hatası oluştu.")
+            log.error("Arka plan görevi %r hata verdi: %s", task.key, error)
+
+def decode_thumbnail(data, size):
+    """Decodes image bytes to at most size (a JPEG is decoded at the reduced size directly, other
+    formats in full and then scaled); QImage, unlike QPixmap, may be built off the GUI thread."""
+    buffer = QBuffer()
+    buffer.setData(data)
+    reader = QImageReader(buffer)
+    natural = reader.size()
+    if not natural.isValid() or (natural.width() <= size.width() and natural.height() <= size.height()):
+        return reader.read()
+    if bytes(reader.format()) == b"jpeg":  # the PNG reader also takes a scaled size, but only scales afterwards
+        reader.setScaledSize(natural.scaled(size, Qt.KeepAspectRatio))
+        return reader.read()
+    return reader.read().scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class ThumbnailCache(QObject):
+    """Thumbnails of question images for the list, kept in QPixmapCache.
+
+    pixmap() answers from the cache or returns None and has the image fetched from `bank`
+    and decoded on a worker thread; thumbnail_ready(ozet) fires once it is cached. QPixmapCache
+    drops the least recently used pixmaps past its limit, so scrolling through a large bank
+    keeps memory bounded and images are only read for rows that are actually painted.
+    """
+    SIZE = QSize(48, 24)
+    CACHE_LIMIT_KB = 20 * 1024
+    thumbnail_ready = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loader = BackgroundLoader(self)
+        self._unreadable = set()
+        if QPixmapCache.cacheLimit() < self.CACHE_LIMIT_KB:
+            QPixmapCache.setCacheLimit(self.CACHE_LIMIT_KB)
+
+    def _cache_key(self, ozet):
+        return f"{attachment_url(ozet)}@{self.SIZE.width()}x{self.SIZE.height()}"
+
+    def pixmap(self, ozet):
+        pixmap = QPixmapCache.find(self._cache_key(ozet))
+        if pixmap is None and ozet not in self._unreadable and not self.loader.is_busy(ozet):
+            size = self.SIZE
+            def load(task):
+                attachment = bank.get_attachment(ozet)
+                return decode_thumbnail(attachment[1], size) if attachment else None
+            self.loader.submit(ozet, load, lambda image: self._on_decoded(ozet, image))
+        return pixmap
+
+    def _on_decoded(self, ozet, image):
+        if image is None or image.isNull():
+            self._unreadable.add(ozet)
+            return
+        QPixmapCache.insert(self._cache_key(ozet), QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(ozet)
+
+
+class QuestionTableModel(QAbstractTableModel):
+    """Read-only view of `sorular` that pages rows in from SQLite as the view scrolls.
+
+    Only the most recently used MAX_CACHED_PAGES pages are kept in memory; sorting
+    is pushed down to the database as an ORDER BY and simply resets the paging. Rows are
+    restricted by a QuestionFilter compiled to SQL; while it has a search text they are,
+    until a header is clicked, ordered by relevance (sort column None). All queries go to `bank` on the given
+    BackgroundLoader; rows of a page still in flight read as empty until it arrives.
+
+    refresh_changes() reads sorular_changelog from the cursor of the last load and,
+    in the default id ordering without a search, applies inserts/updates/deletes as
+    row-level deltas; other orderings, a filter, or too many changes fall back to refresh().
+    Rich text is shown as plain text, with the question's first image as a thumbnail.
+    """
+    PAGE_SIZE = 200
+    MAX_CACHED_PAGES = 10
+    MAX_INCREMENTAL_CHANGES = 500
+    refreshed = pyqtSignal()
+
+    def __init__(self, loader, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self._generation = 0
+        self._pending_pages = set()
+        self._change_seq = 0
+        self._total_rows = 0
+        self._loaded_rows = 0
+        self._pages = OrderedDict()
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+        self._filter = QuestionFilter()
+        self.thumbnails = ThumbnailCache(self)
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    def _on_thumbnail_ready(self, ozet):
+        if self._loaded_rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(self._loaded_rows - 1, 1), [Qt.DecorationRole])
+
+    def _query_args(self):
+        return self._sort_column, self._sort_order == Qt.DescendingOrder, self._filter
+
+    def _next_generation(self):
+        self._generation += 1
+        for page_idx in self._pending_pages:
+            self.loader.cancel(("page", page_idx))
+        self._pending_pages.clear()
+        return self._generation
+
+    def refresh(self):
+        generation = self._next_generation()
+        self.loader.cancel("changes")
+        query_args = self._query_args()
+        self.loader.submit("refresh", lambda task: bank.load_question_snapshot(*query_args, self.PAGE_SIZE),
+                           lambda result: self._apply_refresh(generation, *result))
+
+    @metrics.timed("ui.table_refresh")
+    def _apply_refresh(self, generation, change_seq, total_rows, first_page):
+        if generation != self._generation:
+            return
+        self.beginResetModel()
+        self._change_seq = change_seq
+        self._pages = OrderedDict([(0, first_page)])
+        self._total_rows = total_rows
+        self._loaded_rows = min(self.PAGE_SIZE, total_rows)
+        self.endResetModel()
+        self.refreshed.emit()
+
+    def refresh_changes(self):
+        if self.loader.is_busy("refresh"):
+            return
+        generation = self._generation
+        since_seq = self._change_seq
+        query_args = self._query_args()
+        load = lambda task: bank.load_question_changes(since_seq, *query_args, self.PAGE_SIZE, self.MAX_INCREMENTAL_CHANGES)
+        self.loader.submit("changes", load, lambda result: self._apply_changes(generation, result))
+
+    @metrics.timed("ui.table_changes")
+    def _apply_changes(self, generation, result):
+        if result is None or generation != self._generation:
+            return
+        if result[0] == "full":
+            self._apply_refresh(self._next_generation(), *result[1:])
+            return
+        _, change_seq, deleted_positions, inserted_count, updated_rows = result
+        self._next_generation()
+        self._change_seq = change_seq
+        descending = self._sort_order == Qt.DescendingOrder
+        dirty_pages = []
+
+        for ascending_position in sorted(deleted_positions, reverse=True):
+            position = self._total_rows - 1 - ascending_position if descending else ascending_position
+            if position < self._loaded_rows:
+                self.beginRemoveRows(QModelIndex(), position, position)
+                self._total_rows -= 1; self._loaded_rows -= 1
+                self.endRemoveRows()
+            else:
+                self._total_rows -= 1
+            dirty_pages.append(position // self.PAGE_SIZE)
+
+        if inserted_count:
+            position = 0 if descending else self._total_rows
+            if descending or self._loaded_rows == self._total_rows:
+                self.beginInsertRows(QModelIndex(), position, position + inserted_count - 1)
+                self._total_rows += inserted_count; self._loaded_rows += inserted_count
+                self.endInsertRows()
+            else:
+                self._total_rows += inserted_count
+            dirty_pages.append(position // self.PAGE_SIZE)
+
+        if dirty_pages:
+            first_dirty_page = min(dirty_pages)
+            for page_idx in [idx for idx in self._pages if idx >= first_dirty_page]:
+                del self._pages[page_idx]
+            first_row = first_dirty_page * self.PAGE_SIZE
+            if first_row < self._loaded_rows:
+                self.dataChanged.emit(self.index(first_row, 0), self.index(self._loaded_rows - 1, self.columnCount() - 1))
+
+        for page_idx, page in self._pages.items():
+            for offset, row in enumerate(page):
+                if row[0] in updated_rows:
+                    page[offset] = updated_rows[row[0]]
+                    row_idx = page_idx * self.PAGE_SIZE + offset
+                    self.dataChanged.emit(self.index(row_idx, 0), self.index(row_idx, self.columnCount() - 1))
+        self.refreshed.emit()
+
+    def _request_page(self, page_idx):
+        if page_idx in self._pending_pages:
+            return
+        self._pending_pages.add(page_idx)
+        generation = self._generation
+        sort_column, descending, question_filter = self._query_args()
+        self.loader.submit(
+            ("page", page_idx),
+            lambda task: bank.get_questions_page(sort_column, descending, self.PAGE_SIZE, page_idx * self.PAGE_SIZE, question_filter),
+            lambda rows: self._apply_page(generation, page_idx, rows))
+
+    @metrics.timed("ui.table_page")
+    def _apply_page(self, generation, page_idx, rows):
+        if generation != self._generation:
+            return
+        metrics.count("ui.table_rows", len(rows))
+        self._pending_pages.discard(page_idx)
+        self._pages[page_idx] = rows
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        first_row = page_idx * self.PAGE_SIZE
+        last_row = min(first_row + self.PAGE_SIZE, self._loaded_rows) - 1
+        if last_row >= first_row:
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, self.columnCount() - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(QUESTION_TABLE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return QUESTION_TABLE_HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < self._total_rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, self._total_rows - self._loaded_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
+
+    def row_data(self, row_idx):
+        page_idx, offset = divmod(row_idx, self.PAGE_SIZE)
+        page = self._pages.get(page_idx)
+        if page is None:
+            self._request_page(page_idx)
+            return None
+        self._pages.move_to_end(page_idx)
+        return page[offset] if offset < len(page) else None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole, Qt.DecorationRole):
+            return None
+        if role == Qt.DecorationRole and index.column() != 1:
+            return None
+        row_data = self.row_data(index.row())
+        if row_data is None:
+            return None
+        column = index.column()
+        if role == Qt.DecorationRole:
+            refs = attachment_refs(row_data[1])
+            return self.thumbnails.pixmap(refs[0]) if refs else None
+        if column == 7:
+            return correct_option_label(row_data)
+        value = row_data[column]
+        return value if column == 0 else plain_text(str(value))
+
+    def question_filter(self):
+        return self._filter
+
+    def set_question_filter(self, question_filter):
+        # A new text search starts out ordered by relevance; other filter changes keep the order.
+        if question_filter.text != self._filter.text:
+            self._sort_column = None if question_filter.has_text() else 0
+            self._sort_order = Qt.AscendingOrder
+        self._filter = question_filter
+        self.refresh()
+
+    def sort_column(self):
+        return self._sort_column
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column >= len(QUESTION_SORT_COLUMNS):
+            return
+        self._sort_column = column if column >= 0 else None
+        self._sort_order = order
+        self.refresh()
+
+PRINT_TITLE = "Mini Soru Bankası - Soru Listesi"
+
+def _print_font_family():
+    try: base_font_family = "Segoe UI"; QFont(base_font_family)
+    except: base_font_family = "Arial"
+    return base_font_family
+
+def _char_format(font, color):
+    char_format = QTextCharFormat(); char_format.setFont(font); char_format.setForeground(QBrush(QColor(color)))
+    return char_format
+
+class PrintFormats:
+    """Character formats of the printed question list, built once and shared by every question."""
+
+    def __init__(self):
+        family = _print_font_family()
+        self.title = _char_format(QFont(family, 16, QFont.Bold), NAVY_PRIMARY)
+        self.question_label = _char_format(QFont(family, 12, QFont.Bold), TEXT_NAVY_HEADER)
+        self.question_text = _char_format(QFont(family, 12), TEXT_ON_LIGHT_BG)
+        self.option = _char_format(QFont(family, 10), TEXT_ON_LIGHT_BG)
+        self.correct_option = _char_format(QFont(family, 10, QFont.Bold), RED_PRIMARY)
+        self.category = _char_format(QFont(family, 9, QFont.Normal, italic=True), NAVY_ACCENT)
+        self.footer_font = QFont(family, 9)
+
+class AttachmentImages:
+    """Decoded attachment images shared by every print document.
+
+    An image used by many questions is read and decoded once, and each document's resource
+    is a reference to the same QImage, so the PDF writer embeds its data once. Least recently
+    used images are dropped past MAX_BYTES. Print jobs run on worker threads, hence the lock.
+    """
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._preloaded = {}
+
+    def preload(self, attachments):
+        """Takes images from attachments ({ozet: (type, bytes)}) rather than the database (exam workers)."""
+        self._preloaded.update(attachments)
+
+    def image(self, ozet):
+        with self._lock:
+            image = self._images.get(ozet)
+            if image is not None:
+                self._images.move_to_end(ozet)
+                return image
+        attachment = self._preloaded.get(ozet) or get_attachment(ozet)
+        image = QImage.fromData(attachment[1]) if attachment else QImage()
+        if image.isNull():
+            return image  # not cached: the image may still arrive (an archive, another client)
+        with self._lock:
+            if ozet not in self._images:
+                self._images[ozet] = image
+                self._bytes += image.sizeInBytes()
+                while self._bytes > self.MAX_BYTES and len(self._images) > 1:
+                    self._bytes -= self._images.popitem(last=False)[1].sizeInBytes()
+        return image
+
+print_images = AttachmentImages()
+
+# Qt sizes document images in 1/96 inch units and scales them to the paint device's resolution.
+_DOCUMENT_IMAGE_DPI = 96
+_IMAGE_TAG_RE = re.compile(r"<img\b([^>]*)>", re.IGNORECASE)
+_IMAGE_SOURCE_RE = re.compile(r"""\bsrc=["']([^"']*)["']""")
+
+def insert_field(cursor, text, char_format):
+    """Inserts a question field: plain text as it is, rich text as HTML in char_format's font,
+    with its images taken from print_images and narrowed to the text width."""
+    if not is_rich_text(text):
+        cursor.insertText(text, char_format)
+        return
+    document = cursor.document()
+    device = document.documentLayout().paintDevice()
+    max_width = document.textWidth() * _DOCUMENT_IMAGE_DPI / device.logicalDpiX() if device else document.textWidth()
+    widths = {}
+    for ozet in set(attachment_refs(text)):
+        image = print_images.image(ozet)
+        if not image.isNull():
+            document.addResource(QTextDocument.ImageResource, QUrl(attachment_url(ozet)), image)
+            widths[attachment_url(ozet)] = image.width()
+
+    def fit(match):
+        source = _IMAGE_SOURCE_RE.search(match.group(1))
+        width = widths.get(source.group(1)) if source else None
+        if width is None or width <= max_width or "width=" in match.group(1):
+            return match.group(0)
+        return f'<img{match.group(1)} width="{int(max_width)}">'
+
+    font = char_format.font()
+    style = (f"font-family:'{font.family()}'; font-size:{font.pointSizeF():g}pt; "
+             f"font-weight:{'bold' if font.bold() else 'normal'}; font-style:{'italic' if font.italic() else 'normal'}; "
+             f"color:{char_format.foreground().color().name()}")
+    cursor.insertHtml(f'<span style="{style}">{_IMAGE_TAG_RE.sub(fit, text[len(RICH_TEXT_PREFIX):])}</span>')
+    cursor.setCharFormat(char_format)
+
+def write_question(cursor, number, q_data, formats):
+    cursor.insertText(f"Soru {number} (ID: {q_data[0]}): ", formats.question_label)
+    insert_field(cursor, q_data[1], formats.question_text)
+    cursor.insertText("\n", formats.question_text)
+    correct_option_index = q_data[7]
+    for j in range(5):
+        option_text = q_data[2+j]
+        if option_text or (j == correct_option_index and correct_option_index is not None):
+            current_option_text = option_text if option_text else "[BOŞ]"
+            option_format = formats.correct_option if j == correct_option_index else formats.option
+            cursor.insertText(f"  * {chr(65+j)}) " if j == correct_option_index else f"    {chr(65+j)}) ", option_format)
+            insert_field(cursor, current_option_text, option_format)
+            cursor.insertText("\n", option_format)
+    if q_data[8] and q_data[8].lower() != "genel":
+        cursor.insertText(f"    Kategori: {q_data[8]}\n", formats.category)
+    cursor.insertBlock()
+
+
+class StreamingPrintRenderer:
+    """Paginates the question list straight onto a QPrinter without building one big document.
+
+    Questions are streamed from SQLite in id order and laid out one at a time in a single
+    reused QTextDocument sized to the printer's page, then painted at the current page
+    offset; a question that does not fit starts a new page, and one taller than a whole
+    page is split at line boundaries. Memory use is independent of the bank size.
+    """
+    FOOTER_HEIGHT_INCH = 0.35
+
+    def __init__(self, formats=None, layout_cache=None, title=PRINT_TITLE, writer=write_question):
+        self.formats = formats or PrintFormats()
+        self.layout_cache = layout_cache
+        self.title = title
+        self.writer = writer
+
+    @metrics.timed("print.render")
+    def render(self, printer, task=None, questions=None, total=None, question_filter=None):
+        """Prints questions (rows) or, by default, the bank restricted to question_filter."""
+        self._question_filter = QuestionFilter.coerce(question_filter)
+        if questions is None and self.layout_cache is None:
+            questions = iter_all_questions(question_filter=self._question_filter)
+            total = count_questions(self._question_filter)
+        painter = QPainter()
+        if not painter.begin(printer):
+            raise RuntimeError("Yazıcı/PDF çıktısı başlatılamadı.")
+        try:
+            return self._render(painter, printer, questions, total, task)
+        finally:
+            painter.end()
+
+    def _render(self, painter, printer, questions, total, task):
+        self._painter, self._printer = painter, printer
+        page_rect = printer.pageRect()
+        self._width = page_rect.width()
+        self._footer_height = int(printer.resolution() * self.FOOTER_HEIGHT_INCH)
+        self._body_height = page_rect.height() - self._footer_height
+        self._page, self._y = 1, 0
+        document = QTextDocument()
+        document.documentLayout().setPaintDevice(printer)
+        document.setDocumentMargin(0)
+        document.setTextWidth(self._width)
+
+        QTextCursor(document).insertText(f"{self.title}\n\n", self.formats.title)
+        self._paint(document)
+        number = 0
+        for number, question_document in enumerate(self._question_documents(document, printer, questions), start=1):
+            if task and number % 50 == 0:
+                task.check_cancelled()
+                if total: task.report_progress(number / total)
+            self._paint(question_document)
+        if number == 0:
+            document.clear()
+            QTextCursor(document).insertText("Yazdırılacak soru bulunmamaktadır.", self.formats.option)
+            self._paint(document)
+        self._draw_footer()
+        return self._page
+
+    def _question_documents(self, document, printer, questions):
+        if self.layout_cache is not None and questions is None:
+            yield from self.layout_cache.documents(printer, self._question_filter)
+            return
+        for number, q_data in enumerate(questions, start=1):
+            with metrics.span("print.layout"):
+                document.clear()
+                self.writer(QTextCursor(document), number, q_data, self.formats)
+            yield document
+
+    @metrics.timed("print.paint")
+    def _paint(self, document):
+        doc_height = document.size().height()
+        if self._y > 0 and self._y + doc_height > self._body_height:
+            self._new_page()
+        offset = 0.0
+        while True:
+            available = self._body_height - self._y
+            cut = doc_height if doc_height - offset <= available else self._break_before(document, offset, offset + available)
+            self._painter.save()
+            self._painter.translate(0, self._y - offset)
+            document.drawContents(self._painter, QRectF(0, offset, self._width, cut - offset))
+            self._painter.restore()
+            self._y += cut - offset
+            offset = cut
+            if offset >= doc_height:
+                return
+            self._new_page()
+
+    @staticmethod
+    def _break_before(document, start, limit):
+        layout = document.documentLayout()
+        best = None
+        block = document.begin()
+        while block.isValid():
+            top = layout.blockBoundingRect(block).top()
+            text_layout = block.layout()
+            for i in range(text_layout.lineCount()):
+                line = text_layout.lineAt(i)
+                bottom = top + line.y() + line.height()
+                if start < bottom <= limit:
+                    best = bottom
+            block = block.next()
+        return best if best is not None else limit
+
+    def _new_page(self):
+        metrics.count("print.pages")
+        self._draw_footer()
+        self._printer.newPage()
+        self._page += 1
+        self._y = 0
+
+    def _draw_footer(self):
+        self._painter.save()
+        self._painter.setFont(self.formats.footer_font)
+        self._painter.setPen(QColor(TEXT_ON_LIGHT_BG))
+        self._painter.drawText(QRectF(0, self._body_height, self._width, self._footer_height),
+                               Qt.AlignRight | Qt.AlignVCenter, str(self._page))
+        self._painter.restore()
+
+
+class PrintLayoutCache:
+    """Laid-out per-question documents kept between print preview repaints.
+
+    Fragments are keyed by question id and print number and are laid out against an
+    owned metrics image at the printer's resolution and page width, so they outlive the
+    QPrinter they were first rendered for. Before each render the change log names the
+    questions written since the last one; only those, and questions whose number shifted,
+    are laid out again. A repaint with no changes does not read the question table.
+    Fragments belong to one filter and are dropped when it changes; past MAX_FRAGMENTS
+    the rest are laid out on every render, reading only those questions by id.
+    """
+    MAX_FRAGMENTS = 10000
+
+    def __init__(self, formats):
+        self.formats = formats
+        self._key = None
+        self._metrics_device = None
+        self._change_cursor = None
+        self._fragments = {}
+        self._ids = None
+        self._filter = None
+
+    def clear(self):
+        self._fragments = {}
+        self._ids = None
+
+    def _sync(self, printer):
+        key = (soru_bankasi_core.DB_NAME, printer.pageRect().width(), printer.resolution())
+        change_cursor = get_change_cursor()
+        if key != self._key:
+            self.clear()
+            self._key = key
+            dots_per_meter = round(printer.resolution() / 0.0254)
+            self._metrics_device = QImage(1, 1, QImage.Format_ARGB32)
+            self._metrics_device.setDotsPerMeterX(dots_per_meter)
+            self._metrics_device.setDotsPerMeterY(dots_per_meter)
+        elif change_cursor != self._change_cursor:
+            changes = get_changes_since(self._change_cursor, self.MAX_FRAGMENTS)
+            if changes is None:
+                self.clear()
+            else:
+                for _, soru_id, _ in changes:
+                    self._fragments.pop(soru_id, None)
+                self._ids = None
+        self._change_cursor = change_cursor
+
+    @metrics.timed("print.layout")
+    def _layout(self, number, q_data):
+        document = QTextDocument()
+        document.setUndoRedoEnabled(False)
+        document.documentLayout().setPaintDevice(self._metrics_device)
+        document.setDocumentMargin(0)
+        document.setTextWidth(self._key[1])
+        write_question(QTextCursor(document), number, q_data, self.formats)
+        document.size()
+        return document
+
+    def _cached_documents(self, batch_size=500):
+        """Replays the last render's ids: cached fragments as they are, the rest read by id and laid out."""
+        for start in range(0, len(self._ids), batch_size):
+            chunk = self._ids[start:start + batch_size]
+            missing = [soru_id for soru_id in chunk if soru_id not in self._fragments]
+            rows = soru_bankasi_core.get_question_cache().rows(missing, keep=False) if missing else {}
+            for number, soru_id in enumerate(chunk, start=start + 1):
+                fragment = self._fragments.get(soru_id)
+                if fragment:
+                    yield fragment[1]
+                elif soru_id in rows:  # else deleted since _sync; the next render reads the change
+                    yield self._layout(number, rows[soru_id])
+
+    def documents(self, printer, question_filter=None):
+        self._sync(printer)
+        question_filter = QuestionFilter.coerce(question_filter)
+        if question_filter != self._filter:
+            self._filter = question_filter
+            self.clear()
+        if self._ids is not None:
+            yield from self._cached_documents()
+            return
+        ids = []
+        for number, q_data in enumerate(iter_all_questions(question_filter=question_filter), start=1):
+            ids.append(q_data[0])
+            fragment = self._fragments.get(q_data[0])
+            if fragment is None or fragment[0] != number:
+                fragment = (number, self._layout(number, q_data))
+                if q_data[0] in self._fragments or len(self._fragments) < self.MAX_FRAGMENTS:
+                    self._fragments[q_data[0]] = fragment
+            yield fragment[1]
+        self._ids = ids
+
+
+def create_pdf_printer(path):
+    printer = QPrinter(QPrinter.HighResolution)
+    printer.setOutputFormat(QPrinter.PdfFormat)
+    printer.setOutputFileName(path)
+    printer.setPageSize(QPrinter.A4)
+    return printer
+
+def export_questions_pdf(path, task=None, question_filter=None):
+    return StreamingPrintRenderer().render(create_pdf_printer(path), task, question_filter=question_filter)
+
+def write_exam_question(cursor, number, question, formats):
+    cursor.insertText(f"{number}. ", formats.question_label)
+    insert_field(cursor, question[1], formats.question_text)
+    cursor.insertText("\n", formats.question_text)
+    for j, option_text in enumerate(question[2]):
+        cursor.insertText(f"    {chr(65+j)}) ", formats.option)
+        insert_field(cursor, option_text, formats.option)
+        cursor.insertText("\n", formats.option)
+    cursor.insertBlock()
 
 class ViewPrintQuestionsWidget(QWidget):
+    SEARCH_DEBOUNCE_MS = 250
+    CHANGE_POLL_MS = 1000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet(f"background-color: {WHITE_PRIMARY};")
@@ -302,20 +1244,80 @@ class ViewPrintQuestionsWidget(QWidget):
         self.layout.setContentsMargins(15, 15, 15, 15)
         self.layout.setSpacing(10)
 
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(8)
-        self.table_widget.setHorizontalHeaderLabels([
-            "ID", "Soru Metni", "A", "B", "C", "D", "E", "Cevap Şıkkı"
-        ])
-        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table_widget.setSelectionMode(QTableWidget.SingleSelection)
-        self.table_widget.verticalHeader().setVisible(False)
-        self.table_widget.setShowGrid(True)
-        self.table_widget.setAlternatingRowColors(True)
-
-        self.table_widget.setStyleSheet(f"""
-            QTableWidget {{
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Soru metni, seçenek veya kategoride ara...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedHeight(34)
+        self.search_input.setStyleSheet(f"""
+            QLineEdit {{
+                border: 1px solid {BORDER_COLOR}; border-radius: 4px;
+                padding: 6px; font-size: 13px;
+                background-color: {WHITE_PRIMARY}; color: {TEXT_ON_LIGHT_BG};
+            }}
+            QLineEdit:focus {{ border: 1.5px solid {NAVY_PRIMARY}; }}
+        """)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.layout.addWidget(self.search_input)
+
+        # Filter bar: compiled into the same QuestionFilter the list, printing and PDF export use.
+        filter_style = f"""
+            QToolButton, QSpinBox, QCheckBox, QPushButton {{
+                font-size: 13px; color: {TEXT_ON_LIGHT_BG};
+            }}
+            QToolButton, QSpinBox, QPushButton {{
+                border: 1px solid {BORDER_COLOR}; border-radius: 4px; padding: 4px 8px;
+                background-color: {WHITE_PRIMARY};
+            }}
+            QToolButton:hover, QPushButton:hover {{ border: 1px solid {NAVY_ACCENT}; }}
+        """
+        self.filter_layout = QHBoxLayout()
+        self.filter_layout.setSpacing(8)
+        self.selected_categories = []
+        self.category_button = QToolButton()
+        self.category_button.setText("Kategoriler")
+        self.category_button.setPopupMode(QToolButton.InstantPopup)
+        self.category_menu = QMenu(self.category_button)
+        self.category_menu.aboutToShow.connect(self._fill_category_menu)
+        self.category_button.setMenu(self.category_menu)
+        self.filter_layout.addWidget(self.category_button)
+        self.min_id_input, self.max_id_input = QSpinBox(), QSpinBox()
+        for spin_box, empty_text in ((self.min_id_input, "İlk ID"), (self.max_id_input, "Son ID")):
+            spin_box.setRange(0, 2**31 - 1)
+            spin_box.setSpecialValueText(empty_text)  # shown for 0: no bound
+            spin_box.setMinimumWidth(90)
+            spin_box.valueChanged.connect(self.search_timer.start)
+            self.filter_layout.addWidget(spin_box)
+        self.empty_option_check = QCheckBox("Boş seçeneği olanlar")
+        self.empty_option_check.toggled.connect(self.search_timer.start)
+        self.filter_layout.addWidget(self.empty_option_check)
+        self.filter_layout.addStretch(1)
+        self.clear_filter_button = QPushButton("Filtreyi Temizle")
+        self.clear_filter_button.clicked.connect(self.clear_filter)
+        self.filter_layout.addWidget(self.clear_filter_button)
+        for index in range(self.filter_layout.count()):
+            widget = self.filter_layout.itemAt(index).widget()
+            if widget is not None:
+                widget.setStyleSheet(filter_style)
+        self.layout.addLayout(self.filter_layout)
+
+        self.loader = BackgroundLoader(self)
+        self.question_model = QuestionTableModel(self.loader, self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.question_model)
+        self.table_view.setEditTriggers(QTableView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QTableView.SelectRows)
+        self.table_view.setSelectionMode(QTableView.SingleSelection)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.setShowGrid(True)
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setIconSize(ThumbnailCache.SIZE)
+
+        self.table_view.setStyleSheet(f"""
+            QTableView {{
                 gridline-color: #E0E0E0; font-size: 13px;
                 border: 1px solid {BORDER_COLOR}; border-radius: 4px;
                 alternate-background-color: {OFF_WHITE_BG};
@@ -328,21 +1330,24 @@ class ViewPrintQuestionsWidget(QWidget):
                 border-right: 1px solid {NAVY_ACCENT}; border-left: 0px;
             }}
             QHeaderView::section:first {{ border-left: 1px solid {NAVY_ACCENT}; }}
-            QTableWidget::item {{ padding: 6px; border-bottom: 1px solid #F0F0F0; }}
-            QTableWidget::item:selected {{
+            QTableView::item {{ padding: 6px; border-bottom: 1px solid #F0F0F0; }}
+            QTableView::item:selected {{
                 background-color: {NAVY_ACCENT}; color: {TEXT_ON_DARK_BG};
             }}
         """)
 
-        header = self.table_widget.horizontalHeader()
+        header = self.table_view.horizontalHeader()
         header.setSectionResizeMode(1, QHeaderView.Stretch)
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.Interactive)
+        self.table_view.setColumnWidth(0, 60)
         for i in range(2, 7):
             header.setSectionResizeMode(i, QHeaderView.Interactive)
-            self.table_widget.setColumnWidth(i, 90)
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents)
-        self.table_widget.setSortingEnabled(True)
-        self.layout.addWidget(self.table_widget)
+            self.table_view.setColumnWidth(i, 90)
+        header.setSectionResizeMode(7, QHeaderView.Interactive)
+        self.table_view.setColumnWidth(7, 110)
+        header.setSortIndicator(0, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.layout.addWidget(self.table_view)
 
         self.bottom_controls_layout = QHBoxLayout()
         self.load_button = QPushButton("Listeyi Yenile")
@@ -357,81 +1362,135 @@ class ViewPrintQuestionsWidget(QWidget):
             QPushButton:pressed {{ background-color: {NAVY_PRIMARY}; }}
         """)
         self.load_button.clicked.connect(self.load_questions)
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setFixedWidth(200)
+        self.busy_bar.setFixedHeight(14)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setStyleSheet(f"""
+            QProgressBar {{ border: 1px solid {BORDER_COLOR}; border-radius: 4px; background-color: {OFF_WHITE_BG}; }}
+            QProgressBar::chunk {{ background-color: {NAVY_ACCENT}; border-radius: 3px; }}
+        """)
+        self.busy_bar.hide()
+        self.loader.busy_changed.connect(self._on_busy_changed)
+        self.loader.task_progress.connect(self._on_task_progress)
+        self.data_version_watcher = None
+        self.print_formats = None
+        self.print_layout_cache = None
+        self.change_poll_timer = QTimer(self)
+        self.change_poll_timer.setInterval(self.CHANGE_POLL_MS)
+        self.change_poll_timer.timeout.connect(self._poll_for_changes)
+        self.bottom_controls_layout.addWidget(self.busy_bar)
         self.bottom_controls_layout.addStretch(1)
         self.bottom_controls_layout.addWidget(self.load_button)
         self.layout.addLayout(self.bottom_controls_layout)
 
     def load_questions(self):
-        questions = get_all_questions()
-        self.table_widget.setSortingEnabled(False)
-        self.table_widget.setRowCount(0)
-        self.table_widget.setRowCount(len(questions))
-        for row_idx, row_data in enumerate(questions):
-            try:
-                id_item = QTableWidgetItem(); id_item.setData(Qt.DisplayRole, row_data[0])
-                self.table_widget.setItem(row_idx, 0, id_item)
-                self.table_widget.setItem(row_idx, 1, QTableWidgetItem(str(row_data[1])))
-                for i in range(5): self.table_widget.setItem(row_idx, 2 + i, QTableWidgetItem(str(row_data[2+i])))
-                correct_option_char = "N/A"; dogru_idx = row_data[7]
-                if dogru_idx is not None and 0 <= dogru_idx < 5:
-                    if row_data[2+dogru_idx]: correct_option_char = chr(65 + dogru_idx)
-                    else: correct_option_char = f"{chr(65 + dogru_idx)} (Boş)"
-                self.table_widget.setItem(row_idx, 7, QTableWidgetItem(str(correct_option_char)))
-            except Exception as e: print(f"DEBUG: HATA - Satır {row_idx} (ID: {row_data[0]}) yüklenirken: {e}")
-        self.table_widget.setSortingEnabled(True)
-
-    def _prepare_document_for_printing(self):
-        document = QTextDocument()
-        cursor = QTextCursor(document)
-        try: base_font_family = "Segoe UI"; QFont(base_font_family)
-        except: base_font_family = "Arial"
-
-        title_format = QTextCharFormat(); title_font = QFont(base_font_family, 16, QFont.Bold)
-        title_format.setFont(title_font); title_format.setForeground(QBrush(QColor(NAVY_PRIMARY)))
-        cursor.insertText("Mini Soru Bankası - Soru Listesi\n\n", title_format)
-
-        question_font_bold = QFont(base_font_family, 12, QFont.Bold)
-        question_font_normal = QFont(base_font_family, 12)
-        option_font = QFont(base_font_family, 10)
-        option_font_bold_correct = QFont(base_font_family, 10, QFont.Bold)
-        category_font = QFont(base_font_family, 9, QFont.Normal, italic=True)
-
-        questions_to_print = get_all_questions()
-        if not questions_to_print:
-            cursor.setFont(option_font); cursor.insertText("Yazdırılacak soru bulunmamaktadır."); return document
-
-        for i, q_data in enumerate(questions_to_print):
-            q_fmt_b = QTextCharFormat(); q_fmt_b.setFont(question_font_bold); q_fmt_b.setForeground(QBrush(QColor(TEXT_NAVY_HEADER)))
-            cursor.insertText(f"Soru {i+1} (ID: {q_data[0]}): ", q_fmt_b)
-            q_fmt_n = QTextCharFormat(); q_fmt_n.setFont(question_font_normal); q_fmt_n.setForeground(QBrush(QColor(TEXT_ON_LIGHT_BG)))
-            cursor.insertText(f"{q_data[1]}\n", q_fmt_n)
-            correct_option_index = q_data[7]
-            for j in range(5):
-                option_text = q_data[2+j]
-                if option_text or (j == correct_option_index and correct_option_index is not None):
-                    opt_char_format = QTextCharFormat()
-                    prefix = "    "; option_label = f"{chr(65+j)})"
-                    current_option_text = option_text if option_text else "[BOŞ]"
-                    opt_char_format.setForeground(QBrush(QColor(TEXT_ON_LIGHT_BG)))
-                    if j == correct_option_index:
-                        opt_char_format.setFont(option_font_bold_correct)
-                        opt_char_format.setForeground(QBrush(QColor(RED_PRIMARY))) # Correct answer in Red
-                        prefix = "  * "
-                    else: opt_char_format.setFont(option_font)
-                    cursor.insertText(f"{prefix}{option_label} {current_option_text}\n", opt_char_format)
-            if q_data[8] and q_data[8].lower() != "genel":
-                cat_fmt = QTextCharFormat(); cat_fmt.setFont(category_font); cat_fmt.setForeground(QBrush(QColor(NAVY_ACCENT)))
-                cursor.insertText(f"    Kategori: {q_data[8]}\n", cat_fmt)
-            cursor.insertBlock()
-        return document
+        self.question_model.refresh()
+
+    def refresh_changes(self):
+        self.question_model.refresh_changes()
+
+    def cancel_pending(self):
+        self.loader.cancel_all()
+
+    def _poll_for_changes(self):
+        if bank is not soru_bankasi_core:
+            self.refresh_changes()  # the server answers an unchanged cursor from its ETag
+            return
+        if self.data_version_watcher is None or self.data_version_watcher.db_name != soru_bankasi_core.DB_NAME:
+            if self.data_version_watcher is not None:
+                self.data_version_watcher.close()
+            self.data_version_watcher = DataVersionWatcher()
+        if self.data_version_watcher.changed():
+            self.refresh_changes()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.change_poll_timer.start()
+
+    def hideEvent(self, event):
+        self.change_poll_timer.stop()
+        super().hideEvent(event)
+
+    def _on_busy_changed(self, busy):
+        if busy and self.busy_bar.isHidden():
+            self.busy_bar.setRange(0, 0)
+        self.busy_bar.setVisible(busy)
+
+    def _on_task_progress(self, key, fraction):
+        if key == "print-document":
+            self.busy_bar.setRange(0, 100)
+            self.busy_bar.setValue(int(fraction * 100))
+
+    def _fill_category_menu(self):
+        self.category_menu.clear()
+        categories = sorted(set(bank.get_category_counts()) | set(self.selected_categories))
+        if not categories:
+            self.category_menu.addAction("Kategori yok").setEnabled(False)
+        for kategori in categories:
+            action = self.category_menu.addAction(kategori)
+            action.setCheckable(True)
+            action.setChecked(kategori in self.selected_categories)
+            action.toggled.connect(lambda checked, kategori=kategori: self._toggle_category(kategori, checked))
+
+    def _toggle_category(self, kategori, checked):
+        if checked and kategori not in self.selected_categories:
+            self.selected_categories.append(kategori)
+        elif not checked and kategori in self.selected_categories:
+            self.selected_categories.remove(kategori)
+        count = len(self.selected_categories)
+        self.category_button.setText(f"Kategoriler ({count})" if count else "Kategoriler")
+        self.search_timer.start()
+
+    def current_filter(self):
+        return QuestionFilter(self.search_input.text(), self.selected_categories,
+                              self.min_id_input.value() or None, self.max_id_input.value() or None,
+                              self.empty_option_check.isChecked())
+
+    def clear_filter(self):
+        for widget in (self.search_input, self.min_id_input, self.max_id_input, self.empty_option_check):
+            widget.blockSignals(True)
+        self.search_input.clear()
+        self.min_id_input.setValue(0)
+        self.max_id_input.setValue(0)
+        self.empty_option_check.setChecked(False)
+        for widget in (self.search_input, self.min_id_input, self.max_id_input, self.empty_option_check):
+            widget.blockSignals(False)
+        self.selected_categories = []
+        self.category_button.setText("Kategoriler")
+        self.apply_filter()
+
+    def apply_filter(self):
+        question_filter = self.current_filter()
+        if question_filter == self.question_model.question_filter():
+            return
+        self.question_model.set_question_filter(question_filter)
+        header = self.table_view.horizontalHeader()
+        header.blockSignals(True)
+        sort_column = self.question_model.sort_column()
+        header.setSortIndicator(-1 if sort_column is None else sort_column, Qt.AscendingOrder)
+        header.blockSignals(False)
+
+    def _on_print_failed(self, error):
+        QMessageBox.critical(self, "Yazdırma", f"Yazdırma sırasında hata oluştu:\n{error}")
 
     def print_questions(self):
         printer = QPrinter(QPrinter.HighResolution)
         dialog = QPrintDialog(printer, self)
         if dialog.exec_() == QDialog.Accepted:
-            document = self._prepare_document_for_printing()
-            document.print_(printer)
-            QMessageBox.information(self, "Yazdırma", "Sorular yazdırıldı.")
+            # QPainter may paint on a QPrinter outside the GUI thread, so the whole job streams in the background.
+            question_filter = self.question_model.question_filter()
+            self.loader.submit("print-document",
+                               lambda task: StreamingPrintRenderer().render(printer, task, question_filter=question_filter),
+                               lambda page_count: QMessageBox.information(self, "Yazdırma", "Sorular yazdırıldı."),
+                               self._on_print_failed)
+
+    def export_pdf(self, path):
+        question_filter = self.question_model.question_filter()
+        self.loader.submit("print-document", lambda task: export_questions_pdf(path, task, question_filter),
+                           lambda page_count: QMessageBox.information(
+                               self, "PDF", f"{page_count} sayfalık PDF oluşturuldu:\n{path}"),
+                           self._on_print_failed)
 
     def print_preview(self):
         printer = QPrinter(QPrinter.HighResolution)
@@ -441,8 +1500,233 @@ class ViewPrintQuestionsWidget(QWidget):
         preview_dialog.exec_()
 
     def _handle_paint_request(self, printer):
-        document = self._prepare_document_for_printing()
-        document.print_(printer)
+        if self.print_formats is None:
+            self.print_formats = PrintFormats()
+        if self.print_layout_cache is None:
+            self.print_layout_cache = PrintLayoutCache(self.print_formats)
+        StreamingPrintRenderer(self.print_formats, self.print_layout_cache).render(
+            printer, question_filter=self.question_model.question_filter())
+
+class StatisticsWidget(QWidget):
+    """Overview of the bank read from the istatistikler aggregates, so opening it costs
+    O(categories) whatever the bank size. While visible it polls for commits like the
+    question list and reloads the counters when something changed."""
+    CHANGE_POLL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet(f"background-color: {WHITE_PRIMARY};")
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(15, 15, 15, 15)
+        self.layout.setSpacing(12)
+
+        self.total_label = QLabel()
+        self.total_label.setStyleSheet(f"color: {TEXT_NAVY_HEADER}; font-size: 20px; font-weight: bold;")
+        self.layout.addWidget(self.total_label)
+
+        columns_layout = QHBoxLayout()
+        columns_layout.setSpacing(20)
+        self.category_table = QTableWidget(0, 3)
+        self.category_table.setHorizontalHeaderLabels(["Kategori", "Soru", "%"])
+        self.category_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.category_table.verticalHeader().setVisible(False)
+        self.category_table.setAlternatingRowColors(True)
+        self.category_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.category_table.setStyleSheet(f"""
+            QTableWidget {{
+                font-size: 13px; border: 1px solid {BORDER_COLOR}; border-radius: 4px;
+                alternate-background-color: {OFF_WHITE_BG}; color: {TEXT_ON_LIGHT_BG};
+            }}
+            QHeaderView::section {{
+                background-color: {NAVY_PRIMARY}; color: {TEXT_ON_DARK_BG};
+                padding: 7px; font-weight: bold; font-size: 13px; border: 0px;
+            }}
+        """)
+        columns_layout.addWidget(self.category_table, 3)
+
+        side_layout = QVBoxLayout()
+        side_layout.setSpacing(8)
+        section_style = f"color: {TEXT_NAVY_HEADER}; font-size: 14px; font-weight: bold; margin-top: 6px;"
+        bar_style = f"""
+            QProgressBar {{ border: 1px solid {BORDER_COLOR}; border-radius: 4px; background-color: {OFF_WHITE_BG};
+                            color: {TEXT_ON_LIGHT_BG}; text-align: center; }}
+            QProgressBar::chunk {{ background-color: {NAVY_ACCENT}; border-radius: 3px; }}
+        """
+        answers_title = QLabel("Doğru cevap dağılımı")
+        answers_title.setStyleSheet(section_style)
+        side_layout.addWidget(answers_title)
+        answers_grid = QGridLayout()
+        self.answer_bars = {}
+        for row, letter in enumerate("ABCDE"):
+            bar = QProgressBar()
+            bar.setStyleSheet(bar_style)
+            bar.setFormat("%v")
+            answers_grid.addWidget(QLabel(letter), row, 0)
+            answers_grid.addWidget(bar, row, 1)
+            self.answer_bars[letter] = bar
+        side_layout.addLayout(answers_grid)
+
+        options_title = QLabel("Dolu seçenek sayısı")
+        options_title.setStyleSheet(section_style)
+        side_layout.addWidget(options_title)
+        self.option_count_label = QLabel()
+        self.option_count_label.setStyleSheet(f"color: {TEXT_ON_LIGHT_BG}; font-size: 13px;")
+        side_layout.addWidget(self.option_count_label)
+
+        quality_title = QLabel("Veri kalitesi")
+        quality_title.setStyleSheet(section_style)
+        side_layout.addWidget(quality_title)
+        quality_form = QFormLayout()
+        self.quality_labels = {}
+        for key, label in list(STATISTICS_QUALITY_LABELS.items()) + [("az_secenekli", "İkiden az seçenekli")]:
+            value_label = QLabel()
+            value_label.setStyleSheet(f"color: {RED_PRIMARY}; font-weight: bold; font-size: 13px;")
+            quality_form.addRow(f"{label}:", value_label)
+            self.quality_labels[key] = value_label
+        side_layout.addLayout(quality_form)
+        side_layout.addStretch(1)
+        columns_layout.addLayout(side_layout, 2)
+        self.layout.addLayout(columns_layout)
+
+        self.loader = BackgroundLoader(self)
+        self.data_version_watcher = None
+        self.change_poll_timer = QTimer(self)
+        self.change_poll_timer.setInterval(self.CHANGE_POLL_MS)
+        self.change_poll_timer.timeout.connect(self._poll_for_changes)
+
+    def _data_changed(self):
+        if self.data_version_watcher is None or self.data_version_watcher.db_name != soru_bankasi_core.DB_NAME:
+            if self.data_version_watcher is not None:
+                self.data_version_watcher.close()
+            self.data_version_watcher = DataVersionWatcher()
+            return True
+        return self.data_version_watcher.changed()
+
+    def load_statistics(self):
+        if bank is soru_bankasi_core:
+            self._data_changed()  # take the version before reading, so later commits are noticed
+        self.loader.submit("statistics", lambda task: bank.get_statistics(), self._apply_statistics)
+
+    def _apply_statistics(self, statistics):
+        total = statistics.get("toplam", {}).get("", 0)
+        categories = sorted(statistics.get("kategori", {}).items(), key=lambda item: (-item[1], item[0]))
+        self.total_label.setText(f"{total} soru, {len(categories)} kategori")
+        self.category_table.setRowCount(len(categories))
+        for row, (kategori, count) in enumerate(categories):
+            self.category_table.setItem(row, 0, QTableWidgetItem(kategori or "(kategorisiz)"))
+            for column, value in ((1, str(count)), (2, f"{count / total * 100:.1f}" if total else "0")):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.category_table.setItem(row, column, item)
+        answers = statistics.get("cevap", {})
+        for letter, bar in self.answer_bars.items():
+            bar.setRange(0, max(total, 1))
+            bar.setValue(answers.get(letter, 0))
+        option_counts = statistics.get("secenek_sayisi", {})
+        self.option_count_label.setText("   ".join(f"{n}: {option_counts.get(str(n), 0)}" for n in range(6)))
+        quality = dict(statistics.get("kalite", {}))
+        quality["az_secenekli"] = option_counts.get("0", 0) + option_counts.get("1", 0)
+        for key, value_label in self.quality_labels.items():
+            value_label.setText(str(quality.get(key, 0)))
+
+    def _poll_for_changes(self):
+        if bank is not soru_bankasi_core:
+            self.load_statistics()  # answered with 304 from the client's ETag cache while nothing changed
+        elif self._data_changed():
+            self.load_statistics()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_statistics()
+        self.change_poll_timer.start()
+
+    def hideEvent(self, event):
+        self.change_poll_timer.stop()
+        super().hideEvent(event)
+
+class PerformanceDialog(QDialog):
+    """Live table of the soru_bankasi_metrics spans (p50/p95 over recent runs) and counters of
+    this process; the checkbox switches recording, which is off unless turned on here, by
+    --trace or by SORU_BANKASI_TRACE."""
+    REFRESH_MS = 1000
+    HEADERS = ["Ölçüm", "Sayı", "Toplam (ms)", "p50 (ms)", "p95 (ms)", "En çok (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performans")
+        self.resize(720, 460)
+        self.setStyleSheet(f"""
+            QDialog {{ background-color: {WHITE_PRIMARY}; }}
+            QLabel, QCheckBox {{ font-size: 13px; color: {TEXT_NAVY_HEADER}; }}
+            QTableWidget {{
+                font-size: 13px; border: 1px solid {BORDER_COLOR}; border-radius: 4px;
+                alternate-background-color: {OFF_WHITE_BG}; color: {TEXT_ON_LIGHT_BG};
+            }}
+            QHeaderView::section {{
+                background-color: {NAVY_PRIMARY}; color: {TEXT_ON_DARK_BG};
+                padding: 7px; font-weight: bold; font-size: 13px; border: 0px;
+            }}
+        """)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(15, 15, 15, 15)
+        self.layout.setSpacing(10)
+
+        self.enabled_check = QCheckBox("Ölçüm açık")
+        self.enabled_check.setChecked(metrics.is_enabled())
+        self.enabled_check.toggled.connect(metrics.enable)
+        self.layout.addWidget(self.enabled_check)
+        self.span_table = QTableWidget(0, len(self.HEADERS))
+        self.span_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.span_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.span_table.verticalHeader().setVisible(False)
+        self.span_table.setAlternatingRowColors(True)
+        self.span_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.layout.addWidget(self.span_table)
+        self.counters_label = QLabel()
+        self.counters_label.setWordWrap(True)
+        self.layout.addWidget(self.counters_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        reset_button = QPushButton("Sıfırla")
+        reset_button.clicked.connect(self.reset)
+        close_button = QPushButton("Kapat")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(close_button)
+        self.layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        rows = metrics.span_statistics()
+        self.span_table.setRowCount(len(rows))
+        for row_idx, row in enumerate(rows):
+            for column, value in enumerate(row):
+                text = value if column == 0 else f"{value:,}" if column == 1 else f"{value:,.3f}"
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.span_table.setItem(row_idx, column, item)
+        counters = metrics.counter_values()
+        self.counters_label.setText("Sayaçlar: " + ("  ".join(f"{name} = {value:,}" for name, value in counters.items())
+                                                   if counters else "-"))
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -464,12 +1748,35 @@ class MainWindow(QMainWindow):
             view_questions_callback=self.show_question_view_and_load_data
         )
         self.view_print_screen = ViewPrintQuestionsWidget(self)
+        self.statistics_screen = StatisticsWidget(self)
+        self.loader = BackgroundLoader(self)
+        self.loader.task_progress.connect(self._on_import_progress)
+        self.loader.task_progress.connect(self._on_exam_progress)
+        self.loader.task_progress.connect(self._on_maintenance_progress)
+        # A restore waits for the tasks on the global pool to finish, so it runs on a pool of its own.
+        self.restore_loader = BackgroundLoader(self, QThreadPool(self))
+        self.restore_loader.task_progress.connect(self._on_maintenance_progress)
+        self.import_progress_dialog = None
+        self.exam_progress_dialog = None
+        self.maintenance_progress_dialog = None
+        self.performance_dialog = None
 
         self.stacked_widget.addWidget(self.welcome_screen)
         self.stacked_widget.addWidget(self.view_print_screen)
+        self.stacked_widget.addWidget(self.statistics_screen)
 
         self.setup_menu()
         self.show_welcome_screen()
+        if bank is soru_bankasi_core:
+            self.sync_duplicate_index_in_background()
+        else:
+            self.setWindowTitle(f"Mini Soru Bankası - {bank.base_url}")
+            # These work on the database file directly; over the server only the list and the add dialog are available.
+            for action in (self.print_action, self.preview_action, self.export_pdf_action, self.exam_action,
+                           self.grade_action, self.import_action, self.duplicates_action, self.backup_action,
+                           self.restore_action, self.archive_action, self.apply_archive_action,
+                           self.reset_identity_action):
+                action.setEnabled(False)
 
     def setup_menu(self):
         menubar = self.menuBar()
@@ -497,6 +1804,9 @@ class MainWindow(QMainWindow):
         self.home_action = QAction("Ana Sayfa", self)
         self.home_action.triggered.connect(self.show_welcome_screen)
         menubar.addAction(self.home_action)
+        self.statistics_action = QAction("İstatistikler", self)
+        self.statistics_action.triggered.connect(self.show_statistics_screen)
+        menubar.addAction(self.statistics_action)
 
         print_menu = menubar.addMenu("Yazdırma")
         self.print_action = QAction("Tüm Soruları Yazdır", self)
@@ -505,20 +1815,354 @@ class MainWindow(QMainWindow):
         self.preview_action = QAction("Baskı Önizleme", self)
         self.preview_action.triggered.connect(self.direct_preview_questions)
         print_menu.addAction(self.preview_action)
+        self.export_pdf_action = QAction("PDF Olarak Kaydet...", self)
+        self.export_pdf_action.triggered.connect(self.direct_export_pdf)
+        print_menu.addAction(self.export_pdf_action)
+        print_menu.addSeparator()
+        self.exam_action = QAction("Sınav Oluştur...", self)
+        self.exam_action.triggered.connect(self.create_exam)
+        print_menu.addAction(self.exam_action)
+        self.grade_action = QAction("Sınav Puanla...", self)
+        self.grade_action.triggered.connect(self.grade_exam_sheets)
+        print_menu.addAction(self.grade_action)
 
         system_menu = menubar.addMenu("Sistem")
+        self.import_action = QAction("Dosyadan Soru İçe Aktar...", self)
+        self.import_action.triggered.connect(self.import_questions_from_file)
+        system_menu.addAction(self.import_action)
+        self.duplicates_action = QAction("Benzer Soruları Bul...", self)
+        self.duplicates_action.triggered.connect(self.find_duplicates)
+        system_menu.addAction(self.duplicates_action)
+        system_menu.addSeparator()
+        self.backup_action = QAction("Yedek Al...", self)
+        self.backup_action.triggered.connect(self.backup_database)
+        system_menu.addAction(self.backup_action)
+        self.restore_action = QAction("Yedekten Geri Yükle...", self)
+        self.restore_action.triggered.connect(self.restore_database)
+        system_menu.addAction(self.restore_action)
+        self.archive_action = QAction("Arşiv Oluştur...", self)
+        self.archive_action.triggered.connect(self.write_archive_file)
+        system_menu.addAction(self.archive_action)
+        self.apply_archive_action = QAction("Arşiv Uygula...", self)
+        self.apply_archive_action.triggered.connect(self.apply_archive_file)
+        system_menu.addAction(self.apply_archive_action)
+        self.reset_identity_action = QAction("Banka Kimliğini Yenile...", self)
+        self.reset_identity_action.triggered.connect(self.reset_bank_identity)
+        system_menu.addAction(self.reset_identity_action)
+        system_menu.addSeparator()
+        self.performance_action = QAction("Performans...", self)
+        self.performance_action.triggered.connect(self.show_performance_dialog)
+        system_menu.addAction(self.performance_action)
+        system_menu.addSeparator()
         self.exit_action = QAction("Çıkış", self)
         self.exit_action.triggered.connect(self.close)
         system_menu.addAction(self.exit_action)
 
     def show_welcome_screen(self):
+        self.view_print_screen.cancel_pending()
         self.stacked_widget.setCurrentWidget(self.welcome_screen)
 
+    def show_performance_dialog(self):
+        if self.performance_dialog is None:
+            self.performance_dialog = PerformanceDialog(self)
+        self.performance_dialog.show()
+        self.performance_dialog.raise_()
+
+    def show_statistics_screen(self):
+        self.view_print_screen.cancel_pending()
+        self.stacked_widget.setCurrentWidget(self.statistics_screen)
+
+    def closeEvent(self, event):
+        self.view_print_screen.cancel_pending()
+        self.statistics_screen.loader.cancel_all()
+        self.loader.cancel_all()
+        self.restore_loader.cancel_all()
+        QThreadPool.globalInstance().waitForDone(3000)
+        self.restore_loader.thread_pool.waitForDone(3000)
+        super().closeEvent(event)
+
     def show_add_question_dialog(self):
         dialog = AddQuestionDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             if self.stacked_widget.currentWidget() == self.view_print_screen:
-                self.view_print_screen.load_questions()
+                self.view_print_screen.refresh_changes()
+
+    def import_questions_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Soru Dosyası Seç", "", "Soru dosyaları (*.csv *.jsonl *.json *.xlsx);;Tüm dosyalar (*)")
+        if not path:
+            return
+        progress_dialog = QProgressDialog("Sorular içe aktarılıyor...", "İptal", 0, 100, self)
+        progress_dialog.setWindowTitle("Toplu İçe Aktarma")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        self.import_progress_dialog = progress_dialog
+        task = self.loader.submit(
+            "import",
+            lambda task: import_questions(path, progress_callback=lambda fraction, report: task.report_progress(fraction),
+                                          is_cancelled=task.is_cancelled),
+            self._on_import_finished, self._on_import_failed)
+        progress_dialog.canceled.connect(task.cancel)
+
+    def _on_import_progress(self, key, fraction):
+        if key == "import" and self.import_progress_dialog is not None:
+            self.import_progress_dialog.setValue(int(fraction * 100))
+
+    def _close_import_progress(self):
+        if self.import_progress_dialog is not None:
+            self.import_progress_dialog.close()
+            self.import_progress_dialog.deleteLater()
+            self.import_progress_dialog = None
+
+    def _on_import_failed(self, error):
+        self._close_import_progress()
+        QMessageBox.critical(self, "İçe Aktarma Hatası", f"Dosya içe aktarılamadı:\n{error}")
+
+    def _on_import_finished(self, report):
+        self._close_import_progress()
+        details = "\n".join(f"Satır {line_no}: {reason}" for line_no, reason in report.rejected[:15])
+        if len(report.rejected) > 15:
+            details += f"\n... ve {len(report.rejected) - 15} satır daha"
+        QMessageBox.information(self, "İçe Aktarma", report.summary() + (f"\n\n{details}" if details else ""))
+        self.sync_duplicate_index_in_background()
+        if self.stacked_widget.currentWidget() == self.view_print_screen:
+            self.view_print_screen.refresh_changes()
+
+    def create_exam(self):
+        category_counts = get_category_counts()
+        if not category_counts:
+            QMessageBox.information(self, "Sınav Oluştur", "Sınav için soru bulunmamaktadır."); return
+        dialog = ExamBuilderDialog(category_counts, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        counts, output_dir, variants = dialog.counts(), dialog.output_dir(), dialog.variants()
+        progress_dialog = QProgressDialog("Kitapçıklar oluşturuluyor...", "İptal", 0, 100, self)
+        progress_dialog.setWindowTitle("Sınav Oluştur")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        self.exam_progress_dialog = progress_dialog
+        task = self.loader.submit(
+            "exam", lambda task: generate_exam_batch(counts, output_dir, variants=variants, task=task),
+            self._on_exam_finished, self._on_exam_failed)
+        progress_dialog.canceled.connect(task.cancel)
+        progress_dialog.canceled.connect(self._close_exam_progress)
+
+    def _on_exam_progress(self, key, fraction):
+        if key in ("exam", "grade") and self.exam_progress_dialog is not None:
+            self.exam_progress_dialog.setValue(int(fraction * 100))
+
+    def _close_exam_progress(self):
+        progress_dialog, self.exam_progress_dialog = self.exam_progress_dialog, None
+        if progress_dialog is not None:
+            progress_dialog.close()
+            progress_dialog.deleteLater()
+
+    def _on_exam_failed(self, error):
+        self._close_exam_progress()
+        QMessageBox.critical(self, "Sınav Oluştur", f"Sınav oluşturulamadı:\n{error}")
+
+    def _on_exam_finished(self, report):
+        self._close_exam_progress()
+        QMessageBox.information(self, "Sınav Oluştur", report.summary())
+
+    def grade_exam_sheets(self):
+        key_path, _ = QFileDialog.getOpenFileName(
+            self, "Cevap Anahtarı Seç", "", "Cevap anahtarı (*.csv *.jsonl);;Tüm dosyalar (*)")
+        if not key_path:
+            return
+        answers_path, _ = QFileDialog.getOpenFileName(
+            self, "Öğrenci Cevapları Seç", os.path.dirname(key_path),
+            "Cevap kağıtları (*.csv *.jsonl *.json *.xlsx);;Tüm dosyalar (*)")
+        if not answers_path:
+            return
+        results_path, _ = QFileDialog.getSaveFileName(
+            self, "Sonuçları Kaydet", os.path.join(os.path.dirname(answers_path), "sonuclar.csv"), "CSV (*.csv)")
+        if not results_path:
+            return
+        items_path = os.path.splitext(results_path)[0] + "_madde_analizi.csv"
+        progress_dialog = QProgressDialog("Cevap kağıtları puanlanıyor...", "İptal", 0, 100, self)
+        progress_dialog.setWindowTitle("Sınav Puanla")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        self.exam_progress_dialog = progress_dialog
+        task = self.loader.submit(
+            "grade", lambda task: grade_exam(key_path, answers_path, results_path, items_path, task=task),
+            lambda report: self._on_grade_finished(report, results_path, items_path), self._on_grade_failed)
+        progress_dialog.canceled.connect(task.cancel)
+        progress_dialog.canceled.connect(self._close_exam_progress)
+
+    def _on_grade_failed(self, error):
+        self._close_exam_progress()
+        QMessageBox.critical(self, "Sınav Puanla", f"Cevap kağıtları puanlanamadı:\n{error}")
+
+    def _on_grade_finished(self, report, results_path, items_path):
+        self._close_exam_progress()
+        details = "\n".join(f"{ogrenci}: {reason}" for ogrenci, reason in report.rejected[:15])
+        files = f"\n\nSonuçlar: {results_path}\nMadde analizi: {items_path}" if report.students else ""
+        QMessageBox.information(self, "Sınav Puanla", report.summary() + files + (f"\n\n{details}" if details else ""))
+
+    def _start_maintenance_task(self, key, title, label, func, on_finished, loader=None):
+        progress_dialog = QProgressDialog(label, "İptal", 0, 100, self)
+        progress_dialog.setWindowTitle(title)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        self.maintenance_progress_dialog = progress_dialog
+        task = (loader or self.loader).submit(key, func, on_finished,
+                                              lambda error: self._on_maintenance_failed(title, error))
+        progress_dialog.canceled.connect(task.cancel)
+        progress_dialog.canceled.connect(self._close_maintenance_progress)
+
+    def _on_maintenance_progress(self, key, fraction):
+        if key in ("backup", "restore", "archive", "apply-archive") and self.maintenance_progress_dialog is not None:
+            self.maintenance_progress_dialog.setValue(int(fraction * 100))
+
+    def _close_maintenance_progress(self):
+        progress_dialog, self.maintenance_progress_dialog = self.maintenance_progress_dialog, None
+        if progress_dialog is not None:
+            progress_dialog.close()
+            progress_dialog.deleteLater()
+
+    def _on_maintenance_failed(self, title, error):
+        self._close_maintenance_progress()
+        QMessageBox.critical(self, title, f"İşlem tamamlanamadı:\n{error}")
+
+    def backup_database(self):
+        default_name = f"soru_bankasi_yedek_{time.strftime('%Y%m%d')}.db"
+        path, _ = QFileDialog.getSaveFileName(self, "Yedek Al", default_name, "Veritabanı (*.db);;Tüm dosyalar (*)")
+        if not path:
+            return
+        self._start_maintenance_task("backup", "Yedek Al", "Yedek alınıyor...",
+                                     lambda task: backup_db(path, task=task),
+                                     lambda size: self._on_backup_finished(path, size))
+
+    def _on_backup_finished(self, path, size):
+        self._close_maintenance_progress()
+        QMessageBox.information(self, "Yedek Al", f"Yedek alındı ({size / 1024 / 1024:.1f} MB):\n{path}")
+
+    def restore_database(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Yedek Dosyası Seç", "", "Veritabanı (*.db);;Tüm dosyalar (*)")
+        if not path:
+            return
+        answer = QMessageBox.question(self, "Yedekten Geri Yükle",
+                                      "Bankadaki tüm sorular yedektekilerle değiştirilecek. Devam edilsin mi?",
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if answer != QMessageBox.Yes:
+            return
+        # restore_db closes the connection pool, so nothing else may be reading while it runs: the
+        # loaders are cancelled here, and the restore task waits for what is already running.
+        self.show_welcome_screen()
+        self.statistics_screen.loader.cancel_all()
+        self.loader.cancel_all()
+
+        def restore(task):
+            while not QThreadPool.globalInstance().waitForDone(100):
+                task.check_cancelled()
+            return restore_db(path, task=task)
+
+        self._start_maintenance_task("restore", "Yedekten Geri Yükle", "Yedek geri yükleniyor...",
+                                     restore, self._on_restore_finished, self.restore_loader)
+
+    def _on_restore_finished(self, total):
+        self._close_maintenance_progress()
+        self.view_print_screen.print_layout_cache = None
+        self.sync_duplicate_index_in_background()
+        QMessageBox.information(self, "Yedekten Geri Yükle", f"Yedek geri yüklendi: {total} soru.")
+
+    def reset_bank_identity(self):
+        answer = QMessageBox.question(
+            self, "Banka Kimliğini Yenile",
+            "Bu banka başka bir makineden dosya olarak kopyalandıysa ona yeni bir kimlik verilir; "
+            "böylece iki banka birbirinin arşivini uygulayabilir. Bir sonraki arşiv tam arşiv olur. Devam edilsin mi?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if answer != QMessageBox.Yes:
+            return
+        self.loader.submit("reset-identity", lambda task: reset_bank_identity(),
+                           lambda bank_id: QMessageBox.information(self, "Banka Kimliğini Yenile",
+                                                                   f"Bankanın yeni kimliği: {bank_id}"),
+                           lambda error: QMessageBox.critical(self, "Banka Kimliğini Yenile",
+                                                              f"İşlem tamamlanamadı:\n{error}"))
+
+    def write_archive_file(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Arşiv Oluştur", "sorular.jsonl.gz",
+            f"Arşiv ({' '.join('*' + extension for extension in ARCHIVE_FILE_TYPES)})")
+        if not path:
+            return
+        if not path.lower().endswith(ARCHIVE_FILE_TYPES):
+            path += ARCHIVE_FILE_TYPES[0]
+        answer = QMessageBox.question(
+            self, "Arşiv Oluştur", "Yalnızca son arşivden beri değişen sorular yazılsın mı?\n"
+            "Hayır derseniz bütün sorular yazılır.", QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+        if answer == QMessageBox.Cancel:
+            return
+        incremental = answer == QMessageBox.Yes
+        self._start_maintenance_task("archive", "Arşiv Oluştur", "Arşiv yazılıyor...",
+                                     lambda task: write_archive(path, incremental=incremental, task=task),
+                                     self._on_archive_finished)
+
+    def _on_archive_finished(self, report):
+        self._close_maintenance_progress()
+        QMessageBox.information(self, "Arşiv Oluştur", f"{report.summary()}\n{report.path}")
+
+    def apply_archive_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Arşiv Seç", "", f"Arşiv ({' '.join('*' + extension for extension in ARCHIVE_FILE_TYPES)})")
+        if not path:
+            return
+        # A dry run first, so deletions can be confirmed before anything changes.
+        self._start_maintenance_task("apply-archive", "Arşiv Uygula", "Arşiv denetleniyor...",
+                                     lambda task: apply_archive(path, task=task, dry_run=True),
+                                     lambda report: self._on_apply_archive_checked(path, report))
+
+    def _on_apply_archive_checked(self, path, report):
+        self._close_maintenance_progress()
+        if report.deleted:
+            answer = QMessageBox.question(
+                self, "Arşiv Uygula",
+                f"Bu arşiv uygulanırsa kaynak bankada silinmiş olan {report.deleted} soru bu bankadan da "
+                f"silinecek. Bu bankanın kendi soruları silinmez.\n\n{report.summary()}\n\nDevam edilsin mi?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if answer != QMessageBox.Yes:
+                return
+        self._start_maintenance_task("apply-archive", "Arşiv Uygula", "Arşiv uygulanıyor...",
+                                     lambda task: apply_archive(path, task=task), self._on_apply_archive_finished)
+
+    def _on_apply_archive_finished(self, report):
+        self._close_maintenance_progress()
+        QMessageBox.information(self, "Arşiv Uygula", report.summary())
+        self.sync_duplicate_index_in_background()
+        if self.stacked_widget.currentWidget() == self.view_print_screen:
+            self.view_print_screen.refresh_changes()
+
+    def sync_duplicate_index_in_background(self):
+        self.loader.submit("duplicate-index", lambda task: sync_duplicate_index(task=task), lambda synced: None)
+
+    def find_duplicates(self):
+        self.loader.cancel("duplicate-index")
+        QApplication.setOverrideCursor(Qt.BusyCursor)
+        self.loader.submit("duplicates", lambda task: find_duplicate_groups(task=task),
+                           self._on_duplicates_found, self._on_duplicates_failed)
+
+    def _on_duplicates_failed(self, error):
+        QApplication.restoreOverrideCursor()
+        QMessageBox.critical(self, "Benzer Sorular", f"Benzer sorular aranamadı:\n{error}")
+
+    def _on_duplicates_found(self, groups):
+        QApplication.restoreOverrideCursor()
+        if not groups:
+            QMessageBox.information(self, "Benzer Sorular", "Birbirine çok benzeyen soru bulunamadı."); return
+        box = QMessageBox(QMessageBox.Information, "Benzer Sorular",
+                          f"{len(groups)} grupta toplam {sum(len(ids) for ids, _ in groups)} benzer soru bulundu.", parent=self)
+        box.setDetailedText(format_duplicate_report(groups, limit=200))
+        box.exec_()
 
     def show_question_view_and_load_data(self):
         self.stacked_widget.setCurrentWidget(self.view_print_screen)
@@ -526,24 +2170,55 @@ class MainWindow(QMainWindow):
 
     def direct_print_questions(self):
         if self.stacked_widget.currentWidget() != self.view_print_screen:
-            self.show_question_view_and_load_data(); QApplication.processEvents()
-        if not self.view_print_screen.table_widget.rowCount() and not get_all_questions():
+            self.show_question_view_and_load_data()
+        if not has_questions():
             QMessageBox.information(self, "Yazdırma", "Yazdırılacak soru bulunmamaktadır."); return
         self.view_print_screen.print_questions()
 
     def direct_preview_questions(self):
         if self.stacked_widget.currentWidget() != self.view_print_screen:
-            self.show_question_view_and_load_data(); QApplication.processEvents()
-        if not self.view_print_screen.table_widget.rowCount() and not get_all_questions():
+            self.show_question_view_and_load_data()
+        if not has_questions():
             QMessageBox.information(self, "Baskı Önizleme", "Önizlenecek soru bulunmamaktadır."); return
         self.view_print_screen.print_preview()
 
-
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
-
-    print(f"Script'in çalıştığı dizin (CWD): {os.getcwd()}")
-    init_db()
+    def direct_export_pdf(self):
+        if not has_questions():
+            QMessageBox.information(self, "PDF", "Dışa aktarılacak soru bulunmamaktadır."); return
+        path, _ = QFileDialog.getSaveFileName(self, "PDF Olarak Kaydet", "sorular.pdf", "PDF dosyaları (*.pdf)")
+        if not path:
+            return
+        if self.stacked_widget.currentWidget() != self.view_print_screen:
+            self.show_question_view_and_load_data()
+        self.view_print_screen.export_pdf(path)
+
+
+def ensure_headless_gui_app():
+    """Returns a QGuiApplication for rendering without a window, using the offscreen platform when no display exists."""
+    app = QGuiApplication.instance()
+    if app is None:
+        if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication([sys.argv[0]])
+    return app
+
+def run_gui(qt_args, server=None):
+    global bank
+    app = QApplication([sys.argv[0], *qt_args])
+
+    log.debug("Script'in çalıştığı dizin (CWD): %s", os.getcwd())
+    if server:
+        from soru_bankasi_client import RemoteBank
+        bank = RemoteBank(server)
+        app.aboutToQuit.connect(bank.close)
+    else:
+        init_db()
+        app.aboutToQuit.connect(close_db)
     main_window = MainWindow()
     main_window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    return app.exec_()
+
+if __name__ == '__main__':
+    # The CLI imports this module lazily (GUI, PDF output); let it find the running copy.
+    sys.modules.setdefault("soruBankası", sys.modules["__main__"])
+    sys.exit(main())
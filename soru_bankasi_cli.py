@@ -0,0 +1,489 @@
+"""Command line interface of Mini Soru Bankası.
+
+Only the Qt-free data layer is imported up front, so scripts and batch jobs start
+quickly; the GUI and the PDF commands import PyQt5 when they actually run.
+"""
+import sys
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sqlite3
+import time
+
+import soru_bankasi_core
+import soru_bankasi_metrics as metrics
+from soru_bankasi_core import (ARCHIVE_FILE_TYPES, DB_NAME, DUPLICATE_THRESHOLD, EXPORT_FILE_TYPES, IMPORT_BATCH_SIZE,
+                               QUESTION_SORT_COLUMNS, RICH_TEXT_PREFIX, STATISTICS_QUALITY_LABELS, QuestionFilter,
+                               add_attachment_file, add_question_to_db, apply_archive, attachment_url, backup_db,
+                               close_db, correct_option_label, count_questions, export_questions, find_duplicate_groups,
+                               format_duplicate_report, generate_exam_batch, get_category_counts, get_item_analysis,
+                               get_questions_by_ids, get_questions_page, get_schema_version, get_statistics, grade_exam,
+                               import_questions, init_db, iter_all_questions, prune_attachments, question_to_dict,
+                               reset_bank_identity, restore_db, search_questions, validate_question, write_archive)
+
+
+def parse_answer(value):
+    """Accepts an option letter (A-E) or a 0-based index; returns -1 when neither."""
+    value = value.strip().upper()
+    if len(value) == 1 and value in "ABCDE":
+        return "ABCDE".index(value)
+    return int(value) if value.isdigit() and int(value) < 5 else -1
+
+def run_add_command(args):
+    secenekler = (args.option + [""] * 5)[:5]
+    dogru_secenek_index = parse_answer(args.answer)
+    error = validate_question(args.soru_metni.strip(), secenekler, dogru_secenek_index)
+    if error:
+        print(f"Hata: {error}", file=sys.stderr)
+        return 1
+    added = add_question_to_db(args.soru_metni.strip(), secenekler, dogru_secenek_index, args.category)
+    if not added:
+        print("Hata: Soru veritabanına eklenemedi.", file=sys.stderr)
+        return 1
+    print("Soru eklendi.")
+    return 0
+
+def print_questions(rows, as_json):
+    for row in rows:
+        if as_json:
+            print(json.dumps(question_to_dict(row), ensure_ascii=False))
+        else:
+            text = row[1].replace("\n", " ")
+            print(f"{row[0]:>7}  {correct_option_label(row):<6} {(row[8] or '')[:14]:<14}  "
+                  f"{text[:80]}{'...' if len(text) > 80 else ''}")
+
+def question_filter_from_args(args):
+    return QuestionFilter(categories=args.kategori, min_id=args.min_id, max_id=args.max_id,
+                          has_empty_option=args.bos_secenek)
+
+def add_filter_arguments(parser):
+    parser.add_argument("-k", "--kategori", action="append", default=[], help="Yalnız bu kategori (tekrarlanabilir)")
+    parser.add_argument("--min-id", type=int, help="En küçük soru ID'si")
+    parser.add_argument("--max-id", type=int, help="En büyük soru ID'si")
+    parser.add_argument("--bos-secenek", action="store_true", help="Yalnız boş seçeneği olan sorular")
+
+def run_list_command(args):
+    question_filter = question_filter_from_args(args)
+    rows = get_questions_page(QUESTION_SORT_COLUMNS.index(args.sort), args.desc, args.limit, args.offset,
+                              question_filter)
+    print_questions(rows, args.json)
+    if not args.json:
+        print(f"{len(rows)} / {count_questions(question_filter)} soru gösterildi.", file=sys.stderr)
+    return 0
+
+def run_search_command(args):
+    rows = search_questions(args.text, args.limit)
+    print_questions(rows, args.json)
+    if not args.json:
+        print(f"'{args.text}' için {len(rows)} sonuç.", file=sys.stderr)
+    return 0
+
+def run_export_command(args):
+    if os.path.splitext(args.path)[1].lower() == ".pdf":
+        return run_export_pdf_command(args)
+    start = time.perf_counter()
+    try:
+        count = export_questions(args.path, question_filter_from_args(args))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} soru yazıldı: {args.path} ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_stats_command(args):
+    aggregates = get_statistics()
+    stats = {"veritabani": soru_bankasi_core.DB_NAME, "boyut_bayt": os.path.getsize(soru_bankasi_core.DB_NAME),
+             "sema_surumu": get_schema_version(), "soru_sayisi": aggregates.get("toplam", {}).get("", 0),
+             "kategoriler": dict(sorted(aggregates.get("kategori", {}).items(), key=lambda item: (-item[1], item[0]))),
+             "cevaplar": {letter: aggregates.get("cevap", {}).get(letter, 0) for letter in "ABCDE"},
+             "secenek_sayilari": {str(n): aggregates.get("secenek_sayisi", {}).get(str(n), 0) for n in range(6)},
+             "kalite": {key: aggregates.get("kalite", {}).get(key, 0) for key in STATISTICS_QUALITY_LABELS}}
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=1))
+        return 0
+    print(f"Veritabanı: {stats['veritabani']} ({stats['boyut_bayt'] / 1024 / 1024:.1f} MB, şema v{stats['sema_surumu']})")
+    print(f"Soru sayısı: {stats['soru_sayisi']}")
+    print("Kategoriler:")
+    for kategori, count in stats["kategoriler"].items():
+        print(f"  {kategori or '(kategorisiz)':<30} {count:>7}")
+    print("Doğru cevap dağılımı: " + "  ".join(f"{letter} {count}" for letter, count in stats["cevaplar"].items()))
+    print("Dolu seçenek sayısı:  " + "  ".join(f"{n}: {count}" for n, count in stats["secenek_sayilari"].items()))
+    for key, label in STATISTICS_QUALITY_LABELS.items():
+        print(f"{label + ':':<30} {stats['kalite'][key]:>7}")
+    return 0
+
+def run_export_pdf_command(args):
+    from soruBankası import ensure_headless_gui_app, export_questions_pdf
+    app = ensure_headless_gui_app()  # must outlive the QPrinter
+    start = time.perf_counter()
+    try:
+        page_count = export_questions_pdf(args.path, question_filter=question_filter_from_args(args))
+    except (OSError, RuntimeError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{page_count} sayfa yazıldı: {args.path} ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_import_command(args):
+    def on_progress(fraction, report):
+        print(f"\r%{fraction * 100:5.1f}  {report.imported} aktarıldı, {len(report.rejected)} reddedildi",
+              end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        report = import_questions(args.path, batch_size=args.batch_size, progress_callback=on_progress)
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"{report.summary()} ({time.perf_counter() - start:.2f} sn)")
+    for line_no, reason in report.rejected[:args.show_rejected]:
+        print(f"  Satır {line_no}: {reason}")
+    if len(report.rejected) > args.show_rejected:
+        print(f"  ... ve {len(report.rejected) - args.show_rejected} satır daha")
+    if args.rejects_file:
+        with open(args.rejects_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["satir", "neden"])
+            writer.writerows(report.rejected)
+    return 0
+
+def parse_exam_weights(specs, as_counts):
+    weights = {}
+    for spec in specs:
+        kategori, _, value = spec.rpartition("=")
+        try:
+            weight = float(value)
+        except ValueError:
+            weight = None
+        if not kategori.strip() or weight is None or (as_counts and not weight.is_integer()):
+            raise ValueError(f"Geçersiz kategori tanımı: '{spec}' (örn. Tarih=10)")
+        weights[kategori.strip()] = int(weight) if as_counts else weight
+    return weights
+
+def run_exam_command(args):
+    if args.format == "pdf":
+        from soruBankası import ensure_headless_gui_app
+        app = ensure_headless_gui_app()  # must outlive the QPrinter
+    start = time.perf_counter()
+    try:
+        if args.total is None and not args.category:
+            raise ValueError("--category veya --total verilmeli.")
+        weights = (parse_exam_weights(args.category, args.total is None) if args.category
+                   else dict.fromkeys(get_category_counts(), 1.0))
+        report = generate_exam_batch(weights, args.output_dir, total=args.total, variants=args.variants,
+                                     seed=args.seed, output_format=args.format, workers=args.workers)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{report.summary()} ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_grade_command(args):
+    start = time.perf_counter()
+    try:
+        report = grade_exam(args.answer_key, args.answers, args.output, args.items, store=not args.no_store)
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{report.summary()} (dosyalar dahil {time.perf_counter() - start:.2f} sn)")
+    for ogrenci, reason in report.rejected[:args.show_rejected]:
+        print(f"  {ogrenci}: {reason}")
+    if report.students and args.show_items:
+        print("Ayırt ediciliği en düşük sorular:")
+        for row in sorted(report.item_rows(), key=lambda row: row[4])[:args.show_items]:
+            print(f"  ID {row[0]:>7}  güçlük {row[3]:.2f}  ayırt edicilik {row[4]:+.2f}")
+    return 0
+
+def run_item_analysis_command(args):
+    analysis = get_item_analysis(args.soru_id)
+    if analysis is None:
+        print(f"ID {args.soru_id} için kayıtlı madde analizi yok.", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(analysis, ensure_ascii=False))
+        return 0
+    item_rest = analysis["madde_toplam_korelasyonu"]
+    print(f"Soru {analysis['soru_id']}: {analysis['ogrenci_sayisi']} öğrenci, {analysis['dogru_sayisi']} doğru "
+          f"({analysis['analiz_zamani']})")
+    print(f"Güçlük: {analysis['guclik']:.2f}  Ayırt edicilik: {analysis['ayirt_edicilik']:+.2f}  "
+          f"Madde-toplam korelasyonu: {'-' if item_rest is None else f'{item_rest:+.2f}'}")
+    print(f"{'Seçenek':<8} {'Tümü':>7} {'Üst %27':>8} {'Alt %27':>8}")
+    for option, (total, upper, lower) in analysis["secenek_dagilimi"].items():
+        print(f"{'Boş' if option == 'bos' else option:<8} {total:>7} {upper:>8} {lower:>8}")
+    return 0
+
+def run_duplicates_command(args):
+    start = time.perf_counter()
+    try:
+        groups = find_duplicate_groups(args.threshold)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{len(groups)} grupta {sum(len(ids) for ids, _ in groups)} benzer soru "
+          f"({time.perf_counter() - start:.2f} sn, eşik %{args.threshold * 100:.0f})")
+    if groups:
+        print(format_duplicate_report(groups, limit=args.limit))
+    if args.csv:
+        rows = get_questions_by_ids(soru_id for ids, _ in groups for soru_id in ids)
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["grup", "soru_id", "en_dusuk_benzerlik", "soru_metni"])
+            for number, (ids, similarity) in enumerate(groups, start=1):
+                writer.writerows((number, soru_id, f"{similarity:.2f}", rows[soru_id][1] if soru_id in rows else "")
+                                 for soru_id in ids)
+    return 0
+
+def run_perf_command(args):
+    if args.url:
+        from soru_bankasi_client import RemoteBank, RemoteBankError
+        body = {key: value for key, value in (("acik", args.state), ("sifirla", args.reset or None)) if value is not None}
+        try:
+            result = RemoteBank(args.url).request("POST" if body else "GET", "/api/performans", body or None)
+        except RemoteBankError as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 1
+        statistics = [(item["ad"], item["sayi"], item["toplam_ms"], item["p50_ms"], item["p95_ms"], item["en_cok_ms"])
+                      for item in result["olcumler"]]
+        print(f"Sunucu {args.url}, ölçüm {'açık' if result['acik'] else 'kapalı'}")
+        print(metrics.format_report(statistics, result["sayaclar"]))
+        return 0
+    # No server: time the reads the GUI makes most often against --db.
+    metrics.enable()
+    metrics.reset()
+    total = count_questions()
+    for repeat in range(args.repeat):
+        get_questions_page(0, False, 200, (repeat * 7919) % max(total - 200, 1))
+        get_questions_page(1, repeat % 2 == 1, 200, 0)
+        count_questions(QuestionFilter(categories=list(get_category_counts())[:1]))
+        get_statistics()
+    with metrics.span("cli.full_scan"):
+        sum(1 for _ in iter_all_questions())
+    print(f"{soru_bankasi_core.DB_NAME}: {total} soru, {args.repeat} tekrar")
+    print(metrics.format_report())
+    return 0
+
+def run_backup_command(args):
+    start = time.perf_counter()
+    try:
+        size = backup_db(args.path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"Yedek alındı: {args.path} ({size / 1024 / 1024:.1f} MB, {time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_restore_command(args):
+    start = time.perf_counter()
+    try:
+        total = restore_db(args.path)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{soru_bankasi_core.DB_NAME} yedekten geri yüklendi: {total} soru ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_reset_identity_command(args):
+    try:
+        bank_id = reset_bank_identity()
+    except sqlite3.Error as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"Bankanın yeni kimliği: {bank_id}. Bir sonraki arşiv tam arşiv olacak.")
+    return 0
+
+def run_archive_command(args):
+    start = time.perf_counter()
+    try:
+        report = write_archive(args.path, incremental=args.incremental)
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{report.summary()} ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_apply_archive_command(args):
+    start = time.perf_counter()
+    try:
+        report = apply_archive(args.path, mirror=args.mirror, dry_run=args.dry_run)
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{report.summary()} ({time.perf_counter() - start:.2f} sn)")
+    return 0
+
+def run_attach_command(args):
+    for path in args.paths:
+        try:
+            ozet = add_attachment_file(path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Hata: {path}: {e}", file=sys.stderr)
+            return 1
+        print(f'{path}: <img src="{attachment_url(ozet)}">')
+    print(f"Metinde kullanmak için alanı {RICH_TEXT_PREFIX} ile başlatın.", file=sys.stderr)
+    return 0
+
+def run_prune_attachments_command(args):
+    try:
+        count, size = prune_attachments()
+    except sqlite3.Error as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"Kullanılmayan {count} resim silindi ({size / 1024:.1f} KB).")
+    return 0
+
+def run_serve_command(args):
+    from soru_bankasi_server import serve
+    serve(args.host, args.port, args.readers)
+    return 0
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="soru_bankasi_cli.py", description="Mini Soru Bankası")
+    parser.add_argument("--db", default=DB_NAME, help=f"Veritabanı dosyası (varsayılan: {DB_NAME})")
+    parser.add_argument("--server", metavar="URL", help="Arayüzü veritabanı dosyası yerine bir soru bankası sunucusuna bağla")
+    parser.add_argument("--log-level", choices=metrics.LOG_LEVELS,
+                        help=f"Günlük düzeyi (varsayılan: SORU_BANKASI_LOG veya {metrics.DEFAULT_LOG_LEVEL})")
+    parser.add_argument("--trace", action="store_true", help="Süre ölçümlerini aç ve çıkışta özetini yaz")
+    parser.add_argument("--profile", nargs="?", const="", metavar="DOSYA",
+                        help="cProfile ile çalıştır; dosya verilirse pstats çıktısı oraya yazılır")
+    subparsers = parser.add_subparsers(dest="command")
+    add_parser = subparsers.add_parser("add", help="Tek bir soru ekle")
+    add_parser.add_argument("soru_metni")
+    add_parser.add_argument("-o", "--option", action="append", default=[], metavar="SECENEK",
+                            help="Yanıt seçeneği; sırayla A-E (en fazla 5)")
+    add_parser.add_argument("-a", "--answer", required=True, help="Doğru şık: A-E veya 0-4")
+    add_parser.add_argument("-c", "--category", default="Genel")
+    add_parser.set_defaults(handler=run_add_command)
+    list_parser = subparsers.add_parser("list", help="Soruları listele")
+    list_parser.add_argument("--limit", type=int, default=50)
+    list_parser.add_argument("--offset", type=int, default=0)
+    list_parser.add_argument("--sort", choices=QUESTION_SORT_COLUMNS, default="id")
+    list_parser.add_argument("--desc", action="store_true", help="Azalan sırala")
+    list_parser.add_argument("--json", action="store_true", help="Her satıra bir JSON nesnesi yaz")
+    add_filter_arguments(list_parser)
+    list_parser.set_defaults(handler=run_list_command)
+    search_parser = subparsers.add_parser("search", help="Soru metni, seçenek ve kategorilerde ara")
+    search_parser.add_argument("text")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--json", action="store_true", help="Her satıra bir JSON nesnesi yaz")
+    search_parser.set_defaults(handler=run_search_command)
+    export_parser = subparsers.add_parser("export", help="Soruları (veya süzülen kısmını) CSV/JSONL ya da PDF dosyasına aktar")
+    export_parser.add_argument("path", help=f"Uzantı biçimi belirler: {', '.join(EXPORT_FILE_TYPES)}, .pdf")
+    add_filter_arguments(export_parser)
+    export_parser.set_defaults(handler=run_export_command)
+    stats_parser = subparsers.add_parser("stats", help="Soru bankası özeti")
+    stats_parser.add_argument("--json", action="store_true")
+    stats_parser.set_defaults(handler=run_stats_command)
+    import_parser = subparsers.add_parser("import", help="CSV/JSONL/XLSX dosyasından toplu soru içe aktar")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    import_parser.add_argument("--show-rejected", type=int, default=20, help="Gösterilecek reddedilen satır sayısı")
+    import_parser.add_argument("--rejects-file", help="Reddedilen satırların yazılacağı CSV dosyası")
+    import_parser.set_defaults(handler=run_import_command)
+    export_pdf_parser = subparsers.add_parser("export-pdf", help="Soruları (veya süzülen kısmını) arayüz açmadan PDF'e aktar")
+    export_pdf_parser.add_argument("path")
+    add_filter_arguments(export_pdf_parser)
+    export_pdf_parser.set_defaults(handler=run_export_pdf_command)
+    exam_parser = subparsers.add_parser("exam", help="Rastgele sınav kitapçıkları (A/B/C...) ve cevap anahtarı üret")
+    exam_parser.add_argument("output_dir")
+    exam_parser.add_argument("-c", "--category", action="append", metavar="KATEGORI=SAYI",
+                             help="Kategoriden çekilecek soru sayısı; --total ile birlikte ağırlık olarak kullanılır")
+    exam_parser.add_argument("--total", type=int, help="Toplam soru sayısı (kategoriler ağırlıklarına göre paylaşır)")
+    exam_parser.add_argument("--variants", type=int, default=3, help="Kitapçık sayısı")
+    exam_parser.add_argument("--seed", type=int, help="Aynı sınavı yeniden üretmek için tohum")
+    exam_parser.add_argument("--format", choices=("pdf", "json"), default="pdf")
+    exam_parser.add_argument("--workers", type=int, help="Süreç havuzu boyutu (varsayılan: CPU sayısı)")
+    exam_parser.set_defaults(handler=run_exam_command)
+    grade_parser = subparsers.add_parser("grade", help="Öğrenci cevap kağıtlarını cevap anahtarına göre puanla")
+    grade_parser.add_argument("answer_key", help="exam komutunun yazdığı cevap_anahtari.csv")
+    grade_parser.add_argument("answers", help="ogrenci, kitapcik, cevaplar sütunlu CSV/JSONL/XLSX dosyası")
+    grade_parser.add_argument("-o", "--output", help="Öğrenci sonuçlarının yazılacağı CSV dosyası")
+    grade_parser.add_argument("--items", help="Madde analizinin yazılacağı CSV dosyası")
+    grade_parser.add_argument("--no-store", action="store_true", help="Madde analizini veritabanına kaydetme")
+    grade_parser.add_argument("--show-items", type=int, default=10, help="Gösterilecek en zayıf soru sayısı")
+    grade_parser.add_argument("--show-rejected", type=int, default=20, help="Gösterilecek reddedilen kağıt sayısı")
+    grade_parser.set_defaults(handler=run_grade_command)
+    item_parser = subparsers.add_parser("item-analysis", help="Bir sorunun kayıtlı madde analizini göster")
+    item_parser.add_argument("soru_id", type=int)
+    item_parser.add_argument("--json", action="store_true")
+    item_parser.set_defaults(handler=run_item_analysis_command)
+    duplicates_parser = subparsers.add_parser("duplicates", help="Birbirine çok benzeyen soruları grupla")
+    duplicates_parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD,
+                                   help="Benzerlik eşiği, 0-1 (varsayılan: %(default)s)")
+    duplicates_parser.add_argument("--limit", type=int, default=50, help="Ekrana yazılacak grup sayısı")
+    duplicates_parser.add_argument("--csv", help="Tüm grupların yazılacağı CSV dosyası")
+    duplicates_parser.set_defaults(handler=run_duplicates_command)
+    perf_parser = subparsers.add_parser("perf", help="Sık okumaların süre ölçümlerini (p50/p95) göster")
+    perf_parser.add_argument("--url", help="Bu sunucunun ölçümlerini göster (yerel ölçüm yerine)")
+    perf_parser.add_argument("--on", dest="state", action="store_const", const=True, help="Sunucuda ölçümü aç")
+    perf_parser.add_argument("--off", dest="state", action="store_const", const=False, help="Sunucuda ölçümü kapat")
+    perf_parser.add_argument("--reset", action="store_true", help="Sunucudaki ölçümleri sıfırla")
+    perf_parser.add_argument("--repeat", type=int, default=20, help="Yerel ölçümde tekrar sayısı")
+    perf_parser.set_defaults(handler=run_perf_command)
+    backup_parser = subparsers.add_parser("backup", help="Veritabanının tutarlı bir yedeğini al (uygulama açıkken de olur)")
+    backup_parser.add_argument("path")
+    backup_parser.set_defaults(handler=run_backup_command)
+    restore_parser = subparsers.add_parser("restore", help="Veritabanını bir yedek dosyasıyla değiştir")
+    restore_parser.add_argument("path")
+    restore_parser.set_defaults(handler=run_restore_command)
+    reset_identity_parser = subparsers.add_parser(
+        "reset-identity", help="Dosya olarak kopyalanmış bir bankaya yeni kimlik ver (arşiv eşitlemesi için)")
+    reset_identity_parser.set_defaults(handler=run_reset_identity_command)
+    archive_parser = subparsers.add_parser("archive", help="Soruları başka bir bankaya taşınacak sıkıştırılmış arşive yaz")
+    archive_parser.add_argument("path", help=f"Uzantı sıkıştırmayı belirler: {', '.join(ARCHIVE_FILE_TYPES)}")
+    archive_parser.add_argument("--incremental", action="store_true",
+                                help="Yalnızca son arşivden beri değişenleri yaz (mümkün değilse tam arşiv)")
+    archive_parser.set_defaults(handler=run_archive_command)
+    apply_archive_parser = subparsers.add_parser("apply-archive", help="Başka bir bankanın arşivini bu bankaya uygula")
+    apply_archive_parser.add_argument("path")
+    apply_archive_parser.add_argument("--dry-run", action="store_true",
+                                      help="Hiçbir şeyi değiştirmeden kaç sorunun ekleneceğini ve silineceğini yaz")
+    apply_archive_parser.add_argument("--mirror", action="store_true",
+                                      help="Tam arşivde olmayan bütün soruları, bu bankanın kendi sorularını da, sil")
+    apply_archive_parser.set_defaults(handler=run_apply_archive_command)
+    attach_parser = subparsers.add_parser("attach", help="Resimleri bankaya ekle ve soru metninde kullanılacak etiketlerini yaz")
+    attach_parser.add_argument("paths", nargs="+", metavar="path")
+    attach_parser.set_defaults(handler=run_attach_command)
+    prune_attachments_parser = subparsers.add_parser("prune-attachments",
+                                                     help="Hiçbir sorunun kullanmadığı resimleri sil")
+    prune_attachments_parser.set_defaults(handler=run_prune_attachments_command)
+    serve_parser = subparsers.add_parser("serve", help="Veritabanını HTTP/JSON üzerinden paylaşan yerel sunucuyu başlat")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: %(default)s)")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--readers", type=int, default=4, help="Okuma iş parçacığı sayısı")
+    serve_parser.set_defaults(handler=run_serve_command)
+    return parser
+
+def run_command(parser, args, qt_args):
+    if args.command is None:
+        from soruBankası import run_gui
+        return run_gui(qt_args, args.server)
+    if qt_args:
+        parser.error(f"tanınmayan argümanlar: {' '.join(qt_args)}")
+    if args.server:
+        parser.error("--server yalnızca arayüzle (komut verilmeden) kullanılabilir")
+    init_db()
+    try:
+        return args.handler(args)
+    finally:
+        close_db()
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args, qt_args = parser.parse_known_args(argv)
+    metrics.configure_logging(args.log_level)
+    if args.trace:
+        metrics.enable()
+    soru_bankasi_core.DB_NAME = args.db
+    try:
+        with metrics.profiling(args.profile) if args.profile is not None else contextlib.nullcontext():
+            return run_command(parser, args, qt_args)
+    finally:
+        if args.trace:
+            print(metrics.format_report(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
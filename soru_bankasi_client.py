@@ -0,0 +1,221 @@
+"""HTTP client for soru_bankasi_server with the same function names as soru_bankasi_core.
+
+RemoteBank stands in for the core module wherever the GUI reads or writes questions,
+so the question list and the add dialog work unchanged against a shared server. GET
+responses are cached with their ETag and revalidated with If-None-Match.
+"""
+import base64
+import http.client
+import json
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+import soru_bankasi_metrics as metrics
+from soru_bankasi_core import DUPLICATE_THRESHOLD, QUESTION_SORT_COLUMNS, QuestionFilter, question_from_dict
+from soru_bankasi_metrics import log
+
+
+class RemoteBankError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RemoteBank:
+    MAX_CACHED_RESPONSES = 256
+
+    def __init__(self, base_url, timeout=10):
+        url = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+        if url.scheme != "http" or not url.hostname:
+            raise ValueError(f"Geçersiz sunucu adresi: {base_url}")
+        self.base_url = f"http://{url.netloc}"
+        self._host, self._port, self._timeout = url.hostname, url.port or 80, timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._cache = OrderedDict()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @metrics.timed("http.client")
+    def request(self, method, path, body=None, params=None, cache=True):
+        """Returns the decoded JSON body; raises RemoteBankError for transport errors and 4xx/5xx answers.
+        cache=False keeps a large GET answer (an image) out of the ETag cache."""
+        if params:
+            path = f"{path}?{urlencode({k: v for k, v in params.items() if v is not None}, doseq=True)}"
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        cached = None
+        if method == "GET" and cache:
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+        data = None if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        # A kept-alive connection the server has since dropped fails once; only idempotent
+        # requests are retried, a POST may already have been applied.
+        attempts = 1 if method == "POST" else 2
+        for attempt in range(1, attempts + 1):
+            conn = self._connection()
+            try:
+                conn.request(method, path, data, headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if attempt == attempts:
+                    raise RemoteBankError(f"Sunucuya ulaşılamadı ({self.base_url}): {e}")
+            except OSError as e:
+                conn.close()
+                raise RemoteBankError(f"Sunucuya ulaşılamadı ({self.base_url}): {e}")
+        metrics.count("http.client_bytes", len(payload))
+        if response.status == 304 and cached:
+            metrics.count("http.client_not_modified")
+            return cached[1]
+        result = json.loads(payload) if payload else None
+        if response.status >= 400:
+            raise RemoteBankError((result or {}).get("hata", response.reason), response.status)
+        etag = response.getheader("ETag")
+        if method == "GET" and cache and etag:
+            with self._lock:
+                self._cache[path] = (etag, result)
+                self._cache.move_to_end(path)
+                while len(self._cache) > self.MAX_CACHED_RESPONSES:
+                    self._cache.popitem(last=False)
+        return result
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def _sort_params(self, sort_column, descending, question_filter):
+        return {"sort": "alaka" if sort_column is None else QUESTION_SORT_COLUMNS[sort_column],
+                "desc": int(bool(descending)), **QuestionFilter.coerce(question_filter).to_params()}
+
+    def get_questions_page(self, sort_column=0, descending=False, limit=200, offset=0, question_filter=None):
+        try:
+            page = self.request("GET", "/api/sorular", params={**self._sort_params(sort_column, descending, question_filter),
+                                                                 "limit": limit, "offset": offset})
+        except RemoteBankError as e:
+            log.error("get_questions_page içinde sunucu hatası: %s", e)
+            return []
+        return [question_from_dict(question) for question in page["sorular"]]
+
+    def count_questions(self, question_filter=None):
+        try:
+            return self.request("GET", "/api/sorular", params={
+                "limit": 1, **QuestionFilter.coerce(question_filter).to_params()})["toplam"]
+        except RemoteBankError as e:
+            log.error("count_questions içinde sunucu hatası: %s", e)
+            return 0
+
+    def search_questions(self, text, limit=100):
+        return self.get_questions_page(None, False, limit, 0, text)
+
+    def has_questions(self):
+        return self.count_questions() > 0
+
+    def get_change_cursor(self):
+        return self.request("GET", "/api/durum")["imlec"]
+
+    def get_category_counts(self):
+        try:
+            return self.request("GET", "/api/kategoriler")
+        except RemoteBankError as e:
+            log.error("get_category_counts içinde sunucu hatası: %s", e)
+            return {}
+
+    def get_statistics(self):
+        try:
+            return self.request("GET", "/api/istatistik")
+        except RemoteBankError as e:
+            log.error("get_statistics içinde sunucu hatası: %s", e)
+            return {}
+
+    def get_questions_by_ids(self, ids):
+        """One /api/toplu round trip for all ids; missing ones are left out like in the core function."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        answers = self.request("POST", "/api/toplu", {"istekler": [{"method": "GET", "path": f"/api/sorular/{soru_id}"}
+                                                                   for soru_id in ids]})["yanitlar"]
+        return {question["id"]: question_from_dict(question)
+                for question in (answer["govde"] for answer in answers if answer["durum"] == 200)}
+
+    def load_question_snapshot(self, sort_column, descending, question_filter, page_size):
+        snapshot = self.request("GET", "/api/anlik", params={**self._sort_params(sort_column, descending, question_filter),
+                                                              "limit": page_size})
+        return snapshot["imlec"], snapshot["toplam"], [question_from_dict(question) for question in snapshot["sorular"]]
+
+    def load_question_changes(self, since_seq, sort_column, descending, question_filter, page_size, max_changes=500):
+        result = self.request("GET", "/api/degisiklikler", params={
+            **self._sort_params(sort_column, descending, question_filter), "since": since_seq, "limit": page_size,
+            "max": max_changes})
+        if result["tur"] == "yok":
+            return None
+        if result["tur"] == "tam":
+            return "full", result["imlec"], result["toplam"], [question_from_dict(question) for question in result["sorular"]]
+        return ("delta", result["imlec"], result["silinen_konumlar"], result["eklenen"],
+                {question["id"]: question_from_dict(question) for question in result["guncellenen"]})
+
+    def add_question_to_db(self, soru_metni, secenekler, dogru_secenek_index, kategori="Genel"):
+        try:
+            return self.request("POST", "/api/sorular", {"soru_metni": soru_metni, "secenekler": list(secenekler),
+                                                         "dogru_secenek_index": dogru_secenek_index,
+                                                         "kategori": kategori})["id"]
+        except RemoteBankError as e:
+            log.error("add_question_to_db - Sunucu hatası: %s", e)
+            return False
+
+    def update_question(self, soru_id, soru_metni, secenekler, dogru_secenek_index, kategori="Genel"):
+        try:
+            self.request("PUT", f"/api/sorular/{soru_id}", {"soru_metni": soru_metni, "secenekler": list(secenekler),
+                                                            "dogru_secenek_index": dogru_secenek_index,
+                                                            "kategori": kategori})
+            return True
+        except RemoteBankError as e:
+            log.error("update_question - Sunucu hatası: %s", e)
+            return False
+
+    def delete_question(self, soru_id):
+        try:
+            self.request("DELETE", f"/api/sorular/{soru_id}")
+            return True
+        except RemoteBankError as e:
+            log.error("delete_question - Sunucu hatası: %s", e)
+            return False
+
+    def find_similar_questions(self, soru_metni, secenekler, threshold=DUPLICATE_THRESHOLD, limit=5, exclude_id=None):
+        try:
+            result = self.request("POST", "/api/benzer", {"soru_metni": soru_metni, "secenekler": list(secenekler),
+                                                          "esik": threshold, "limit": limit, "haric_id": exclude_id})
+        except RemoteBankError as e:
+            log.error("find_similar_questions içinde sunucu hatası: %s", e)
+            return []
+        return [(match["id"], match["benzerlik"]) for match in result["benzerler"]]
+
+    def get_attachment(self, ozet):
+        try:
+            attachment = self.request("GET", f"/api/ekler/{ozet}", cache=False)
+        except RemoteBankError as e:
+            if e.status != 404:
+                log.error("get_attachment içinde sunucu hatası: %s", e)
+            return None
+        return attachment["tur"], base64.b64decode(attachment["veri"])
+
+    def add_attachment(self, data):
+        """Raises ValueError, as the core function does, when the server does not store the image."""
+        try:
+            return self.request("POST", "/api/ekler", {"veri": base64.b64encode(data).decode("ascii")})["ozet"]
+        except RemoteBankError as e:
+            raise ValueError(str(e))
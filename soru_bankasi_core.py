@@ -0,0 +1,2563 @@
+"""Mini Soru Bankası data layer: the SQLite schema, question storage, search, import,
+exam drawing and grading, and duplicate detection. Nothing here imports Qt, so scripts,
+the CLI and batch jobs can use it without starting a QApplication; the only Qt code
+reachable from here (PDF booklets) is imported on demand.
+"""
+import base64
+import binascii
+import csv
+import gzip
+import hashlib
+import html
+import io
+import json
+import sqlite3
+import os
+import pathlib
+import random
+import re
+import sys
+import threading
+import time
+import unicodedata
+import uuid
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import soru_bankasi_metrics as metrics
+from soru_bankasi_metrics import log
+
+DB_NAME = 'soru_bankasi.db'
+DB_STATEMENT_CACHE_SIZE = 256
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA busy_timeout=5000",
+)
+
+QUESTION_COLUMNS = "id, soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5, dogru_secenek_index, kategori"
+# Columns whose update is a content change; bookkeeping columns written by triggers are left out
+# so that filling them in does not look like an edit to the FTS index or the change log.
+QUESTION_CONTENT_COLUMNS = "soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5, dogru_secenek_index, kategori"
+SELECT_ALL_QUESTIONS_SQL = f"SELECT {QUESTION_COLUMNS} FROM sorular ORDER BY id"
+INSERT_QUESTION_SQL = '''
+    INSERT INTO sorular (soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5, dogru_secenek_index, kategori,
+                         kategori_id, olusturma_zamani, guncelleme_zamani)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, (SELECT id FROM kategoriler WHERE ad = ?8), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+'''
+INSERT_CATEGORY_SQL = "INSERT OR IGNORE INTO kategoriler(ad) VALUES (?)"
+
+
+class ConnectionPool:
+    """Long-lived SQLite connections, one per thread, opened lazily with DB_PRAGMAS applied.
+
+    Connections run in autocommit mode; use transaction() to group writes. Each
+    connection keeps its own prepared-statement cache, so the module-level SQL
+    constants are compiled once per thread and reused afterwards.
+    """
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False,
+                               cached_statements=DB_STATEMENT_CACHE_SIZE)
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        conn.create_function("duz_metin", 1, plain_text, deterministic=True)
+        return conn
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def close_all(self):
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    pool = _pool
+    if pool is None or pool.db_name != DB_NAME:
+        with _pool_lock:
+            if _pool is None or _pool.db_name != DB_NAME:
+                if _pool is not None:
+                    _pool.close_all()
+                _pool = ConnectionPool(DB_NAME)
+            pool = _pool
+    return pool
+
+def close_db():
+    global _pool, _question_cache
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+        _question_cache = None
+
+
+# unicode61 already folds case and strips diacritics (İ->i, ş->s, ğ->g, ...); the only
+# Turkish letter it leaves alone is the dotless ı, so that one is mapped to i on both
+# the indexed text and the query. Rich text is indexed without its markup: duz_metin() is
+# plain_text(), registered on every pool connection, so the triggers only run on those.
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+FTS_RANK_SQL = "bm25(sorular_fts, 4.0, 1.0, 0.5)"
+
+def _fts_row_values(ref):
+    options = " || ' ' || ".join(f"coalesce(duz_metin({ref}.secenek{i}), '')" for i in range(1, 6))
+    return (f"{ref}.id, replace(duz_metin({ref}.soru_metni), 'ı', 'i'), replace({options}, 'ı', 'i'), "
+            f"replace(coalesce(duz_metin({ref}.kategori), ''), 'ı', 'i')")
+
+FTS_INSERT_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS sorular_fts_ai AFTER INSERT ON sorular BEGIN
+        INSERT INTO sorular_fts(rowid, soru_metni, secenekler, kategori) VALUES ({_fts_row_values('new')});
+    END"""
+FTS_BACKFILL_SQL = (f"INSERT INTO sorular_fts(rowid, soru_metni, secenekler, kategori) "
+                    f"SELECT {_fts_row_values('sorular')} FROM sorular WHERE id > ?")
+FTS_UPDATE_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS sorular_fts_au AFTER UPDATE OF {QUESTION_CONTENT_COLUMNS} ON sorular BEGIN
+        INSERT INTO sorular_fts(sorular_fts, rowid, soru_metni, secenekler, kategori) VALUES ('delete', {_fts_row_values('old')});
+        INSERT INTO sorular_fts(rowid, soru_metni, secenekler, kategori) VALUES ({_fts_row_values('new')});
+    END"""
+FTS_TRIGGERS_SQL = (
+    FTS_INSERT_TRIGGER_SQL,
+    f"""CREATE TRIGGER IF NOT EXISTS sorular_fts_ad AFTER DELETE ON sorular BEGIN
+        INSERT INTO sorular_fts(sorular_fts, rowid, soru_metni, secenekler, kategori) VALUES ('delete', {_fts_row_values('old')});
+    END""",
+    FTS_UPDATE_TRIGGER_SQL,
+)
+FTS_SCHEMA_SQL = (
+    f"CREATE VIRTUAL TABLE sorular_fts USING fts5(soru_metni, secenekler, kategori, content='', tokenize='{FTS_TOKENIZER}')",
+    *FTS_TRIGGERS_SQL,
+)
+
+# (trigger name, CREATE TRIGGER sql, set-based replay statements taking the last id before the batch).
+# insert_questions_bulk drops these for the duration of a batch and replays them set-wise.
+BULK_INSERT_TRIGGERS = [
+    ("sorular_fts_ai", FTS_INSERT_TRIGGER_SQL, (FTS_BACKFILL_SQL,)),
+]
+
+# Every insert/update/delete on sorular is appended here so views can apply deltas
+# instead of re-reading the table. Only the newest CHANGELOG_RETENTION entries are kept;
+# a reader whose cursor predates them has to fall back to a full reload.
+CHANGELOG_RETENTION = 10000
+CHANGELOG_INSERT_TRIGGER_SQL = """CREATE TRIGGER IF NOT EXISTS sorular_changelog_ai AFTER INSERT ON sorular BEGIN
+        INSERT INTO sorular_changelog(soru_id, op) VALUES (new.id, 'I');
+    END"""
+CHANGELOG_REPLAY_SQL = "INSERT INTO sorular_changelog(soru_id, op) SELECT id, 'I' FROM sorular WHERE id > ? ORDER BY id"
+CHANGELOG_UPDATE_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS sorular_changelog_au AFTER UPDATE OF {QUESTION_CONTENT_COLUMNS} ON sorular BEGIN
+        INSERT INTO sorular_changelog(soru_id, op) VALUES (new.id, 'U');
+    END"""
+CHANGELOG_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS sorular_changelog (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        soru_id INTEGER NOT NULL,
+        op TEXT NOT NULL
+    )""",
+    CHANGELOG_INSERT_TRIGGER_SQL,
+    CHANGELOG_UPDATE_TRIGGER_SQL,
+    """CREATE TRIGGER IF NOT EXISTS sorular_changelog_ad AFTER DELETE ON sorular BEGIN
+        INSERT INTO sorular_changelog(soru_id, op) VALUES (old.id, 'D');
+    END""",
+)
+BULK_INSERT_TRIGGERS.append(("sorular_changelog_ai", CHANGELOG_INSERT_TRIGGER_SQL, (CHANGELOG_REPLAY_SQL,)))
+
+_fts_enabled = True
+
+def _init_fts():
+    global _fts_enabled
+    conn = get_pool().connection()
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sorular_fts'").fetchone():
+        _fts_enabled = True
+        return
+    try:
+        with get_pool().transaction():
+            for statement in FTS_SCHEMA_SQL:
+                conn.execute(statement)
+            conn.execute(FTS_BACKFILL_SQL, (0,))
+        _fts_enabled = True
+    except sqlite3.OperationalError as e:
+        log.warning("FTS5 kullanılamıyor, arama LIKE ile yapılacak: %s", e)
+        _fts_enabled = False
+
+
+# Normalized side of the schema (v2). Categories and options live in their own tables and
+# sorular carries kategori_id plus timestamps; the legacy kategori and secenek1..5 columns
+# stay as the compatibility read path every existing query uses, and triggers derive the
+# normalized rows from them, so writers that only know the legacy columns (including
+# older versions of this program) keep both sides in step. secenekler.sira is the 0-based
+# option position that dogru_secenek_index refers to; positions past 4 exist only there.
+def _normalize_rows_sql(where):
+    return (
+        f"INSERT OR IGNORE INTO kategoriler(ad) SELECT DISTINCT kategori FROM sorular WHERE {where} AND kategori IS NOT NULL",
+        f"""UPDATE sorular SET kategori_id = (SELECT k.id FROM kategoriler k WHERE k.ad = sorular.kategori),
+                olusturma_zamani = coalesce(olusturma_zamani, CURRENT_TIMESTAMP),
+                guncelleme_zamani = coalesce(guncelleme_zamani, CURRENT_TIMESTAMP)
+            WHERE {where} AND ((kategori_id IS NULL AND kategori IS NOT NULL) OR olusturma_zamani IS NULL)""",
+    )
+
+def _options_rows_sql(where):
+    options = " UNION ALL ".join(f"SELECT id, {j}, secenek{j + 1} FROM sorular WHERE {where} AND secenek{j + 1} <> ''"
+                                 for j in range(5))
+    return (f"INSERT OR IGNORE INTO secenekler(soru_id, sira, metin) {options}",)
+
+def _trigger_option_rows_sql(ref):
+    return " UNION ALL ".join(f"SELECT {ref}.id, {j}, {ref}.secenek{j + 1} WHERE {ref}.secenek{j + 1} <> ''"
+                              for j in range(5))
+
+# INSERT_QUESTION_SQL fills kategori_id and the timestamps itself (the write functions
+# register the category first), so a row is only rewritten when it comes from a writer
+# that does not.
+NORMALIZE_INSERT_TRIGGER_SQL = """CREATE TRIGGER IF NOT EXISTS sorular_normalize_ai AFTER INSERT ON sorular
+    WHEN (new.kategori_id IS NULL AND new.kategori IS NOT NULL) OR new.olusturma_zamani IS NULL BEGIN
+        INSERT OR IGNORE INTO kategoriler(ad) SELECT new.kategori WHERE new.kategori IS NOT NULL;
+        UPDATE sorular SET kategori_id = (SELECT id FROM kategoriler WHERE ad = new.kategori),
+            olusturma_zamani = coalesce(new.olusturma_zamani, CURRENT_TIMESTAMP),
+            guncelleme_zamani = coalesce(new.guncelleme_zamani, CURRENT_TIMESTAMP)
+        WHERE id = new.id;
+    END"""
+OPTIONS_INSERT_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS sorular_secenekler_ai AFTER INSERT ON sorular BEGIN
+        INSERT OR IGNORE INTO secenekler(soru_id, sira, metin) {_trigger_option_rows_sql('new')};
+    END"""
+NORMALIZED_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS kategoriler (
+        id INTEGER PRIMARY KEY,
+        ad TEXT NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS secenekler (
+        soru_id INTEGER NOT NULL,
+        sira INTEGER NOT NULL,
+        metin TEXT NOT NULL,
+        PRIMARY KEY (soru_id, sira)
+    ) WITHOUT ROWID""",
+    NORMALIZE_INSERT_TRIGGER_SQL,
+    OPTIONS_INSERT_TRIGGER_SQL,
+    f"""CREATE TRIGGER IF NOT EXISTS sorular_normalize_au AFTER UPDATE OF {QUESTION_CONTENT_COLUMNS} ON sorular BEGIN
+        INSERT OR IGNORE INTO kategoriler(ad) SELECT new.kategori WHERE new.kategori IS NOT NULL;
+        UPDATE sorular SET kategori_id = (SELECT id FROM kategoriler WHERE ad = new.kategori),
+            guncelleme_zamani = CURRENT_TIMESTAMP
+        WHERE id = new.id;
+        DELETE FROM secenekler WHERE soru_id = new.id AND sira < 5;
+        INSERT INTO secenekler(soru_id, sira, metin) {_trigger_option_rows_sql('new')};
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS sorular_normalize_ad AFTER DELETE ON sorular BEGIN
+        DELETE FROM secenekler WHERE soru_id = old.id;
+    END""",
+)
+NORMALIZED_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_sorular_kategori_id ON sorular(kategori_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_sorular_olusturma ON sorular(olusturma_zamani)",
+    "CREATE INDEX IF NOT EXISTS idx_sorular_guncelleme ON sorular(guncelleme_zamani)",
+)
+BULK_INSERT_TRIGGERS.append(("sorular_normalize_ai", NORMALIZE_INSERT_TRIGGER_SQL, _normalize_rows_sql("id > ?1")))
+BULK_INSERT_TRIGGERS.append(("sorular_secenekler_ai", OPTIONS_INSERT_TRIGGER_SQL, _options_rows_sql("id > ?1")))
+
+MIGRATION_BATCH_SIZE = 5000
+
+def _create_baseline_schema(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sorular (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            soru_metni TEXT NOT NULL,
+            secenek1 TEXT,
+            secenek2 TEXT,
+            secenek3 TEXT,
+            secenek4 TEXT,
+            secenek5 TEXT,
+            dogru_secenek_index INTEGER,
+            kategori TEXT
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sorular_kategori ON sorular(kategori, id)")
+    for statement in CHANGELOG_SCHEMA_SQL:
+        conn.execute(statement)
+
+def _create_normalized_schema(conn):
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(sorular)")}
+    for column in ("kategori_id INTEGER", "olusturma_zamani TEXT", "guncelleme_zamani TEXT"):
+        if column.split()[0] not in existing:
+            conn.execute(f"ALTER TABLE sorular ADD COLUMN {column}")
+    # Update triggers from v1 fired on any column; they are narrowed to content columns
+    # so the bookkeeping writes of the normalize triggers are not logged as edits.
+    conn.execute("DROP TRIGGER IF EXISTS sorular_changelog_au")
+    conn.execute(CHANGELOG_UPDATE_TRIGGER_SQL)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sorular_fts'").fetchone():
+        conn.execute("DROP TRIGGER IF EXISTS sorular_fts_au")
+        conn.execute(FTS_UPDATE_TRIGGER_SQL)
+    for statement in NORMALIZED_SCHEMA_SQL:
+        conn.execute(statement)
+
+def _backfill_normalized(conn, after_id, up_to_id):
+    for statement in _normalize_rows_sql("id > ?1 AND id <= ?2") + _options_rows_sql("id > ?1 AND id <= ?2"):
+        conn.execute(statement, (after_id, up_to_id))
+
+# Near-duplicate index (v3): one MinHash signature per question plus its LSH band keys.
+# Both are derived data filled in by sync_duplicate_index(); deletes are handled here so
+# the index never points at a missing question.
+DUPLICATE_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS soru_imzalari (
+        soru_id INTEGER PRIMARY KEY,
+        guncelleme_zamani TEXT,
+        imza BLOB NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS soru_lsh (
+        anahtar INTEGER NOT NULL,
+        soru_id INTEGER NOT NULL,
+        PRIMARY KEY (anahtar, soru_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_soru_lsh_soru ON soru_lsh(soru_id)",
+    """CREATE TABLE IF NOT EXISTS benzerlik_durumu (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        degisiklik_imleci INTEGER NOT NULL
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS sorular_imzalari_ad AFTER DELETE ON sorular BEGIN
+        DELETE FROM soru_imzalari WHERE soru_id = old.id;
+        DELETE FROM soru_lsh WHERE soru_id = old.id;
+    END""",
+)
+
+def _create_duplicate_schema(conn):
+    for statement in DUPLICATE_SCHEMA_SQL:
+        conn.execute(statement)
+
+# Statistics aggregates (v4): istatistikler holds one counter per (tur, anahtar), kept
+# current by triggers, so the dashboard reads O(categories) rows instead of scanning:
+#   toplam/''                 every question
+#   kategori/<name>           questions per kategori ('' for none)
+#   cevap/A..E                questions per correct answer letter
+#   secenek_sayisi/0..5       questions per number of filled options among A-E
+#   kalite/cevapsiz           no valid correct answer index
+#   kalite/dogru_sik_bos      the correct answer points at an empty option
+# Counters that drop to zero are kept; readers skip them.
+def _statistics_keys_sql(ref, where=None):
+    """UNION ALL of (tur, anahtar) rows for one question (ref new/old) or for the sorular rows matching where."""
+    source = "" if where is None else "FROM sorular "
+    condition = lambda extra: " AND ".join(part for part in (where, extra) if part) or "1"
+    answer = f"{ref}.dogru_secenek_index"
+    correct_text = " ".join(f"WHEN {j} THEN {ref}.secenek{j + 1}" for j in range(5))
+    filled = " + ".join(f"(coalesce({ref}.secenek{j + 1}, '') <> '')" for j in range(5))
+    branches = (
+        ("'toplam'", "''", None),
+        ("'kategori'", f"coalesce({ref}.kategori, '')", None),
+        ("'cevap'", f"char(65 + {answer})", f"{answer} BETWEEN 0 AND 4"),
+        ("'secenek_sayisi'", f"CAST({filled} AS TEXT)", None),
+        ("'kalite'", "'cevapsiz'", f"coalesce({answer} NOT BETWEEN 0 AND 4, 1)"),
+        ("'kalite'", "'dogru_sik_bos'",
+         f"{answer} BETWEEN 0 AND 4 AND coalesce(CASE {answer} {correct_text} END, '') = ''"),
+    )
+    return " UNION ALL ".join(f"SELECT {tur} AS tur, {anahtar} AS anahtar {source}WHERE {condition(extra)}"
+                              for tur, anahtar, extra in branches)
+
+def _statistics_upsert_sql(deltas_sql):
+    return (f"INSERT INTO istatistikler(tur, anahtar, sayi) SELECT tur, anahtar, sum(fark) FROM ({deltas_sql}) "
+            f"WHERE true GROUP BY tur, anahtar ON CONFLICT(tur, anahtar) DO UPDATE SET sayi = sayi + excluded.sayi")
+
+STATISTICS_INSERT_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS sorular_istatistik_ai AFTER INSERT ON sorular BEGIN
+        {_statistics_upsert_sql(f"SELECT tur, anahtar, 1 AS fark FROM ({_statistics_keys_sql('new')})")};
+    END"""
+STATISTICS_REPLAY_SQL = _statistics_upsert_sql(
+    f"SELECT tur, anahtar, 1 AS fark FROM ({_statistics_keys_sql('sorular', 'id > ?1')})")
+STATISTICS_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS istatistikler (
+        tur TEXT NOT NULL,
+        anahtar TEXT NOT NULL,
+        sayi INTEGER NOT NULL,
+        PRIMARY KEY (tur, anahtar)
+    ) WITHOUT ROWID""",
+    STATISTICS_INSERT_TRIGGER_SQL,
+    f"""CREATE TRIGGER IF NOT EXISTS sorular_istatistik_au AFTER UPDATE OF {QUESTION_CONTENT_COLUMNS} ON sorular BEGIN
+        {_statistics_upsert_sql(f"SELECT tur, anahtar, 1 AS fark FROM ({_statistics_keys_sql('new')}) "
+                                f"UNION ALL SELECT tur, anahtar, -1 FROM ({_statistics_keys_sql('old')})")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS sorular_istatistik_ad AFTER DELETE ON sorular BEGIN
+        {_statistics_upsert_sql(f"SELECT tur, anahtar, -1 AS fark FROM ({_statistics_keys_sql('old')})")};
+    END""",
+)
+BULK_INSERT_TRIGGERS.append(("sorular_istatistik_ai", STATISTICS_INSERT_TRIGGER_SQL, (STATISTICS_REPLAY_SQL,)))
+
+def rebuild_statistics(conn):
+    """Recounts istatistikler from sorular; one scan, run in the caller's transaction."""
+    conn.execute("DELETE FROM istatistikler")
+    conn.execute(STATISTICS_REPLAY_SQL, (0,))
+
+def _create_statistics_schema(conn):
+    for statement in STATISTICS_SCHEMA_SQL:
+        conn.execute(statement)
+    # A single recount in the same transaction as the triggers, so rerunning an
+    # interrupted migration cannot count a row twice.
+    rebuild_statistics(conn)
+
+# Item analysis (v5): the result of the last graded exam each question appeared in, written
+# by store_item_analysis(). secenek_dagilimi is JSON {"A".."E", "bos": [all, upper, lower]}
+# keyed by the question's own option letters, whatever order the booklets printed them in.
+ITEM_ANALYSIS_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS soru_analizleri (
+        soru_id INTEGER PRIMARY KEY,
+        ogrenci_sayisi INTEGER NOT NULL,
+        dogru_sayisi INTEGER NOT NULL,
+        guclik REAL NOT NULL,
+        ayirt_edicilik REAL NOT NULL,
+        madde_toplam_korelasyonu REAL,
+        secenek_dagilimi TEXT NOT NULL,
+        analiz_zamani TEXT NOT NULL
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS sorular_analizleri_ad AFTER DELETE ON sorular BEGIN
+        DELETE FROM soru_analizleri WHERE soru_id = old.id;
+    END""",
+)
+
+def _create_item_analysis_schema(conn):
+    for statement in ITEM_ANALYSIS_SCHEMA_SQL:
+        conn.execute(statement)
+
+# Bank metadata (v6): banka_kimligi, a random id given to each bank when it is created (and anew
+# when a backup is restored or reset_bank_identity() is run on a copied file), names the source of an archive; son_arsiv_seq is the change log cursor the last
+# archive written here reached, and arsiv:<banka_kimligi> the one last applied from that bank.
+BANK_INFO_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS banka_bilgisi (
+        anahtar TEXT PRIMARY KEY,
+        deger TEXT NOT NULL
+    )""",
+)
+
+def _create_bank_info_schema(conn):
+    for statement in BANK_INFO_SCHEMA_SQL:
+        conn.execute(statement)
+    conn.execute("INSERT OR IGNORE INTO banka_bilgisi(anahtar, deger) VALUES ('banka_kimligi', ?)", (uuid.uuid4().hex,))
+
+# Attachments (v7): images used in rich question text, stored once under the SHA-256 of their
+# bytes and referenced from the text as <img src="ek:<ozet>">.
+ATTACHMENT_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS ekler (
+        ozet TEXT PRIMARY KEY,
+        tur TEXT NOT NULL,
+        boyut INTEGER NOT NULL,
+        veri BLOB NOT NULL,
+        eklenme_zamani TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )""",
+)
+
+def _create_attachment_schema(conn):
+    for statement in ATTACHMENT_SCHEMA_SQL:
+        conn.execute(statement)
+
+# Archive sources (v8): which local question an applied archive's question became, keyed by the
+# source bank's id and the question's id there, so banks are matched without sharing row ids.
+ARCHIVE_SOURCE_SCHEMA_SQL = (
+    """CREATE TABLE IF NOT EXISTS arsiv_kaynaklari (
+        banka TEXT NOT NULL,
+        kaynak_id INTEGER NOT NULL,
+        soru_id INTEGER NOT NULL UNIQUE,
+        PRIMARY KEY (banka, kaynak_id)
+    ) WITHOUT ROWID""",
+    """CREATE TRIGGER IF NOT EXISTS sorular_arsiv_kaynaklari_ad AFTER DELETE ON sorular BEGIN
+        DELETE FROM arsiv_kaynaklari WHERE soru_id = old.id;
+    END""",
+)
+
+def _create_archive_source_schema(conn):
+    for statement in ARCHIVE_SOURCE_SCHEMA_SQL:
+        conn.execute(statement)
+
+def _backfill_archive_sources(conn, after_id, up_to_id):
+    # Before v8 archives were applied by id; a bank synced from a single source keeps its ids as that source's.
+    sources = [key[len("arsiv:"):] for key, in conn.execute("SELECT anahtar FROM banka_bilgisi WHERE anahtar LIKE 'arsiv:%'")]
+    if len(sources) == 1:
+        conn.execute("""INSERT OR IGNORE INTO arsiv_kaynaklari(banka, kaynak_id, soru_id)
+                        SELECT ?3, id, id FROM sorular WHERE id > ?1 AND id <= ?2""", (after_id, up_to_id, sources[0]))
+
+# Search index without markup (v9): indexes written before v9 held rich text's tags and attribute
+# words. The triggers are recreated to index duz_metin() and the index is emptied and refilled.
+def _fts_exists(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sorular_fts'").fetchone() is not None
+
+def _rebuild_fts_schema(conn):
+    if not _fts_exists(conn):
+        return  # created by _init_fts() in its current shape
+    for name in ("sorular_fts_ai", "sorular_fts_ad", "sorular_fts_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for statement in FTS_TRIGGERS_SQL:
+        conn.execute(statement)
+    conn.execute("INSERT INTO sorular_fts(sorular_fts) VALUES ('delete-all')")
+
+def _backfill_fts(conn, after_id, up_to_id):
+    if _fts_exists(conn):
+        conn.execute(f"INSERT INTO sorular_fts(rowid, soru_metni, secenekler, kategori) "
+                     f"SELECT {_fts_row_values('sorular')} FROM sorular WHERE id > ?1 AND id <= ?2", (after_id, up_to_id))
+
+# (user_version, schema step, batched backfill or None, statements run with the version bump).
+# The schema step runs in one short transaction; from then on triggers keep new rows in the
+# target shape, while existing rows are converted batch_size ids per transaction so other
+# connections are never locked out for long. Every step is idempotent, so a migration that
+# was interrupted simply runs again at the next start.
+SCHEMA_MIGRATIONS = (
+    (1, _create_baseline_schema, None, ()),
+    (2, _create_normalized_schema, _backfill_normalized, NORMALIZED_INDEX_SQL),
+    (3, _create_duplicate_schema, None, ()),
+    (4, _create_statistics_schema, None, ()),
+    (5, _create_item_analysis_schema, None, ()),
+    (6, _create_bank_info_schema, None, ()),
+    (7, _create_attachment_schema, None, ()),
+    (8, _create_archive_source_schema, _backfill_archive_sources, ()),
+    (9, _rebuild_fts_schema, _backfill_fts, ()),
+)
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+def get_schema_version():
+    return get_pool().connection().execute("PRAGMA user_version").fetchone()[0]
+
+@metrics.timed("db.migrate")
+def migrate_db(batch_size=MIGRATION_BATCH_SIZE, progress_callback=None):
+    """Brings the database up to SCHEMA_VERSION; progress_callback(version, fraction) is optional."""
+    pool = get_pool()
+    conn = pool.connection()
+    version = get_schema_version()
+    if version > SCHEMA_VERSION:
+        log.warning("Veritabanı şeması (v%s) bu sürümden yeni; taşıma yapılmadı.", version)
+        return version
+    for target, apply_schema, backfill, finalize_sql in SCHEMA_MIGRATIONS:
+        if version >= target:
+            continue
+        log.info("Veritabanı şeması v%s -> v%s taşınıyor.", version, target)
+        with pool.transaction():
+            apply_schema(conn)
+        if backfill is not None:
+            last_id = conn.execute("SELECT coalesce(max(id), 0) FROM sorular").fetchone()[0]
+            after_id = 0
+            while after_id < last_id:
+                with pool.transaction():
+                    backfill(conn, after_id, after_id + batch_size)
+                after_id += batch_size
+                if progress_callback: progress_callback(target, min(after_id / last_id, 1.0))
+        with pool.transaction():
+            for statement in finalize_sql:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+        version = target
+    return version
+
+
+@metrics.timed("db.init")
+def init_db():
+    log.debug("init_db çağrıldı.")
+    migrate_db()
+    _init_fts()
+    prune_change_log()
+    log.debug("init_db tamamlandı. Veritabanı dosyası (%s) şu dizinde olmalı veya oluşturulmuş olmalı: %s",
+              DB_NAME, os.getcwd())
+
+
+def _question_params(soru_metni, secenekler, dogru_secenek_index, kategori):
+    current_secenekler = list(secenekler)[:5]
+    while len(current_secenekler) < 5:
+        current_secenekler.append("")
+    return (soru_metni, *current_secenekler, dogru_secenek_index, kategori)
+
+@metrics.timed("db.add")
+def add_question_to_db(soru_metni, secenekler, dogru_secenek_index, kategori="Genel"):
+    log.debug("add_question_to_db: Soru='%s...'", soru_metni[:20])
+    try:
+        with get_pool().transaction() as conn:
+            conn.execute(INSERT_CATEGORY_SQL, (kategori,))
+            soru_id = conn.execute(INSERT_QUESTION_SQL,
+                                   _question_params(soru_metni, secenekler, dogru_secenek_index, kategori)).lastrowid
+            conn.executemany("INSERT INTO secenekler(soru_id, sira, metin) VALUES (?, ?, ?)",
+                             [(soru_id, sira, metin) for sira, metin in enumerate(secenekler) if sira >= 5 and metin])
+            _sign_questions(conn, [soru_id])
+        log.debug("Soru veritabanına eklendi.")
+        return soru_id
+    except sqlite3.Error as e:
+        log.error("add_question_to_db - Veritabanı hatası: %s", e)
+        return False
+
+@metrics.timed("db.update")
+def update_question(soru_id, soru_metni, secenekler, dogru_secenek_index, kategori="Genel"):
+    """Rewrites a question in place; returns False when it does not exist or the write fails."""
+    try:
+        with get_pool().transaction() as conn:
+            conn.execute(INSERT_CATEGORY_SQL, (kategori,))
+            updated = conn.execute(
+                f"UPDATE sorular SET ({QUESTION_CONTENT_COLUMNS}) = (?, ?, ?, ?, ?, ?, ?, ?) WHERE id = ?",
+                (*_question_params(soru_metni, secenekler, dogru_secenek_index, kategori), soru_id)).rowcount
+            if updated:
+                conn.execute("DELETE FROM secenekler WHERE soru_id = ? AND sira >= 5", (soru_id,))
+                conn.executemany("INSERT INTO secenekler(soru_id, sira, metin) VALUES (?, ?, ?)",
+                                 [(soru_id, sira, metin) for sira, metin in enumerate(secenekler) if sira >= 5 and metin])
+                _sign_questions(conn, [soru_id])
+        return bool(updated)
+    except sqlite3.Error as e:
+        log.error("update_question - Veritabanı hatası: %s", e)
+        return False
+
+@metrics.timed("db.delete")
+def delete_question(soru_id):
+    try:
+        with get_pool().transaction() as conn:
+            return bool(conn.execute("DELETE FROM sorular WHERE id = ?", (soru_id,)).rowcount)
+    except sqlite3.Error as e:
+        log.error("delete_question - Veritabanı hatası: %s", e)
+        return False
+
+def validate_question(soru_metni, secenekler, dogru_secenek_index):
+    if not soru_metni: return "Soru metni boş olamaz."
+    filled_options_count = sum(1 for s in secenekler if s)
+    if dogru_secenek_index != -1 and filled_options_count < 1:
+        return "Lütfen en az bir yanıt seçeneği girin (doğru şık dahil)."
+    if filled_options_count == 0: return "Lütfen en az bir yanıt seçeneği girin."
+    if dogru_secenek_index == -1: return "Lütfen doğru şıkkı işaretleyin."
+    if not secenekler[dogru_secenek_index]: return f"İşaretlediğiniz {chr(65+dogru_secenek_index)}. yanıt boş olamaz."
+    return None
+
+@metrics.timed("db.bulk_insert")
+def insert_questions_bulk(rows, sign=True):
+    """Inserts _question_params rows in one transaction. With sign=False the new questions are
+    left for the next sync_duplicate_index instead of being signed here."""
+    rows = list(rows)
+    with get_pool().transaction() as conn:
+        conn.executemany(INSERT_CATEGORY_SQL, {(row[7],) for row in rows if row[7] is not None})
+        last_id = conn.execute("SELECT coalesce(max(id), 0) FROM sorular").fetchone()[0]
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        suspended = [trigger for trigger in BULK_INSERT_TRIGGERS if trigger[0] in existing]
+        for name, _, _ in suspended:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.executemany(INSERT_QUESTION_SQL, rows)
+        metrics.count("db.inserted_rows", len(rows))
+        for _, create_sql, replay_statements in suspended:
+            for replay_sql in replay_statements:
+                conn.execute(replay_sql, (last_id,))
+            conn.execute(create_sql)
+        if sign:
+            _sign_questions_after(conn, last_id)
+
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_FILE_TYPES = (".csv", ".jsonl", ".json", ".xlsx")
+
+class ImportReport:
+    def __init__(self, path):
+        self.path = path
+        self.total = 0
+        self.imported = 0
+        self.rejected = []
+        self.cancelled = False
+
+    def reject(self, line_no, reason):
+        self.rejected.append((line_no, reason))
+
+    def summary(self):
+        text = f"{self.imported} soru içe aktarıldı, {len(self.rejected)} satır reddedildi."
+        return text + (" (İptal edildi)" if self.cancelled else "")
+
+
+class _ByteCountingLines:
+    """Yields decoded lines from a binary file while counting the bytes consumed, for progress."""
+
+    def __init__(self, binary_file):
+        self.binary_file = binary_file
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for line_no, raw_line in enumerate(self.binary_file):
+            self.bytes_read += len(raw_line)
+            line = raw_line.decode("utf-8")
+            yield line.lstrip("\ufeff") if line_no == 0 else line
+
+
+def _iter_csv_records(path, progress):
+    with open(path, "rb") as f:
+        sample = f.read(4096).decode("utf-8", errors="ignore")
+        f.seek(0)
+        try: dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error: dialect = csv.excel
+        lines = _ByteCountingLines(f)
+        reader = csv.DictReader(iter(lines), dialect=dialect)
+        for record in reader:
+            progress(lines.bytes_read)
+            yield reader.line_num, record
+
+def _iter_jsonl_records(path, progress):
+    with open(path, "rb") as f:
+        lines = _ByteCountingLines(f)
+        for line_no, line in enumerate(lines, start=1):
+            progress(lines.bytes_read)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"Geçersiz JSON: {e}")
+                continue
+            yield line_no, record
+
+def _iter_xlsx_records(path, progress):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("XLSX dosyalarını içe aktarmak için openpyxl gerekli (pip install openpyxl).")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        total_rows = max(sheet.max_row or 1, 1)
+        for line_no, values in enumerate(rows, start=2):
+            progress(line_no / total_rows)
+            if not any(value is not None and str(value).strip() for value in values):
+                continue
+            yield line_no, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def _parse_correct_option(record):
+    value = record.get("dogru_secenek_index")
+    if value is not None and str(value).strip() != "":
+        try:
+            index = int(float(value))
+        except ValueError:
+            return -1
+        return index if 0 <= index < 5 else -1
+    letter = str(record.get("cevap") or record.get("dogru_secenek") or "").strip().upper()
+    return "ABCDE".index(letter) if len(letter) == 1 and letter in "ABCDE" else -1
+
+def question_from_record(record):
+    """Maps an import record (CSV/XLSX row or JSON object) to add_question_to_db arguments.
+
+    Recognised keys (case-insensitive): soru_metni/soru, secenek1..secenek5 or A..E or a
+    'secenekler' list, dogru_secenek_index (0-4) or cevap/dogru_secenek (A-E), kategori.
+    """
+    fields = {str(key).strip().lower(): value for key, value in record.items() if key is not None}
+    text = lambda value: "" if value is None else str(value).strip()
+    soru_metni = text(fields.get("soru_metni", fields.get("soru")))
+    if isinstance(fields.get("secenekler"), list):
+        secenekler = [text(value) for value in fields["secenekler"][:5]]
+    else:
+        secenekler = [text(fields.get(f"secenek{i+1}", fields.get(chr(97+i)))) for i in range(5)]
+    secenekler += [""] * (5 - len(secenekler))
+    kategori = text(fields.get("kategori")) or "Genel"
+    return soru_metni, secenekler, _parse_correct_option(fields), kategori
+
+def iter_import_records(path, progress=lambda fraction: None):
+    """Yields (line number, record dict or Exception) from a CSV, JSONL or XLSX file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        yield from _iter_xlsx_records(path, progress)
+        return
+    total_bytes = max(os.path.getsize(path), 1)
+    byte_progress = lambda bytes_read: progress(bytes_read / total_bytes)
+    if extension in (".jsonl", ".json"):
+        yield from _iter_jsonl_records(path, byte_progress)
+    elif extension == ".csv":
+        yield from _iter_csv_records(path, byte_progress)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya türü: {extension or path} ({', '.join(IMPORT_FILE_TYPES)})")
+
+@metrics.timed("import")
+def import_questions(path, batch_size=IMPORT_BATCH_SIZE, progress_callback=None, is_cancelled=None):
+    """Streams questions from path into the database in batches of batch_size rows.
+
+    Each batch is one transaction; rows failing validate_question are skipped and listed
+    in the returned ImportReport. progress_callback(fraction, report) runs after each batch.
+    """
+    report = ImportReport(path)
+    position = [0.0]
+    batch = []
+
+    def flush():
+        insert_questions_bulk(batch)
+        report.imported += len(batch)
+        batch.clear()
+        if progress_callback:
+            progress_callback(position[0], report)
+
+    for line_no, record in iter_import_records(path, lambda fraction: position.__setitem__(0, fraction)):
+        report.total += 1
+        if isinstance(record, Exception):
+            report.reject(line_no, str(record)); continue
+        if not isinstance(record, dict):
+            report.reject(line_no, "Kayıt bir nesne/satır değil."); continue
+        soru_metni, secenekler, dogru_secenek_index, kategori = question_from_record(record)
+        error = validate_question(soru_metni, secenekler, dogru_secenek_index)
+        if error:
+            report.reject(line_no, error); continue
+        batch.append(_question_params(soru_metni, secenekler, dogru_secenek_index, kategori))
+        if len(batch) >= batch_size:
+            flush()
+            if is_cancelled and is_cancelled():
+                report.cancelled = True
+                return report
+    position[0] = 1.0
+    flush()
+    prune_change_log()
+    return report
+
+def iter_all_questions(batch_size=500, question_filter=None):
+    """Yields every question (or those matching question_filter) in id order, through the shared QuestionCache.
+
+    A filter is walked by keyset paging over its own index-backed query, so only the
+    matching rows are read.
+    """
+    question_filter = QuestionFilter.coerce(question_filter)
+    if question_filter.is_empty():
+        yield from get_question_cache().rows_in_order(batch_size)
+        return
+    page_filter = question_filter
+    while True:
+        source_sql, params, _ = page_filter.source_sql()
+        ids = [row[0] for row in get_pool().connection().execute(
+            f"SELECT sorular.id {source_sql} ORDER BY sorular.id LIMIT ?", (*params, batch_size))]
+        rows = get_question_cache().rows(ids, keep=False)
+        metrics.count("db.scan_rows", len(rows))
+        yield from (rows[soru_id] for soru_id in ids if soru_id in rows)
+        if len(ids) < batch_size:
+            return
+        page_filter = QuestionFilter(question_filter.text, question_filter.categories, ids[-1] + 1,
+                                     question_filter.max_id, question_filter.has_empty_option)
+
+@metrics.timed("db.all")
+def get_all_questions():
+    log.debug("get_all_questions çağrıldı.")
+    try:
+        sorular = get_pool().connection().execute(SELECT_ALL_QUESTIONS_SQL).fetchall()
+        log.debug("Veritabanından %s adet soru çekildi.", len(sorular))
+        return sorular
+    except sqlite3.Error as e:
+        log.error("get_all_questions içinde veritabanı hatası: %s", e)
+        return []
+
+EXPORT_FILE_TYPES = (".csv", ".jsonl", ".json")
+EXPORT_CSV_COLUMNS = ("id", "soru_metni", "secenek1", "secenek2", "secenek3", "secenek4", "secenek5",
+                      "dogru_secenek_index", "kategori")
+
+@metrics.timed("export")
+def export_questions(path, question_filter=None):
+    """Writes every question (or those matching question_filter) to a CSV or JSONL file that
+    import_questions can read back; returns the row count."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FILE_TYPES:
+        raise ValueError(f"Desteklenmeyen dosya türü: {extension or path} ({', '.join(EXPORT_FILE_TYPES)})")
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if extension == ".csv":
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_CSV_COLUMNS)
+            for count, row in enumerate(iter_all_questions(question_filter=question_filter), start=1):
+                writer.writerow(row)
+        else:
+            for count, row in enumerate(iter_all_questions(question_filter=question_filter), start=1):
+                f.write(json.dumps(question_to_dict(row), ensure_ascii=False))
+                f.write("\n")
+        metrics.count("export.bytes", f.tell())
+    metrics.count("export.rows", count)
+    return count
+
+QUESTION_SORT_COLUMNS = ("id", "soru_metni", "secenek1", "secenek2", "secenek3", "secenek4", "secenek5",
+                         "dogru_secenek_index")
+QUESTION_SEARCH_COLUMNS = ("soru_metni", "secenek1", "secenek2", "secenek3", "secenek4", "secenek5", "kategori")
+_QUALIFIED_QUESTION_COLUMNS = ", ".join(f"sorular.{c.strip()}" for c in QUESTION_COLUMNS.split(","))
+
+def normalize_search_text(text):
+    return (text or "").replace("ı", "i")
+
+def build_match_query(text):
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", normalize_search_text(text)))
+
+class QuestionFilter:
+    """What the list view, printing and the exports are restricted to.
+
+    Compiles to a parameterized WHERE clause. The text goes through the FTS index (a LIKE
+    scan without FTS5), categories through the (kategori, id) index and the id range
+    through the rowid; has_empty_option (a blank option among A-E) is only checked on
+    the rows those leave. An empty filter selects the whole bank.
+    """
+    # Query string keys used by the HTTP API; kategori may repeat.
+    PARAM_KEYS = ("q", "kategori", "min_id", "max_id", "bos_secenek")
+
+    def __init__(self, text="", categories=(), min_id=None, max_id=None, has_empty_option=False):
+        self.text = (text or "").strip()
+        self.categories = tuple(dict.fromkeys(categories))
+        self.min_id = min_id
+        self.max_id = max_id
+        self.has_empty_option = bool(has_empty_option)
+
+    @classmethod
+    def coerce(cls, value):
+        """Accepts a QuestionFilter, a plain search string or None."""
+        return value if isinstance(value, cls) else cls(text=value)
+
+    @classmethod
+    def from_params(cls, pairs):
+        """Builds a filter from query string pairs (parse_qsl output); raises ValueError for bad ids."""
+        values = {}
+        for key, value in pairs:
+            values.setdefault(key, []).append(value)
+        last = lambda key: values.get(key, [None])[-1]
+        id_bound = lambda key: None if last(key) in (None, "") else int(last(key))
+        return cls(last("q"), values.get("kategori", ()), id_bound("min_id"), id_bound("max_id"),
+                   last("bos_secenek") in ("1", "true"))
+
+    def to_params(self):
+        """Query string values for urlencode(..., doseq=True); empty conditions are left out."""
+        params = {"q": self.text or None, "kategori": list(self.categories) or None,
+                  "min_id": self.min_id, "max_id": self.max_id, "bos_secenek": 1 if self.has_empty_option else None}
+        return {key: value for key, value in params.items() if value is not None}
+
+    def __eq__(self, other):
+        return isinstance(other, QuestionFilter) and self.to_params() == other.to_params()
+
+    def __hash__(self):
+        return hash(tuple(sorted((key, str(value)) for key, value in self.to_params().items())))
+
+    def has_text(self):
+        return bool(build_match_query(self.text))
+
+    def is_empty(self):
+        return not (self.has_text() or self.categories or self.min_id is not None or self.max_id is not None
+                    or self.has_empty_option)
+
+    def source_sql(self):
+        """Returns (FROM/WHERE sql, params, rank expression or None)."""
+        source, conditions, params, rank_sql = "FROM sorular", [], [], None
+        match_query = build_match_query(self.text)
+        if match_query and _fts_enabled:
+            source += " JOIN sorular_fts ON sorular_fts.rowid = sorular.id"
+            conditions.append("sorular_fts MATCH ?")
+            params.append(match_query)
+            rank_sql = FTS_RANK_SQL
+        elif match_query:
+            conditions.append("(" + " OR ".join(f"sorular.{column} LIKE ?" for column in QUESTION_SEARCH_COLUMNS) + ")")
+            params += [f"%{self.text}%"] * len(QUESTION_SEARCH_COLUMNS)
+        if self.categories:
+            conditions.append(f"sorular.kategori IN ({', '.join('?' * len(self.categories))})")
+            params += self.categories
+        if self.min_id is not None:
+            conditions.append("sorular.id >= ?")
+            params.append(self.min_id)
+        if self.max_id is not None:
+            conditions.append("sorular.id <= ?")
+            params.append(self.max_id)
+        if self.has_empty_option:
+            conditions.append("(" + " OR ".join(f"coalesce(sorular.secenek{j}, '') = ''" for j in range(1, 6)) + ")")
+        where_sql = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return source + where_sql, tuple(params), rank_sql
+
+@metrics.timed("db.count")
+def count_questions(question_filter=None):
+    question_filter = QuestionFilter.coerce(question_filter)
+    source_sql, params, _ = question_filter.source_sql()
+    # The whole bank and whole categories are counted from the istatistikler counters, not by scanning.
+    if question_filter.is_empty():
+        count_sql = "SELECT coalesce(sum(sayi), 0) FROM istatistikler WHERE tur = 'toplam'"
+    elif question_filter.to_params().keys() == {"kategori"}:
+        params = tuple(set(question_filter.categories))
+        count_sql = (f"SELECT coalesce(sum(sayi), 0) FROM istatistikler WHERE tur = 'kategori' "
+                     f"AND anahtar IN ({', '.join('?' * len(params))})")
+    else:
+        count_sql = f"SELECT count(*) {source_sql}"
+    try:
+        return get_pool().connection().execute(count_sql, params).fetchone()[0]
+    except sqlite3.Error as e:
+        log.error("count_questions içinde veritabanı hatası: %s", e)
+        return 0
+
+@metrics.timed("db.page")
+def get_questions_page(sort_column=0, descending=False, limit=200, offset=0, question_filter=None):
+    """One page of the questions matching question_filter (a QuestionFilter or a search string).
+
+    sort_column indexes QUESTION_SORT_COLUMNS; None orders by search relevance.
+    """
+    source_sql, params, rank_sql = QuestionFilter.coerce(question_filter).source_sql()
+    direction = "DESC" if descending else "ASC"
+    if sort_column is None:
+        order_sql = f"{rank_sql}, sorular.id" if rank_sql else "sorular.id"
+    else:
+        order_sql = f"sorular.{QUESTION_SORT_COLUMNS[sort_column]} {direction}, sorular.id {direction}"
+    try:
+        with get_pool().transaction() as conn:
+            ids = [row[0] for row in conn.execute(
+                f"SELECT sorular.id {source_sql} ORDER BY {order_sql} LIMIT ? OFFSET ?", (*params, limit, offset))]
+            rows = get_question_cache().rows(ids)
+        return [rows[soru_id] for soru_id in ids if soru_id in rows]
+    except sqlite3.Error as e:
+        log.error("get_questions_page içinde veritabanı hatası: %s", e)
+        return []
+
+@metrics.timed("db.search")
+def search_questions(text, limit=100):
+    return get_questions_page(None, False, limit, 0, text)
+
+def get_change_cursor():
+    return get_pool().connection().execute("SELECT coalesce(max(seq), 0) FROM sorular_changelog").fetchone()[0]
+
+def _change_log_covers(conn, seq):
+    """False when entries after seq have already been pruned from the change log."""
+    oldest = conn.execute("SELECT min(seq) FROM sorular_changelog").fetchone()[0]
+    return oldest is None or seq >= oldest - 1
+
+def get_changes_since(seq, limit=500):
+    """Returns [(seq, soru_id, op), ...] logged after seq, or None when the caller should
+    reload everything instead (the log was pruned past seq, or more than limit changes)."""
+    conn = get_pool().connection()
+    if not _change_log_covers(conn, seq):
+        return None
+    changes = conn.execute("SELECT seq, soru_id, op FROM sorular_changelog WHERE seq > ? ORDER BY seq LIMIT ?",
+                           (seq, limit + 1)).fetchall()
+    return None if len(changes) > limit else changes
+
+def prune_change_log(keep=CHANGELOG_RETENTION):
+    with get_pool().transaction() as conn:
+        conn.execute("DELETE FROM sorular_changelog WHERE seq <= (SELECT max(seq) FROM sorular_changelog) - ?", (keep,))
+
+def _select_by_ids(conn, columns, ids, chunk_size=500):
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        yield from conn.execute(f"SELECT {columns} FROM sorular WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+
+def _read_questions_by_ids(conn, ids):
+    return {row[0]: row for row in _select_by_ids(conn, QUESTION_COLUMNS, ids)}
+
+@metrics.timed("db.by_ids")
+def get_questions_by_ids(ids):
+    """Returns {id: QUESTION_COLUMNS row} for the ids that exist, served from the shared QuestionCache."""
+    return get_question_cache().rows(ids)
+
+QUESTION_CACHE_TEXT_CHARS = 4_000_000
+
+class QuestionCache:
+    """Shared in-process copy of `sorular` that the list view, printing and exports read rows from.
+
+    Per question only the id (array 'q'), the answer index (array 'b', -1 for none) and a
+    category number into a list of interned names (array 'I') stay resident, 13 bytes
+    in all. Question and option texts are kept joined into one string per question in
+    an LRU bounded by max_text_chars characters and re-read from SQLite by id once
+    evicted; rows_in_order() reads the
+    texts it is missing without caching them, so a print or export does not flush the
+    working set of the view.
+
+    Every read first catches up with sorular_changelog as seen by the caller's
+    connection. A caller whose snapshot is older than the cache (a long read
+    transaction on another thread) is answered straight from SQLite instead. Do not
+    read through it inside a write transaction: it would take in uncommitted rows.
+    """
+    MAX_CHANGES = 2000
+    TEXT_SEPARATOR = "\x1f"
+
+    def __init__(self, db_name, max_text_chars=QUESTION_CACHE_TEXT_CHARS):
+        self.db_name = db_name
+        self.max_text_chars = max_text_chars
+        self._lock = threading.Lock()
+        self._cursor = None
+        self._ids = array("q")
+        self._answers = array("b")
+        self._category_refs = array("I")
+        self._categories = []
+        self._category_numbers = {}
+        self._texts = OrderedDict()
+        self._text_chars = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _category_number(self, kategori):
+        number = self._category_numbers.get(kategori)
+        if number is None:
+            number = self._category_numbers[kategori] = len(self._categories)
+            self._categories.append(kategori if kategori is None else sys.intern(kategori))
+        return number
+
+    def _position(self, soru_id):
+        position = bisect_left(self._ids, soru_id)
+        return position if position < len(self._ids) and self._ids[position] == soru_id else None
+
+    def _insert(self, soru_id, answer, kategori):
+        position = bisect_left(self._ids, soru_id)
+        self._ids.insert(position, soru_id)
+        self._answers.insert(position, answer if answer is not None and 0 <= answer < 128 else -1)
+        self._category_refs.insert(position, self._category_number(kategori))
+
+    def _pack(self, texts):
+        """One string for the six texts of a row; rows with NULLs or the separator stay a tuple."""
+        if all(isinstance(text, str) and self.TEXT_SEPARATOR not in text for text in texts):
+            return self.TEXT_SEPARATOR.join(texts)
+        return texts
+
+    def _unpack(self, packed):
+        return packed.split(self.TEXT_SEPARATOR) if isinstance(packed, str) else packed
+
+    @staticmethod
+    def _text_size(packed):
+        return len(packed) if isinstance(packed, str) else sum(len(text or "") for text in packed)
+
+    def _forget(self, soru_id):
+        packed = self._texts.pop(soru_id, None)
+        if packed is not None:
+            self._text_chars -= self._text_size(packed)
+        position = self._position(soru_id)
+        if position is not None:
+            del self._ids[position], self._answers[position], self._category_refs[position]
+
+    def _remember_text(self, soru_id, texts):
+        packed = self._texts[soru_id] = self._pack(texts)
+        self._text_chars += self._text_size(packed)
+        while self._text_chars > self.max_text_chars and self._texts:
+            _, evicted = self._texts.popitem(last=False)
+            self._text_chars -= self._text_size(evicted)
+
+    def _sync(self, conn):
+        """Applies the change log up to the caller's snapshot; returns that snapshot's cursor."""
+        cursor = get_change_cursor()
+        changes = None if self._cursor is None else [] if cursor <= self._cursor else \
+            get_changes_since(self._cursor, self.MAX_CHANGES)
+        if changes is None:
+            with metrics.span("cache.load"):
+                self._ids, self._answers, self._category_refs = array("q"), array("b"), array("I")
+                self._texts.clear()
+                self._text_chars = 0
+                for soru_id, answer, kategori in conn.execute(
+                        "SELECT id, dogru_secenek_index, kategori FROM sorular ORDER BY id"):
+                    self._insert(soru_id, answer, kategori)
+            self._cursor = cursor
+        elif changes:
+            changed = {soru_id for _, soru_id, _ in changes}
+            for soru_id in changed:
+                self._forget(soru_id)
+            for row in _select_by_ids(conn, "id, dogru_secenek_index, kategori", changed):
+                self._insert(*row)
+            self._cursor = max(cursor, changes[-1][0])
+        return cursor
+
+    def _row(self, position, packed):
+        answer = self._answers[position]
+        return (self._ids[position], *self._unpack(packed), None if answer < 0 else answer,
+                self._categories[self._category_refs[position]])
+
+    def rows(self, ids, keep=True):
+        """Returns {id: QUESTION_COLUMNS row} for the ids that exist; keep=False leaves the LRU alone."""
+        ids = list(ids)
+        conn = get_pool().connection()
+        rows, missing = {}, []
+        with self._lock:
+            cursor = self._sync(conn)
+            if cursor != self._cursor:
+                return _read_questions_by_ids(conn, ids)
+            for soru_id in ids:
+                position = self._position(soru_id)
+                if position is None:
+                    continue
+                packed = self._texts.get(soru_id)
+                if packed is None:
+                    missing.append(soru_id)
+                else:
+                    self._texts.move_to_end(soru_id)
+                    rows[soru_id] = self._row(position, packed)
+        metrics.count("cache.hits", len(rows))
+        metrics.count("cache.misses", len(missing))
+        if missing:
+            low, high = min(missing), max(missing)
+            if len(missing) > 64 and high - low < 2 * len(missing):
+                # A dense run of ids (a scan in id order) is cheaper as one range query than IN lists.
+                wanted = set(missing)
+                fetched = {row[0]: row for row in conn.execute(
+                    f"SELECT {QUESTION_COLUMNS} FROM sorular WHERE id BETWEEN ? AND ?", (low, high)) if row[0] in wanted}
+            else:
+                fetched = _read_questions_by_ids(conn, missing)
+            rows.update(fetched)
+            if keep:
+                with self._lock:
+                    if cursor == self._cursor:
+                        for soru_id, row in fetched.items():
+                            self._remember_text(soru_id, row[1:7])
+        return rows
+
+    def rows_in_order(self, batch_size=500):
+        """Yields every question in id order as of the first batch."""
+        with self._lock:
+            self._sync(get_pool().connection())
+            ids = array("q", self._ids)
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            rows = self.rows(batch, keep=False)
+            metrics.count("db.scan_rows", len(rows))
+            yield from (rows[soru_id] for soru_id in batch if soru_id in rows)
+
+
+_question_cache = None
+
+def get_question_cache():
+    global _question_cache
+    cache = _question_cache
+    if cache is None or cache.db_name != DB_NAME:
+        with _pool_lock:
+            if _question_cache is None or _question_cache.db_name != DB_NAME:
+                _question_cache = QuestionCache(DB_NAME)
+            cache = _question_cache
+    return cache
+
+def get_question_options(soru_id):
+    """All options of a question by position, including those past the five legacy columns."""
+    rows = get_pool().connection().execute(
+        "SELECT sira, metin FROM secenekler WHERE soru_id = ? ORDER BY sira", (soru_id,)).fetchall()
+    options = [""] * (rows[-1][0] + 1 if rows else 0)
+    for sira, metin in rows:
+        options[sira] = metin
+    return options
+
+QUESTION_TABLE_HEADERS = ["ID", "Soru Metni", "A", "B", "C", "D", "E", "Cevap Şıkkı"]
+
+def correct_option_label(row_data):
+    correct_option_char = "N/A"; dogru_idx = row_data[7]
+    if dogru_idx is not None and 0 <= dogru_idx < 5:
+        if row_data[2+dogru_idx]: correct_option_char = chr(65 + dogru_idx)
+        else: correct_option_char = f"{chr(65 + dogru_idx)} (Boş)"
+    return correct_option_char
+
+def question_to_dict(row):
+    """JSON shape of a QUESTION_COLUMNS row, shared by the JSONL export, the CLI and the HTTP API."""
+    return {"id": row[0], "soru_metni": row[1], "secenekler": list(row[2:7]),
+            "dogru_secenek_index": row[7], "kategori": row[8]}
+
+def question_from_dict(question):
+    secenekler = (list(question.get("secenekler") or []) + [""] * 5)[:5]
+    return (question["id"], question["soru_metni"], *secenekler, question.get("dogru_secenek_index"),
+            question.get("kategori"))
+
+@metrics.timed("db.snapshot")
+def load_question_snapshot(sort_column, descending, question_filter, page_size):
+    """Returns (change cursor, matching row count, first page) read in one transaction."""
+    with get_pool().transaction():
+        change_seq = get_change_cursor()
+        total_rows = count_questions(question_filter)
+        first_page = get_questions_page(sort_column, descending, page_size, 0, question_filter)
+    return change_seq, total_rows, first_page
+
+@metrics.timed("db.changes")
+def load_question_changes(since_seq, sort_column, descending, question_filter, page_size, max_changes=500):
+    """What a paged view loaded at since_seq needs to catch up.
+
+    None when nothing changed; ("full", cursor, total, first page) when the view has to
+    reload (the log cannot answer, or it is sorted/filtered so positions are unknown);
+    otherwise ("delta", cursor, old ascending positions of deleted rows, inserted count,
+    {id: row} of updated rows) for a view in the default id ordering without a filter.
+    """
+    incremental = sort_column == 0 and QuestionFilter.coerce(question_filter).is_empty()
+    with get_pool().transaction() as conn:
+        changes = get_changes_since(since_seq, max_changes)
+        if changes == []:
+            return None
+        if changes is None or not incremental:
+            return ("full",) + load_question_snapshot(sort_column, descending, question_filter, page_size)
+        inserted, updated, deleted = set(), set(), set()
+        for _, soru_id, op in changes:
+            if op == "I":
+                inserted.add(soru_id)
+            elif op == "D":
+                if soru_id in inserted: inserted.discard(soru_id)
+                else: deleted.add(soru_id)
+                updated.discard(soru_id)
+            elif soru_id not in inserted:
+                updated.add(soru_id)
+        # Old ascending position of a deleted id = surviving ids below it + deleted ids below it.
+        deleted_positions = [
+            conn.execute("SELECT count(*) FROM sorular WHERE id < ?", (soru_id,)).fetchone()[0]
+            + sum(1 for other in deleted if other < soru_id)
+            for soru_id in deleted]
+        return ("delta", changes[-1][0], deleted_positions, len(inserted), get_questions_by_ids(updated))
+
+
+class DataVersionWatcher:
+    """Cheap cross-process change detection via PRAGMA data_version.
+
+    Uses its own connection that never writes, so a commit from any other connection
+    (pooled threads in this process or another process entirely) moves the version.
+    """
+
+    def __init__(self, db_name=None):
+        self.db_name = db_name or DB_NAME
+        self._conn = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False)
+        self._version = self._read()
+
+    def _read(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self):
+        version = self._read()
+        if version == self._version:
+            return False
+        self._version = version
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+def has_questions():
+    try:
+        return bool(get_pool().connection().execute("SELECT EXISTS (SELECT 1 FROM sorular)").fetchone()[0])
+    except sqlite3.Error as e:
+        log.error("has_questions içinde veritabanı hatası: %s", e)
+        return False
+
+
+EXAM_PROBE_FRACTION = 0.25
+EXAM_SHEET_COLUMNS = ("kitapcik", "soru_no", "soru_id", "kategori", "cevap", "secenek_sirasi")
+
+@metrics.timed("db.categories")
+def get_category_counts():
+    """Returns {kategori: question count}, read from the istatistikler aggregates."""
+    try:
+        return dict(get_pool().connection().execute(
+            "SELECT anahtar, sayi FROM istatistikler WHERE tur = 'kategori' AND anahtar <> '' AND sayi > 0").fetchall())
+    except sqlite3.Error as e:
+        log.error("get_category_counts içinde veritabanı hatası: %s", e)
+        return {}
+
+STATISTICS_QUALITY_LABELS = {
+    "cevapsiz": "Doğru cevabı işaretlenmemiş",
+    "dogru_sik_bos": "Doğru şıkkı boş",
+}
+
+@metrics.timed("db.statistics")
+def get_statistics():
+    """Returns {tur: {anahtar: count}} for the dashboard; see STATISTICS_SCHEMA_SQL for the keys."""
+    statistics = {}
+    try:
+        for tur, anahtar, sayi in get_pool().connection().execute(
+                "SELECT tur, anahtar, sayi FROM istatistikler WHERE sayi <> 0"):
+            statistics.setdefault(tur, {})[anahtar] = sayi
+    except sqlite3.Error as e:
+        log.error("get_statistics içinde veritabanı hatası: %s", e)
+    return statistics
+
+def plan_exam_counts(weights, available, total=None):
+    """Turns {kategori: weight} into {kategori: question count}.
+
+    Without total the weights are the counts themselves. With total the questions are
+    split by weight (largest remainder), and whatever a category cannot supply is
+    handed on to the categories that still have questions left.
+    """
+    for kategori, weight in weights.items():
+        if kategori not in available:
+            raise ValueError(f"'{kategori}' kategorisinde soru yok.")
+        if weight < 0:
+            raise ValueError(f"'{kategori}' için ağırlık negatif olamaz.")
+    if total is None:
+        for kategori, count in weights.items():
+            if count > available[kategori]:
+                raise ValueError(f"'{kategori}' kategorisinde {available[kategori]} soru var, {count} istendi.")
+        return {kategori: int(count) for kategori, count in weights.items()}
+    if total > sum(available[kategori] for kategori, weight in weights.items() if weight > 0):
+        raise ValueError(f"Seçilen kategorilerde {total} soruyu karşılayacak kadar soru yok.")
+    counts = dict.fromkeys(weights, 0)
+    remaining = total
+    while remaining > 0:
+        open_weights = {k: w for k, w in weights.items() if w > 0 and counts[k] < available[k]}
+        weight_sum = sum(open_weights.values())
+        shares = {k: remaining * w / weight_sum for k, w in open_weights.items()}
+        grants = {k: int(share) for k, share in shares.items()}
+        for kategori in sorted(shares, key=lambda k: shares[k] - grants[k], reverse=True)[:remaining - sum(grants.values())]:
+            grants[kategori] += 1
+        for kategori, grant in grants.items():
+            grant = min(grant, available[kategori] - counts[kategori])
+            counts[kategori] += grant
+            remaining -= grant
+    return counts
+
+def _category_size(conn, kategori, limit):
+    """Counts the category's questions through the index, stopping at limit."""
+    return conn.execute("SELECT count(*) FROM (SELECT 1 FROM sorular WHERE kategori = ? LIMIT ?)",
+                        (kategori, limit)).fetchone()[0]
+
+def _sample_category_ids(conn, kategori, count, size, rng):
+    if count <= size * EXAM_PROBE_FRACTION:
+        # Id-range probes: each is one index seek to the first id of the category at or
+        # after a random point. Ids that follow a long run of other categories are drawn
+        # slightly more often; large draws use the exact path below instead.
+        low, high = conn.execute("SELECT (SELECT min(id) FROM sorular WHERE kategori = ?), "
+                                 "(SELECT max(id) FROM sorular WHERE kategori = ?)", (kategori, kategori)).fetchone()
+        picked = set()
+        for _ in range(count * 8):
+            row = conn.execute("SELECT id FROM sorular WHERE kategori = ? AND id >= ? ORDER BY id LIMIT 1",
+                               (kategori, rng.randint(low, high))).fetchone()
+            if row:
+                picked.add(row[0])
+            if len(picked) == count:
+                return sorted(picked)
+    ids = [row[0] for row in conn.execute("SELECT id FROM sorular WHERE kategori = ? ORDER BY id", (kategori,))]
+    return sorted(rng.sample(ids, min(count, len(ids))))
+
+@metrics.timed("exam.draw")
+def draw_exam_questions(weights, total=None, rng=None):
+    """Draws questions without repeats as [(kategori, [question row, ...]), ...] in weights order.
+
+    With explicit counts no category is counted further than the sampling needs, so the
+    cost follows the exam size rather than the bank size.
+    """
+    rng = rng or random.Random()
+    with get_pool().transaction() as conn:
+        if total is None:
+            available = {kategori: _category_size(conn, kategori, int(count / EXAM_PROBE_FRACTION) + 1)
+                         for kategori, count in weights.items()}
+            available = {kategori: size for kategori, size in available.items() if size}
+        else:
+            available = get_category_counts()
+        counts = plan_exam_counts(weights, available, total)
+        sections = []
+        for kategori, count in counts.items():
+            if count:
+                ids = _sample_category_ids(conn, kategori, count, available[kategori], rng)
+                rows = get_questions_by_ids(ids)
+                sections.append((kategori, [rows[soru_id] for soru_id in ids if soru_id in rows]))
+    return sections
+
+def booklet_label(index):
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+def shuffle_options(q_data, rng):
+    """Returns (id, soru_metni, [secenek, ...], dogru_secenek_index, kategori, [original index, ...])
+    with the non-empty options in random order and the correct index remapped to match."""
+    correct_option_index = q_data[7]
+    options = [(j, q_data[2+j] or "[BOŞ]") for j in range(5) if q_data[2+j] or j == correct_option_index]
+    rng.shuffle(options)
+    new_index = next((position for position, (j, _) in enumerate(options) if j == correct_option_index), None)
+    return q_data[0], q_data[1], [text for _, text in options], new_index, q_data[8], [j for j, _ in options]
+
+def build_booklet(sections, label, seed):
+    """Question order is shuffled within each kategori section; the seed and label fix the result."""
+    rng = random.Random(f"{seed}:{label}")
+    questions = []
+    for _, rows in sections:
+        rows = list(rows)
+        rng.shuffle(rows)
+        questions.extend(shuffle_options(q_data, rng) for q_data in rows)
+    return questions
+
+def answer_key_rows(label, questions):
+    """One EXAM_SHEET_COLUMNS row per question; secenek_sirasi spells the original option letters
+    in booklet order ("CAB..." means booklet A is the question's C), so grading can map answers back."""
+    return [(label, number, question[0], question[4],
+             chr(65 + question[3]) if question[3] is not None else "",
+             "".join(chr(65 + j) for j in question[5]))
+            for number, question in enumerate(questions, start=1)]
+
+
+class ExamBatchReport:
+    def __init__(self, seed, output_dir):
+        self.seed = seed
+        self.output_dir = output_dir
+        self.question_count = 0
+        self.sections = []
+        self.booklets = []
+
+    def summary(self):
+        sections = ", ".join(f"{kategori}: {count}" for kategori, count in self.sections)
+        return (f"{len(self.booklets)} kitapçık ({', '.join(self.booklets[:5])}{'...' if len(self.booklets) > 5 else ''}), "
+                f"kitapçık başına {self.question_count} soru ({sections}). Tohum: {self.seed}. Klasör: {self.output_dir}")
+
+def _write_booklet(sections, label, seed, output_dir, output_format, attachments):
+    """Builds one booklet and writes it out; runs in the exam process pool, so it must not touch the
+    database: the images the questions use come in attachments."""
+    questions = build_booklet(sections, label, seed)
+    if output_format == "pdf":
+        from soruBankası import (StreamingPrintRenderer, create_pdf_printer, ensure_headless_gui_app, print_images,
+                                 write_exam_question)
+        app = ensure_headless_gui_app()  # must outlive the QPrinter
+        print_images.preload(attachments)
+        renderer = StreamingPrintRenderer(title=f"Sınav - {label} Kitapçığı", writer=write_exam_question)
+        renderer.render(create_pdf_printer(os.path.join(output_dir, f"kitapcik_{label}.pdf")),
+                        questions=questions, total=len(questions))
+    else:
+        with open(os.path.join(output_dir, f"kitapcik_{label}.json"), "w", encoding="utf-8") as f:
+            json.dump({"kitapcik": label, "sorular": [
+                {"no": number, "soru_id": q[0], "soru_metni": q[1], "secenekler": q[2], "kategori": q[4]}
+                for number, q in enumerate(questions, start=1)]}, f, ensure_ascii=False, indent=1)
+    return answer_key_rows(label, questions)
+
+@metrics.timed("exam.batch")
+def generate_exam_batch(weights, output_dir, total=None, variants=3, seed=None, output_format="pdf",
+                        workers=None, task=None):
+    """Draws one question set and writes `variants` shuffled booklets plus cevap_anahtari.csv.
+
+    Booklets are built in a spawn-based process pool when there is more than one worker
+    and more than a couple of variants; each worker only shuffles and renders rows it is
+    handed, so the database is read once, in this process.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    report = ExamBatchReport(seed, output_dir)
+    sections = draw_exam_questions(weights, total, random.Random(seed))
+    report.sections = [(kategori, len(rows)) for kategori, rows in sections]
+    report.question_count = sum(count for _, count in report.sections)
+    if not report.question_count:
+        raise ValueError("Sınava seçilecek soru bulunamadı.")
+    os.makedirs(output_dir, exist_ok=True)
+    attachments = {}
+    if output_format == "pdf":
+        attachments = get_attachments({ozet for _, rows in sections for row in rows for text in row[1:7]
+                                       for ozet in attachment_refs(text or "")})
+    labels = [booklet_label(i) for i in range(variants)]
+    workers = min(workers or os.cpu_count() or 1, variants)
+    keys = {}
+    if workers > 1 and variants > 2:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(_write_booklet, sections, label, seed, output_dir, output_format, attachments): label
+                       for label in labels}
+            try:
+                for done, future in enumerate(as_completed(futures), start=1):
+                    keys[futures[future]] = future.result()
+                    if task:
+                        task.check_cancelled()
+                        task.report_progress(done / variants)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    else:
+        for done, label in enumerate(labels, start=1):
+            keys[label] = _write_booklet(sections, label, seed, output_dir, output_format, attachments)
+            if task:
+                task.check_cancelled()
+                task.report_progress(done / variants)
+    with open(os.path.join(output_dir, "cevap_anahtari.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXAM_SHEET_COLUMNS)
+        for label in labels:
+            writer.writerows(keys[label])
+    report.booklets = labels
+    return report
+
+# Exam grading. Answer sheets are graded one booklet at a time as uint8 matrices (a row per
+# student, a column per booklet position), so each step is a NumPy pass over all sheets
+# rather than a Python loop. Positions and printed letters are mapped back to soru_id and
+# the question's own option letters first, so every booklet of an exam feeds the same
+# per-question numbers: difficulty (share answering correctly), discrimination (upper
+# minus lower 27% group by total score), item-rest correlation and option counts.
+GRADING_UPPER_LOWER_FRACTION = 0.27
+GRADING_OPTION_KEYS = ("A", "B", "C", "D", "E", "bos")
+GRADING_RESULT_COLUMNS = ("ogrenci", "kitapcik", "dogru", "yanlis", "bos", "puan")
+ITEM_ANALYSIS_COLUMNS = ("soru_id", "ogrenci_sayisi", "dogru_sayisi", "guclik", "ayirt_edicilik",
+                         "madde_toplam_korelasyonu", "secenek_dagilimi")
+_BLANK = len(GRADING_OPTION_KEYS) - 1
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Sınav puanlamak için numpy gerekli (pip install numpy).")
+    return numpy
+
+def load_answer_key(path):
+    """Reads a cevap_anahtari file (CSV, or JSONL objects with EXAM_SHEET_COLUMNS keys) into
+    {kitapcik: [(soru_id, cevap letter or "", secenek_sirasi or ""), ...]} in booklet order."""
+    booklets = {}
+    for line_no, record in iter_import_records(path):
+        fields = {str(key).strip().lower(): value for key, value in record.items() if key is not None} \
+            if isinstance(record, dict) else {}
+        try:
+            entry = (int(fields["soru_no"]), int(fields["soru_id"]), str(fields.get("cevap") or "").strip().upper(),
+                     str(fields.get("secenek_sirasi") or "").strip().upper())
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Cevap anahtarı satır {line_no}: {', '.join(EXAM_SHEET_COLUMNS[:5])} sütunları gerekli.")
+        booklets.setdefault(str(fields.get("kitapcik") or "").strip().upper(), []).append(entry)
+    if not booklets:
+        raise ValueError("Cevap anahtarı boş.")
+    key, question_ids = {}, None
+    for label, entries in booklets.items():
+        entries.sort()
+        if [number for number, *_ in entries] != list(range(1, len(entries) + 1)):
+            raise ValueError(f"'{label}' kitapçığında soru numaraları 1'den başlayıp ardışık olmalı.")
+        if question_ids is None:
+            question_ids = sorted(soru_id for _, soru_id, _, _ in entries)
+        elif sorted(soru_id for _, soru_id, _, _ in entries) != question_ids:
+            raise ValueError("Cevap anahtarındaki kitapçıklar aynı soruları içermeli.")
+        key[label] = [entry[1:] for entry in entries]
+    return key
+
+def iter_answer_sheets(path, progress=lambda fraction: None):
+    """Yields (ogrenci, kitapcik, cevaplar) from a CSV, JSONL or XLSX file with those columns.
+
+    cevaplar holds one character per booklet question: A-E (any case) is a mark, anything
+    else (space, '-', '*', ...) counts as blank. ogrenci defaults to the line number.
+    """
+    for line_no, record in iter_import_records(path, progress):
+        if not isinstance(record, dict):
+            raise ValueError(f"Cevap kağıdı satır {line_no}: {record}")
+        fields = {str(key).strip().lower(): value for key, value in record.items() if key is not None}
+        text = lambda value: "" if value is None else str(value)
+        yield (text(fields.get("ogrenci")).strip() or str(line_no), text(fields.get("kitapcik")).strip().upper(),
+               text(fields.get("cevaplar")))
+
+
+class GradingReport:
+    def __init__(self, question_ids):
+        self.question_ids = question_ids
+        self.students = []
+        self.rejected = []
+        self.correct = self.blank = None
+        self.difficulty = self.discrimination = self.item_rest = None
+        self.option_counts = None  # (all, upper, lower) x question x GRADING_OPTION_KEYS
+        self.seconds = 0.0
+
+    def summary(self):
+        if not self.students:
+            return f"Puanlanacak cevap kağıdı yok ({len(self.rejected)} kağıt reddedildi)."
+        mean = float(self.correct.mean())
+        return (f"{len(self.students)} kağıt, {len(self.question_ids)} soru puanlandı ({self.seconds:.2f} sn). "
+                f"Ortalama {mean:.2f} doğru (%{mean * 100 / max(len(self.question_ids), 1):.1f}), "
+                f"{len(self.rejected)} kağıt reddedildi.")
+
+    def student_rows(self):
+        """GRADING_RESULT_COLUMNS rows in input order; puan is the percentage of correct answers."""
+        total = max(len(self.question_ids), 1)
+        for (ogrenci, kitapcik), correct, blank in zip(self.students, self.correct.tolist(), self.blank.tolist()):
+            yield ogrenci, kitapcik, correct, len(self.question_ids) - correct - blank, blank, round(correct * 100 / total, 2)
+
+    def item_rows(self):
+        """ITEM_ANALYSIS_COLUMNS rows (without the timestamp), one per question."""
+        counts = self.option_counts.tolist()
+        correct = (self.difficulty * len(self.students)).round().astype(int).tolist()
+        for j, soru_id in enumerate(self.question_ids):
+            item_rest = float(self.item_rest[j])
+            distribution = {key: [counts[0][j][k], counts[1][j][k], counts[2][j][k]]
+                            for k, key in enumerate(GRADING_OPTION_KEYS)}
+            yield (soru_id, len(self.students), correct[j], round(float(self.difficulty[j]), 4),
+                   round(float(self.discrimination[j]), 4), None if item_rest != item_rest else round(item_rest, 4),
+                   json.dumps(distribution))
+
+@metrics.timed("grade")
+def grade_answer_sheets(answer_key, sheets):
+    """Grades (ogrenci, kitapcik, cevaplar) sheets against load_answer_key() output.
+
+    A sheet without kitapcik is allowed when the key has a single booklet; sheets naming an
+    unknown booklet are rejected. Marks on letters a booklet did not print count as blank.
+    """
+    np = _import_numpy()
+    start = time.perf_counter()
+    labels = list(answer_key)
+    question_ids = sorted(soru_id for soru_id, _, _ in answer_key[labels[0]])
+    column = {soru_id: j for j, soru_id in enumerate(question_ids)}
+    count = len(question_ids)
+    report = GradingReport(question_ids)
+    grouped = {label: [] for label in labels}
+    for ogrenci, kitapcik, cevaplar in sheets:
+        kitapcik = kitapcik or (labels[0] if len(labels) == 1 else "")
+        if kitapcik not in grouped:
+            report.rejected.append((ogrenci, f"Bilinmeyen kitapçık: '{kitapcik}'"))
+            continue
+        grouped[kitapcik].append((len(report.students), cevaplar))
+        report.students.append((ogrenci, kitapcik))
+
+    letter_codes = np.full(256, _BLANK, dtype=np.uint8)
+    for j, letter in enumerate("ABCDE"):
+        letter_codes[ord(letter)] = letter_codes[ord(letter.lower())] = j
+    correct = np.zeros((len(report.students), count), dtype=bool)
+    chosen = np.full((len(report.students), count), _BLANK, dtype=np.uint8)
+    for label, entries in answer_key.items():
+        if not grouped[label]:
+            continue
+        rows = np.fromiter((row for row, _ in grouped[label]), dtype=np.intp, count=len(grouped[label]))
+        raw = "".join(cevaplar.ljust(count)[:count] for _, cevaplar in grouped[label])
+        marks = letter_codes[np.frombuffer(raw.encode("ascii", "replace"), dtype=np.uint8)].reshape(len(rows), count)
+        key = np.array(["ABCDE".find(cevap) if len(cevap) == 1 else -1 for _, cevap, _ in entries], dtype=np.int8)
+        # original_option[position, printed letter] -> the question's own option index
+        original_option = np.full((count, _BLANK + 1), _BLANK, dtype=np.uint8)
+        for position, (_, _, order) in enumerate(entries):
+            mapping = [ord(letter) - 65 for letter in order] if order else range(5)
+            original_option[position, :len(mapping)] = mapping
+        columns = np.array([column[soru_id] for soru_id, _, _ in entries], dtype=np.intp)
+        correct[rows[:, None], columns] = marks == key
+        chosen[rows[:, None], columns] = original_option[np.arange(count), marks]
+
+    students = len(report.students)
+    if students:
+        report.correct = correct.sum(axis=1, dtype=np.int32)
+        report.blank = (chosen == _BLANK).sum(axis=1, dtype=np.int32)
+        report.difficulty = correct.mean(axis=0)
+        ranking = np.argsort(report.correct, kind="stable")
+        group_size = max(1, int(round(students * GRADING_UPPER_LOWER_FRACTION)))
+        lower, upper = ranking[:group_size], ranking[-group_size:]
+        report.discrimination = correct[upper].mean(axis=0) - correct[lower].mean(axis=0)
+        # Item-rest correlation from one matrix-vector product: the rest score is the total
+        # minus the item itself, so its covariance with the item is cov(total, item) - var(item).
+        scores = report.correct.astype(np.float64)
+        item_variance = report.difficulty * (1 - report.difficulty)
+        total_covariance = scores @ correct / students - scores.mean() * report.difficulty
+        rest_variance = scores.var() + item_variance - 2 * total_covariance
+        with np.errstate(divide="ignore", invalid="ignore"):
+            report.item_rest = (total_covariance - item_variance) / np.sqrt(item_variance * rest_variance)
+        offsets = np.arange(count) * len(GRADING_OPTION_KEYS)
+        report.option_counts = np.stack([
+            np.bincount((offsets + chosen[group]).ravel(), minlength=count * len(GRADING_OPTION_KEYS))
+            .reshape(count, len(GRADING_OPTION_KEYS)) for group in (slice(None), upper, lower)])
+    report.seconds = time.perf_counter() - start
+    return report
+
+@metrics.timed("grade.store")
+def store_item_analysis(report):
+    """Writes the report's item statistics to soru_analizleri, replacing each question's previous
+    analysis; questions deleted since the exam was printed are skipped. Returns the rows written."""
+    rows = [row + (row[0],) for row in report.item_rows()] if report.students else []
+    try:
+        with get_pool().transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT INTO soru_analizleri({', '.join(ITEM_ANALYSIS_COLUMNS)}, analiz_zamani) "
+                f"SELECT ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP WHERE EXISTS (SELECT 1 FROM sorular WHERE id = ?) "
+                f"ON CONFLICT(soru_id) DO UPDATE SET "
+                + ", ".join(f"{name} = excluded.{name}" for name in ITEM_ANALYSIS_COLUMNS[1:] + ("analiz_zamani",)),
+                rows)
+            return conn.total_changes - before
+    except sqlite3.Error as e:
+        log.error("store_item_analysis içinde veritabanı hatası: %s", e)
+        return 0
+
+def get_item_analysis(soru_id):
+    """Returns the stored analysis of one question as {column: value} (secenek_dagilimi decoded), or None."""
+    try:
+        row = get_pool().connection().execute(
+            f"SELECT {', '.join(ITEM_ANALYSIS_COLUMNS)}, analiz_zamani FROM soru_analizleri WHERE soru_id = ?",
+            (soru_id,)).fetchone()
+    except sqlite3.Error as e:
+        log.error("get_item_analysis içinde veritabanı hatası: %s", e)
+        return None
+    if row is None:
+        return None
+    analysis = dict(zip(ITEM_ANALYSIS_COLUMNS + ("analiz_zamani",), row))
+    analysis["secenek_dagilimi"] = json.loads(analysis["secenek_dagilimi"])
+    return analysis
+
+def grade_exam(answer_key_path, answers_path, results_path=None, items_path=None, store=True, task=None):
+    """Grades an answer-sheet file against a cevap_anahtari file, optionally writes the per-student
+    results and the item analysis as CSV, and stores the item analysis per question."""
+    answer_key = load_answer_key(answer_key_path)
+    progress = (lambda fraction: task.report_progress(fraction * 0.8)) if task else (lambda fraction: None)
+    sheets = list(iter_answer_sheets(answers_path, progress))
+    if task:
+        task.check_cancelled()
+    report = grade_answer_sheets(answer_key, sheets)
+    for path, columns, rows in ((results_path, GRADING_RESULT_COLUMNS, report.student_rows),
+                                (items_path, ITEM_ANALYSIS_COLUMNS, report.item_rows)):
+        if path and report.students:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(rows())
+    if store:
+        store_item_analysis(report)
+    if task:
+        task.report_progress(1.0)
+    return report
+
+# Near-duplicate detection. A question is reduced to the 5-character shingles of its
+# normalized text and sorted options, and summarized by a one-permutation MinHash: every
+# shingle is hashed once, the top bits pick one of DUPLICATE_BINS bins and each bin keeps
+# its smallest value (empty bins borrow from the next filled one). The fraction of equal
+# bins estimates the Jaccard similarity of two shingle sets. Signatures are cut into
+# DUPLICATE_BANDS bands; questions sharing any band key are candidates, so a lookup is a
+# handful of index seeks instead of a comparison against every question.
+DUPLICATE_SHINGLE_SIZE = 5
+DUPLICATE_BINS = 64
+DUPLICATE_BANDS = 16
+DUPLICATE_THRESHOLD = 0.7
+DUPLICATE_SYNC_LIMIT = 500
+DUPLICATE_SYNC_BATCH = 2000
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_HASH_MASK = (1 << 64) - 1
+_BIN_SHIFT = 64 - (DUPLICATE_BINS.bit_length() - 1)
+_BIN_VALUE_MASK = (1 << _BIN_SHIFT) - 1
+
+def canonical_question_text(soru_metni, secenekler):
+    text = " ".join([plain_text(soru_metni or ""), *sorted(plain_text(s) for s in secenekler if s)]).casefold()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", normalize_search_text(text)))
+
+def question_signature(canonical_text):
+    encoded = canonical_text.encode()
+    shingles = {encoded[i:i + DUPLICATE_SHINGLE_SIZE]
+                for i in range(max(len(encoded) - DUPLICATE_SHINGLE_SIZE + 1, 1))}
+    # Largest first, so the last write to each bin leaves that bin's minimum.
+    hashed = sorted([(h * _HASH_MULTIPLIER) & _HASH_MASK for h in map(zlib.crc32, shingles)], reverse=True)
+    smallest = {x >> _BIN_SHIFT: x & _BIN_VALUE_MASK for x in hashed}
+    bins = [smallest.get(b) for b in range(DUPLICATE_BINS)]
+    if None not in bins:
+        return bins
+    signature = list(bins)
+    for i, value in enumerate(bins):
+        if value is None:
+            distance = 1
+            while bins[(i + distance) % DUPLICATE_BINS] is None:
+                distance += 1
+            signature[i] = bins[(i + distance) % DUPLICATE_BINS] + (distance << _BIN_SHIFT)
+    return signature
+
+def signature_band_keys(signature):
+    rows = DUPLICATE_BINS // DUPLICATE_BANDS
+    keys = []
+    for band in range(DUPLICATE_BANDS):
+        key = band + 1
+        for value in signature[band * rows:(band + 1) * rows]:
+            key = ((key ^ value) * _HASH_MULTIPLIER) & _HASH_MASK
+        keys.append(key - (1 << 64) if key >= 1 << 63 else key)
+    return keys
+
+def signature_similarity(a, b):
+    return sum(1 for x, y in zip(a, b) if x == y) / DUPLICATE_BINS
+
+def _signature_blob(signature):
+    return array("Q", signature).tobytes()
+
+def _signature_from_blob(blob):
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature
+
+def _store_signatures(conn, rows):
+    """rows: (id, soru_metni, secenek1..5, guncelleme_zamani)."""
+    entries = [(row[0], row[7], question_signature(canonical_question_text(row[1], row[2:7]))) for row in rows]
+    conn.executemany("DELETE FROM soru_lsh WHERE soru_id = ?", [(soru_id,) for soru_id, _, _ in entries])
+    conn.executemany("INSERT OR REPLACE INTO soru_imzalari(soru_id, guncelleme_zamani, imza) VALUES (?, ?, ?)",
+                     [(soru_id, updated, _signature_blob(signature)) for soru_id, updated, signature in entries])
+    conn.executemany("INSERT OR IGNORE INTO soru_lsh(anahtar, soru_id) VALUES (?, ?)",
+                     [(key, soru_id) for soru_id, _, signature in entries for key in signature_band_keys(signature)])
+
+_SIGNATURE_SOURCE_COLUMNS = "q.id, q.soru_metni, q.secenek1, q.secenek2, q.secenek3, q.secenek4, q.secenek5, q.guncelleme_zamani"
+
+def _sign_questions(conn, ids):
+    """Re-signs the given questions in the caller's transaction. The question writes and archive
+    apply call this so find_similar_questions sees them even before the next full sync has run."""
+    rows = conn.execute(f"SELECT {_SIGNATURE_SOURCE_COLUMNS} FROM sorular q WHERE q.id IN ({', '.join('?' * len(ids))})",
+                        ids).fetchall()
+    _store_signatures(conn, rows)
+
+def _sign_questions_after(conn, after_id):
+    """Signs every question with an id above after_id, in the caller's transaction; used after a
+    bulk insert, whose new ids are the ones above the max(id) taken before it."""
+    while True:
+        rows = conn.execute(f"SELECT {_SIGNATURE_SOURCE_COLUMNS} FROM sorular q WHERE q.id > ? ORDER BY q.id LIMIT ?",
+                            (after_id, DUPLICATE_SYNC_BATCH)).fetchall()
+        if not rows:
+            return
+        _store_signatures(conn, rows)
+        after_id = rows[-1][0]
+
+@metrics.timed("duplicates.sync")
+def sync_duplicate_index(max_changes=DUPLICATE_SYNC_LIMIT, full=True, task=None):
+    """Brings the signature tables up to date with sorular.
+
+    Normally only the questions named in the change log since the last sync are
+    re-signed. When the log cannot answer (too many changes, or pruned past the stored
+    cursor), a full pass re-signs every question whose signature is missing or older than
+    its guncelleme_zamani, in DUPLICATE_SYNC_BATCH-sized transactions; with full=False
+    that case returns False instead so interactive callers can leave it to the background.
+    """
+    pool = get_pool()
+    conn = pool.connection()
+    stored = conn.execute("SELECT degisiklik_imleci FROM benzerlik_durumu").fetchone()
+    change_cursor = get_change_cursor()
+    if stored and stored[0] >= change_cursor:
+        return True
+    changes = get_changes_since(stored[0], max_changes) if stored else None
+    if changes is None:
+        if not full:
+            return False
+        total = conn.execute("SELECT count(*) FROM sorular").fetchone()[0] or 1
+        last_id = done = 0
+        while True:
+            rows = conn.execute(f"""SELECT {_SIGNATURE_SOURCE_COLUMNS} FROM sorular q
+                                    LEFT JOIN soru_imzalari i ON i.soru_id = q.id
+                                    WHERE q.id > ? AND (i.soru_id IS NULL OR i.guncelleme_zamani IS NOT q.guncelleme_zamani)
+                                    ORDER BY q.id LIMIT ?""", (last_id, DUPLICATE_SYNC_BATCH)).fetchall()
+            if not rows:
+                break
+            with pool.transaction():
+                _store_signatures(conn, rows)
+            last_id = rows[-1][0]
+            done += len(rows)
+            if task:
+                task.check_cancelled()
+                task.report_progress(min(done / total, 1.0))
+    elif changes:
+        with pool.transaction():
+            _sign_questions(conn, sorted({soru_id for _, soru_id, _ in changes}))
+    with pool.transaction():
+        conn.execute("""INSERT INTO benzerlik_durumu(id, degisiklik_imleci) VALUES (1, ?)
+                        ON CONFLICT(id) DO UPDATE SET degisiklik_imleci = max(degisiklik_imleci, excluded.degisiklik_imleci)""",
+                     (change_cursor,))
+    return True
+
+@metrics.timed("duplicates.similar")
+def find_similar_questions(soru_metni, secenekler, threshold=DUPLICATE_THRESHOLD, limit=5, exclude_id=None):
+    """Returns [(soru_id, similarity), ...] best first. Syncs the index incrementally when
+    that is cheap; if a full re-index is pending the current index is used as is."""
+    try:
+        sync_duplicate_index(full=False)
+        signature = question_signature(canonical_question_text(soru_metni, secenekler))
+        keys = signature_band_keys(signature)
+        rows = get_pool().connection().execute(
+            f"""SELECT soru_id, imza FROM soru_imzalari WHERE soru_id IN
+                (SELECT soru_id FROM soru_lsh WHERE anahtar IN ({", ".join("?" * len(keys))}))""", keys).fetchall()
+    except sqlite3.Error as e:
+        log.error("find_similar_questions içinde veritabanı hatası: %s", e)
+        return []
+    matches = [(soru_id, signature_similarity(signature, _signature_from_blob(blob)))
+               for soru_id, blob in rows if soru_id != exclude_id]
+    matches = sorted((match for match in matches if match[1] >= threshold), key=lambda match: (-match[1], match[0]))
+    return matches[:limit]
+
+@metrics.timed("duplicates.groups")
+def find_duplicate_groups(threshold=DUPLICATE_THRESHOLD, task=None):
+    """Groups the whole bank into clusters of near-duplicates: [(sorted ids, lowest similarity), ...].
+
+    Only questions sharing an LSH bucket are compared, each against the bucket's first
+    member, and matching pairs are merged with union-find.
+    """
+    sync_duplicate_index(task=task)
+    conn = get_pool().connection()
+    buckets = [[int(soru_id) for soru_id in members.split(",")] for members, in conn.execute(
+        "SELECT group_concat(soru_id) FROM soru_lsh GROUP BY anahtar HAVING count(*) > 1")]
+    signatures = {}
+    needed = sorted({soru_id for bucket in buckets for soru_id in bucket})
+    for start in range(0, len(needed), 500):
+        chunk = needed[start:start + 500]
+        for soru_id, blob in conn.execute(f"SELECT soru_id, imza FROM soru_imzalari WHERE soru_id IN "
+                                          f"({', '.join('?' * len(chunk))})", chunk):
+            signatures[soru_id] = _signature_from_blob(blob)
+    parent = {}
+    def root(soru_id):
+        while parent.get(soru_id, soru_id) != soru_id:
+            soru_id = parent[soru_id]
+        return soru_id
+    lowest = {}
+    checked = set()
+    for bucket in buckets:
+        anchor = bucket[0]
+        for other in bucket[1:]:
+            pair = (min(anchor, other), max(anchor, other))
+            if pair in checked or anchor not in signatures or other not in signatures:
+                continue
+            checked.add(pair)
+            similarity = signature_similarity(signatures[anchor], signatures[other])
+            if similarity >= threshold:
+                a, b = root(anchor), root(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+                lowest[pair] = similarity
+    groups = {}
+    for (a, b), similarity in lowest.items():
+        members, group_lowest = groups.get(root(a), (set(), 1.0))
+        members.update((a, b))
+        groups[root(a)] = (members, min(group_lowest, similarity))
+    return sorted(((sorted(members), similarity) for members, similarity in groups.values()),
+                  key=lambda group: (-len(group[0]), group[0][0]))
+
+def format_duplicate_report(groups, limit=None):
+    rows = get_questions_by_ids(soru_id for ids, _ in groups[:limit] for soru_id in ids)
+    lines = []
+    for number, (ids, similarity) in enumerate(groups[:limit], start=1):
+        lines.append(f"Grup {number} ({len(ids)} soru, en düşük benzerlik %{similarity * 100:.0f}):")
+        for soru_id in ids:
+            text = rows[soru_id][1] if soru_id in rows else ""
+            lines.append(f"  ID {soru_id}: {text[:90]}{'...' if len(text) > 90 else ''}")
+    return "\n".join(lines)
+
+# Rich text and attachments. A field is rich text when it starts with RICH_TEXT_PREFIX; the rest
+# is a Qt rich text fragment (b, i, u, sup, sub, br, img), so plain fields, which are nearly all
+# of them, stay as they are and cost nothing extra to read. Images are kept out of the rows in
+# `ekler`, content-addressed and deduplicated: the same figure used by a hundred questions is
+# stored once, and printing decodes it once however many questions show it.
+RICH_TEXT_PREFIX = "<qt>"
+ATTACHMENT_URL_SCHEME = "ek"
+MAX_ATTACHMENT_BYTES = 3 * 1024 * 1024  # still fits the server's request body once base64-encoded
+ATTACHMENT_TYPES = ((b"\x89PNG\r\n\x1a\n", "image/png"), (b"\xff\xd8\xff", "image/jpeg"), (b"GIF87a", "image/gif"),
+                    (b"GIF89a", "image/gif"), (b"BM", "image/bmp"))
+_ATTACHMENT_REF_RE = re.compile(r"""<img\b[^>]*\bsrc=["']ek:([0-9a-f]{64})["']""")
+_IMAGE_TAG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_LINE_BREAK_TAG_RE = re.compile(r"<br\s*/?>|</p>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+def is_rich_text(text):
+    return bool(text) and text.startswith(RICH_TEXT_PREFIX)
+
+def plain_text(text):
+    """Rich text without its markup (an image reads as [resim]), for the list, duplicates and
+    search snippets; plain text is returned as it is."""
+    if not is_rich_text(text):
+        return text
+    text = _LINE_BREAK_TAG_RE.sub(" ", _IMAGE_TAG_RE.sub("[resim]", text))
+    return " ".join(html.unescape(_TAG_RE.sub("", text)).split())
+
+def attachment_refs(text):
+    """The attachment digests a field's images refer to, in order of appearance."""
+    return _ATTACHMENT_REF_RE.findall(text) if is_rich_text(text) else []
+
+def attachment_url(ozet):
+    return f"{ATTACHMENT_URL_SCHEME}:{ozet}"
+
+def attachment_type(data):
+    for magic, tur in ATTACHMENT_TYPES:
+        if data.startswith(magic):
+            return tur
+    return None
+
+def add_attachment(data):
+    """Stores image bytes unless the same bytes are already stored; returns their digest."""
+    if len(data) > MAX_ATTACHMENT_BYTES:
+        raise ValueError(f"Resim çok büyük ({len(data) / 1024 / 1024:.1f} MB, en çok "
+                         f"{MAX_ATTACHMENT_BYTES // 1024 // 1024} MB).")
+    tur = attachment_type(data)
+    if tur is None:
+        raise ValueError("Desteklenmeyen resim türü (PNG, JPEG, GIF veya BMP olmalı).")
+    ozet = hashlib.sha256(data).hexdigest()
+    with get_pool().transaction() as conn:
+        conn.execute("INSERT OR IGNORE INTO ekler(ozet, tur, boyut, veri) VALUES (?, ?, ?, ?)",
+                     (ozet, tur, len(data), data))
+    return ozet
+
+def add_attachment_file(path):
+    with open(path, "rb") as f:
+        return add_attachment(f.read())
+
+def get_attachment(ozet):
+    """(type, bytes) of a stored attachment, or None."""
+    row = get_pool().connection().execute("SELECT tur, veri FROM ekler WHERE ozet = ?", (ozet,)).fetchone()
+    return (row[0], bytes(row[1])) if row else None
+
+def get_attachments(ozetler):
+    """{digest: (type, bytes)} of the stored attachments among ozetler."""
+    conn, ozetler, attachments = get_pool().connection(), list(ozetler), {}
+    for start in range(0, len(ozetler), 500):
+        chunk = ozetler[start:start + 500]
+        for ozet, tur, veri in conn.execute(f"SELECT ozet, tur, veri FROM ekler WHERE ozet IN ({', '.join('?' * len(chunk))})",
+                                            chunk):
+            attachments[ozet] = (tur, bytes(veri))
+    return attachments
+
+def _referenced_attachments(conn):
+    used = set()
+    for row in conn.execute("SELECT soru_metni, secenek1, secenek2, secenek3, secenek4, secenek5 FROM sorular "
+                            "UNION ALL SELECT metin, NULL, NULL, NULL, NULL, NULL FROM secenekler WHERE sira >= 5"):
+        for text in row:
+            used.update(attachment_refs(text))
+    return used
+
+def prune_attachments():
+    """Deletes the stored images no question refers to any more; returns (count, bytes) freed."""
+    with get_pool().transaction() as conn:
+        used = _referenced_attachments(conn)
+        unused = [(ozet, boyut) for ozet, boyut in conn.execute("SELECT ozet, boyut FROM ekler") if ozet not in used]
+        conn.executemany("DELETE FROM ekler WHERE ozet = ?", [(ozet,) for ozet, _ in unused])
+    return len(unused), sum(boyut for _, boyut in unused)
+
+
+# Backups and archives. backup_db() copies the live file with SQLite's online backup API
+# through its own read-only connection, so the GUI and the server keep writing while it runs.
+# An archive is a compressed JSONL stream (gzip, or zstd with the zstandard package): a header
+# naming the source bank and the change log range it covers, one line per question (with a
+# content digest) or deleted id, each question preceded by the images it uses that the archive
+# does not hold yet, and a manifest line with the counts and the SHA-256 of every line before it. A full archive holds the whole bank; an incremental one only the questions
+# changed since the previous archive, read from sorular_changelog, so keeping another machine
+# in sync moves kilobytes. Applying one adds the source's questions under local ids recorded in
+# arsiv_kaynaklari and updates or deletes only those, so the receiving bank keeps its own
+# questions; edits to a synced question are overwritten by the source's next change to it.
+BACKUP_PAGES_PER_STEP = 1024
+ARCHIVE_FORMAT = "soru_bankasi_arsivi"
+ARCHIVE_FORMAT_VERSION = 2  # v2 added the image ("ek") lines
+ARCHIVE_FILE_TYPES = (".jsonl.gz", ".jsonl.zst")
+ARCHIVE_GZIP_LEVEL = 6
+ARCHIVE_ZSTD_LEVEL = 3
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_UPDATE_SQL = f"UPDATE sorular SET ({QUESTION_CONTENT_COLUMNS}) = (?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9) WHERE id = ?1"
+
+def get_bank_info(key, conn=None):
+    conn = conn or get_pool().connection()
+    row = conn.execute("SELECT deger FROM banka_bilgisi WHERE anahtar = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def _set_bank_info(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO banka_bilgisi(anahtar, deger) VALUES (?, ?)", (key, str(value)))
+
+def reset_bank_identity():
+    """Gives this bank a new banka_kimligi and forgets its archive cursors; returns the new id.
+
+    A bank copied as a file (a .db copied to another machine, a restored backup) carries its
+    source's id, and two banks with one id refuse each other's archives. The questions it holds
+    of its own are recorded as applied from the old id, up to the current change cursor, so
+    archives from the bank it was copied from keep updating them rather than adding them again.
+    The next archive written here is a full one.
+    """
+    bank_id = uuid.uuid4().hex
+    with get_pool().transaction() as conn:
+        old_id = get_bank_info("banka_kimligi", conn)
+        conn.execute("DELETE FROM banka_bilgisi WHERE anahtar = 'son_arsiv_seq' OR anahtar LIKE 'arsiv:%'")
+        conn.execute("""INSERT OR IGNORE INTO arsiv_kaynaklari(banka, kaynak_id, soru_id)
+                        SELECT ?, id, id FROM sorular WHERE id NOT IN (SELECT soru_id FROM arsiv_kaynaklari)""",
+                     (old_id,))
+        _set_bank_info(conn, f"arsiv:{old_id}", get_change_cursor())
+        _set_bank_info(conn, "banka_kimligi", bank_id)
+    return bank_id
+
+def _report_step(task, done, total):
+    if task:
+        task.check_cancelled()
+        task.report_progress(done / total if total else 1.0)
+
+def _backup_pages(source, target, task, pages):
+    source.execute("PRAGMA busy_timeout=5000")
+    source.backup(target, pages=pages,
+                  progress=lambda status, remaining, total: _report_step(task, total - remaining, total))
+
+def _read_only_uri(path):
+    return f"{pathlib.Path(path).resolve().as_uri()}?mode=ro"
+
+@metrics.timed("backup")
+def backup_db(path, task=None, pages=BACKUP_PAGES_PER_STEP):
+    """Writes a consistent copy of the live database to path; returns its size in bytes.
+
+    Pages are copied `pages` at a time; a commit from another connection in between makes
+    SQLite restart the copy, so the result is always one snapshot. The copy goes to a
+    temporary file that replaces path only when complete, in rollback journal mode so it is
+    a single self-contained file.
+    """
+    temporary_path = f"{path}.tmp"
+    source = sqlite3.connect(_read_only_uri(DB_NAME), uri=True)
+    target = sqlite3.connect(temporary_path)
+    try:
+        _backup_pages(source, target, task, pages)
+        target.execute("PRAGMA journal_mode=DELETE")
+        target.close()
+    except BaseException:
+        target.close()
+        os.remove(temporary_path)
+        raise
+    finally:
+        source.close()
+    os.replace(temporary_path, path)
+    return os.path.getsize(path)
+
+@metrics.timed("restore")
+def restore_db(path, task=None, pages=BACKUP_PAGES_PER_STEP):
+    """Replaces the live database with the bank in path (a backup_db() copy) and migrates it.
+
+    The file is checked before anything is touched. The pool and the question cache are then
+    closed (close_db), so other threads must not be using the database, and the pages are
+    copied in with the backup API: writing through SQLite keeps the live file's WAL consistent,
+    which copying the file over it would not, and a cancelled restore rolls back to the old
+    bank. The restored bank gets a new identity (reset_bank_identity), since the backup may
+    also have seeded another machine. Returns the restored question count.
+    """
+    source = sqlite3.connect(_read_only_uri(path), uri=True)
+    try:
+        try:
+            check = source.execute("PRAGMA quick_check").fetchone()[0]
+            is_bank = source.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sorular'").fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{path} bir soru bankası veritabanı değil: {e}")
+        if check != "ok" or not is_bank:
+            raise ValueError(f"{path} bir soru bankası veritabanı değil ya da bozuk ({check}).")
+        close_db()
+        target = sqlite3.connect(DB_NAME)
+        try:
+            _backup_pages(source, target, task, pages)
+        finally:
+            target.close()
+            init_db()
+        reset_bank_identity()
+    finally:
+        source.close()
+    return count_questions()
+
+
+class ArchiveReport:
+    def __init__(self, path):
+        self.path = path
+        self.bank_id = None
+        self.full = True
+        self.base_seq = None
+        self.end_seq = 0
+        self.questions = 0
+        self.deleted = 0
+        self.attachments = 0
+        self.added = 0
+        self.unchanged = 0
+        self.bytes = 0
+        self.dry_run = False
+
+    def summary(self):
+        kind = "Tam arşiv" if self.full else f"Artımlı arşiv ({self.base_seq} -> {self.end_seq})"
+        text = f"{kind}: {self.questions} soru, {self.deleted} silinen"
+        if self.attachments:
+            text += f", {self.attachments} resim"
+        if self.added:
+            text += f" ({self.added} soru yeni eklendi)"
+        if self.unchanged:
+            text += f" ({self.unchanged} soru zaten günceldi)"
+        text = f"{text}, {self.bytes / 1024:.1f} KB."
+        return f"Deneme, bankada bir şey değiştirilmedi. {text}" if self.dry_run else text
+
+
+def _archive_stream(path, file, mode):
+    """Binary stream over the uncompressed content of file ("rb"/"wb"), compressed as path's extension says.
+    Closing it does not close file."""
+    lowered = path.lower()
+    if lowered.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd arşivleri için zstandard gerekli (pip install zstandard).")
+        if mode == "w":
+            compressor = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL, write_checksum=True)
+            return compressor.stream_writer(file, closefd=False)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(file, closefd=False))
+    if lowered.endswith(".gz"):
+        return gzip.GzipFile(fileobj=file, mode=mode + "b", compresslevel=ARCHIVE_GZIP_LEVEL)
+    raise ValueError(f"Desteklenmeyen arşiv türü: {path} ({', '.join(ARCHIVE_FILE_TYPES)})")
+
+def _archive_read_errors(path):
+    """What reading a truncated or damaged archive of this type raises."""
+    errors = (EOFError, OSError, zlib.error)
+    if path.lower().endswith(".zst"):
+        import zstandard
+        errors += (zstandard.ZstdError,)
+    return errors
+
+def archive_digest(question):
+    """Content hash of an archived question: text, options, answer and category, not its id."""
+    payload = json.dumps([question["soru_metni"], question["secenekler"], question["dogru_secenek_index"],
+                          question["kategori"]], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def _archive_questions(conn, rows):
+    """question_to_dict() of QUESTION_COLUMNS rows, with any options past the fifth appended and the digest added."""
+    extra = {}
+    ids = [row[0] for row in rows]
+    if ids:
+        for soru_id, sira, metin in conn.execute(f"SELECT soru_id, sira, metin FROM secenekler "
+                                                 f"WHERE sira >= 5 AND soru_id IN ({', '.join('?' * len(ids))})", ids):
+            extra.setdefault(soru_id, {})[sira] = metin
+    questions = []
+    for row in rows:
+        question = question_to_dict(row)
+        options = extra.get(row[0])
+        if options:
+            question["secenekler"] += [options.get(sira, "") for sira in range(5, max(options) + 1)]
+        question["ozet"] = archive_digest(question)
+        questions.append(question)
+    return questions
+
+def _add_archive_origins(conn, questions):
+    """Adds "kaynak": [bank id, id there] to the questions this bank got from another one, so a
+    question that travels back to its source, or on to a bank that has it from there, is matched."""
+    ids = [question["id"] for question in questions]
+    origins = {}
+    if ids:
+        origins = {soru_id: [banka, kaynak_id] for soru_id, banka, kaynak_id in conn.execute(
+            f"SELECT soru_id, banka, kaynak_id FROM arsiv_kaynaklari WHERE soru_id IN ({', '.join('?' * len(ids))})", ids)}
+    for question in questions:
+        if question["id"] in origins:
+            question["kaynak"] = origins[question["id"]]
+    return questions
+
+def _question_attachments(question):
+    return [ozet for text in (question["soru_metni"], *question["secenekler"]) for ozet in attachment_refs(text or "")]
+
+def _archive_batches(conn, changed_ids):
+    """Yields (QUESTION_COLUMNS rows, ids deleted since the base, ids read) per batch, plus the total id count first."""
+    if changed_ids is None:
+        yield conn.execute("SELECT count(*) FROM sorular").fetchone()[0]
+        cursor = conn.execute(SELECT_ALL_QUESTIONS_SQL)
+        for rows in iter(lambda: cursor.fetchmany(ARCHIVE_BATCH_SIZE), []):
+            yield rows, [], len(rows)
+        return
+    yield len(changed_ids)
+    for start in range(0, len(changed_ids), ARCHIVE_BATCH_SIZE):
+        ids = changed_ids[start:start + ARCHIVE_BATCH_SIZE]
+        found = _read_questions_by_ids(conn, ids)
+        yield [found[soru_id] for soru_id in ids if soru_id in found], [i for i in ids if i not in found], len(ids)
+
+@metrics.timed("archive.write")
+def write_archive(path, incremental=False, task=None):
+    """Writes the bank (or, with incremental, what changed since the previous archive) to path.
+
+    Rows and the change log cursor are read in one transaction, so the archive is a
+    snapshot. An incremental archive falls back to a full one when there is no previous
+    archive or the change log no longer reaches back to it. Returns an ArchiveReport.
+    """
+    report = ArchiveReport(path)
+    pool = get_pool()
+    conn = pool.connection()
+    temporary_path = f"{path}.tmp"
+    with pool.transaction():
+        report.bank_id = get_bank_info("banka_kimligi", conn)
+        report.end_seq = get_change_cursor()
+        changed_ids = None
+        base_seq = get_bank_info("son_arsiv_seq", conn) if incremental else None
+        if incremental and base_seq is None:
+            log.info("Önceki arşiv yok; tam arşiv yazılıyor.")
+        elif incremental and not _change_log_covers(conn, int(base_seq)):
+            log.warning("Değişiklik günlüğü son arşive (%s) kadar uzanmıyor; tam arşiv yazılıyor.", base_seq)
+        elif incremental:
+            report.full, report.base_seq = False, int(base_seq)
+            changed_ids = [row[0] for row in conn.execute(
+                "SELECT DISTINCT soru_id FROM sorular_changelog WHERE seq > ? ORDER BY soru_id", (report.base_seq,))]
+        header = {"tur": ARCHIVE_FORMAT, "surum": ARCHIVE_FORMAT_VERSION, "banka": report.bank_id,
+                  "temel": report.base_seq, "son": report.end_seq, "sema": SCHEMA_VERSION,
+                  "olusturma": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        digest = hashlib.sha256()
+        try:
+            with open(temporary_path, "wb") as file, _archive_stream(path, file, "w") as stream:
+                def write(record):
+                    line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                    digest.update(line)
+                    stream.write(line)
+
+                write(header)
+                batches = _archive_batches(conn, changed_ids)
+                total, done, written_attachments = next(batches), 0, set()
+                for rows, deleted_ids, read in batches:
+                    for soru_id in deleted_ids:
+                        write({"silinen": soru_id})
+                    for question in _add_archive_origins(conn, _archive_questions(conn, rows)):
+                        for ozet in _question_attachments(question):
+                            if ozet in written_attachments:
+                                continue
+                            written_attachments.add(ozet)
+                            row = conn.execute("SELECT tur, veri FROM ekler WHERE ozet = ?", (ozet,)).fetchone()
+                            if row is None:
+                                log.warning("Soru %s içindeki resim (%s) bankada yok; arşive yazılmadı.",
+                                            question["id"], ozet)
+                                continue
+                            write({"ek": ozet, "tur": row[0], "veri": base64.b64encode(row[1]).decode("ascii")})
+                            report.attachments += 1
+                        write(question)
+                    report.questions += len(rows)
+                    report.deleted += len(deleted_ids)
+                    done += read
+                    _report_step(task, done, total)
+                manifest = {"sorular": report.questions, "silinen": report.deleted, "ekler": report.attachments,
+                            "sha256": digest.hexdigest()}
+                stream.write(json.dumps({"manifest": manifest}).encode("utf-8") + b"\n")
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+    os.replace(temporary_path, path)
+    with pool.transaction():
+        _set_bank_info(conn, "son_arsiv_seq", report.end_seq)
+    report.bytes = os.path.getsize(path)
+    metrics.count("archive.bytes", report.bytes)
+    return report
+
+def _parse_archive_header(line):
+    if not line:
+        raise ValueError("Arşiv boş ya da başı okunamadı (dosya yarım kalmış olabilir).")
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("tur") != ARCHIVE_FORMAT:
+        raise ValueError("Dosya bir soru bankası arşivi değil.")
+    if header.get("surum", 0) > ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Arşiv biçimi (v{header['surum']}) bu sürümden yeni.")
+    return header
+
+def read_archive_header(path):
+    """The header of an archive (source bank, change log range) without reading the rest."""
+    with open(path, "rb") as file, _archive_stream(path, file, "r") as stream:
+        return _parse_archive_header(stream.readline())
+
+def _archive_local_ids(conn, bank_id, source_ids):
+    """{source question id: local id} for the given questions of bank_id applied here before."""
+    source_ids = list(source_ids)
+    local_ids = {}
+    for start in range(0, len(source_ids), 500):
+        chunk = source_ids[start:start + 500]
+        local_ids.update(conn.execute(f"SELECT kaynak_id, soru_id FROM arsiv_kaynaklari WHERE banka = ? AND "
+                                      f"kaynak_id IN ({', '.join('?' * len(chunk))})", (bank_id, *chunk)))
+    return local_ids
+
+def _apply_archive_batch(conn, questions, report):
+    """Writes the archived questions whose digest differs from their local copy. A question not
+    applied from this source before is matched by its origin ("kaynak": this bank's own question,
+    or one applied here from that bank), or else added under a new local id and recorded in
+    arsiv_kaynaklari."""
+    local_ids = _archive_local_ids(conn, report.bank_id, [q["id"] for q in questions])
+    own_id = get_bank_info("banka_kimligi", conn)
+    for question in questions:
+        if question["id"] not in local_ids and question.get("kaynak"):
+            banka, kaynak_id = question["kaynak"]
+            soru_id = kaynak_id if banka == own_id else _archive_local_ids(conn, banka, [kaynak_id]).get(kaynak_id)
+            if soru_id is not None:
+                local_ids[question["id"]] = soru_id
+    local = {question["id"]: question["ozet"] for question in
+             _archive_questions(conn, list(_read_questions_by_ids(conn, local_ids.values()).values()))}
+    changed = [question for question in questions if local.get(local_ids.get(question["id"])) != question["ozet"]]
+    report.questions += len(questions)
+    report.unchanged += len(questions) - len(changed)
+    conn.executemany(INSERT_CATEGORY_SQL, {(q["kategori"],) for q in changed if q["kategori"] is not None})
+    written = []
+    for question in changed:
+        soru_id = local_ids.get(question["id"])
+        if soru_id in local:
+            conn.execute(ARCHIVE_UPDATE_SQL, (soru_id, *question_from_dict(question)[1:]))
+            conn.execute("DELETE FROM secenekler WHERE soru_id = ? AND sira >= 5", (soru_id,))
+        else:
+            soru_id = conn.execute(INSERT_QUESTION_SQL, question_from_dict(question)[1:]).lastrowid
+            conn.execute("INSERT OR REPLACE INTO arsiv_kaynaklari(banka, kaynak_id, soru_id) VALUES (?, ?, ?)",
+                         (report.bank_id, question["id"], soru_id))
+            report.added += 1
+        conn.executemany("INSERT INTO secenekler(soru_id, sira, metin) VALUES (?, ?, ?)",
+                         [(soru_id, sira, metin) for sira, metin in enumerate(question["secenekler"])
+                          if sira >= 5 and metin])
+        written.append(soru_id)
+    if written:
+        _sign_questions(conn, written)
+
+def _apply_archive_lines(conn, stream, file, total_bytes, report, task, mirror):
+    """Reads and applies the header and records; returns (manifest or None, source ids seen, deleted
+    records read). The manifest is only returned once its SHA-256 matches the lines before it."""
+    header_line = stream.readline()
+    header = _parse_archive_header(header_line)
+    report.bank_id, report.base_seq, report.end_seq = header["banka"], header["temel"], header["son"]
+    report.full = report.base_seq is None
+    if report.bank_id == get_bank_info("banka_kimligi", conn):
+        raise ValueError("Bu arşiv bu bankadan alınmış; kendi üzerine uygulanamaz.")
+    if mirror and not report.full:
+        raise ValueError("Bankayı kaynağın aynısı yapmak (yansıtma) için tam arşiv gerekir.")
+    applied_seq = get_bank_info(f"arsiv:{report.bank_id}", conn)
+    if not report.full and (applied_seq is None or int(applied_seq) < report.base_seq):
+        applied = "hiç arşiv uygulanmamış" if applied_seq is None else f"{applied_seq} noktasına kadarı uygulanmış"
+        raise ValueError(f"Bu artımlı arşiv kaynağın {report.base_seq} noktasından başlıyor; bu bankaya o "
+                         f"kaynaktan {applied}. Önce aradaki arşivleri ya da bir tam arşivi uygulayın.")
+    digest = hashlib.sha256(header_line)
+    seen_ids, batch, manifest, deleted_records = set(), [], None, 0
+    for line_no, line in enumerate(stream, start=2):
+        record = json.loads(line)
+        if manifest is not None:
+            raise ValueError("Arşivde manifest satırından sonra veri var.")
+        if "manifest" in record:
+            manifest = record["manifest"]
+            if manifest.get("sha256") != digest.hexdigest():
+                raise ValueError("Arşivin SHA-256 özeti manifestle uyuşmuyor; dosya bozuk.")
+            continue
+        digest.update(line)
+        if "ek" in record:
+            data = base64.b64decode(record["veri"])
+            if hashlib.sha256(data).hexdigest() != record["ek"]:
+                raise ValueError(f"Arşiv satırı {line_no}: resmin özeti tutmuyor.")
+            conn.execute("INSERT OR IGNORE INTO ekler(ozet, tur, boyut, veri) VALUES (?, ?, ?, ?)",
+                         (record["ek"], record["tur"], len(data), data))
+            report.attachments += 1
+            continue
+        if "silinen" in record:
+            deleted_records += 1
+            local_ids = _archive_local_ids(conn, report.bank_id, [record["silinen"]])
+            if local_ids:
+                report.deleted += conn.execute("DELETE FROM sorular WHERE id = ?", (local_ids[record["silinen"]],)).rowcount
+            continue
+        if archive_digest(record) != record["ozet"]:
+            raise ValueError(f"Arşiv satırı {line_no}: içerik özeti tutmuyor.")
+        batch.append(record)
+        seen_ids.add(record["id"])
+        if len(batch) >= ARCHIVE_BATCH_SIZE:
+            _apply_archive_batch(conn, batch, report)
+            batch = []
+            _report_step(task, file.tell(), total_bytes)
+    _apply_archive_batch(conn, batch, report)
+    return manifest, seen_ids, deleted_records
+
+class _ArchiveDryRun(Exception):
+    """Rolls back a dry run's transaction once the archive has been applied."""
+
+@metrics.timed("archive.apply")
+def apply_archive(path, task=None, mirror=False, dry_run=False):
+    """Brings this bank up to date with an archive written by another bank.
+
+    Questions are matched to the ones applied from the same source before (arsiv_kaynaklari),
+    never by local id: new ones are added, changed ones rewritten, and the ones the source
+    deleted are deleted here. A full archive also deletes the questions applied from that source
+    that it no longer holds; with mirror it deletes every other question too, this bank's own
+    included, leaving a copy of the source. Everything runs in one transaction that commits only
+    once the manifest's counts and SHA-256 match what was read, so a truncated or corrupted
+    archive changes nothing; dry_run rolls it back in any case, so the report tells what applying
+    would do. An incremental archive needs the archives before it (or a full one) applied first.
+    Returns an ArchiveReport.
+    """
+    report = ArchiveReport(path)
+    report.dry_run = dry_run
+    pool = get_pool()
+    conn = pool.connection()
+    total_bytes = os.path.getsize(path)
+    try:
+        with open(path, "rb") as file, _archive_stream(path, file, "r") as stream, pool.transaction():
+            try:
+                manifest, seen_ids, deleted_records = _apply_archive_lines(conn, stream, file, total_bytes, report,
+                                                                           task, mirror)
+            except (KeyError, TypeError, binascii.Error) as e:
+                raise ValueError(f"Arşivde geçersiz kayıt: {e!r}")
+            except _archive_read_errors(path) as e:
+                raise ValueError(f"Arşiv okunamadı (dosya yarım ya da bozuk): {e}")
+            if manifest is None:
+                raise ValueError("Arşiv eksik: manifest satırı yok (dosya yarım kalmış olabilir).")
+            if ((manifest.get("sorular"), manifest.get("silinen"), manifest.get("ekler", 0))
+                    != (report.questions, deleted_records, report.attachments)):
+                raise ValueError("Arşiv manifesti içerikle uyuşmuyor; dosya bozuk.")
+            if report.full:
+                sources = dict(conn.execute("SELECT kaynak_id, soru_id FROM arsiv_kaynaklari WHERE banka = ?",
+                                            (report.bank_id,)))
+                if mirror:
+                    kept = {sources[soru_id] for soru_id in seen_ids}
+                    stale = [(row[0],) for row in conn.execute("SELECT id FROM sorular") if row[0] not in kept]
+                else:
+                    stale = [(soru_id,) for kaynak_id, soru_id in sources.items() if kaynak_id not in seen_ids]
+                conn.executemany("DELETE FROM sorular WHERE id = ?", stale)
+                report.deleted += len(stale)
+            _set_bank_info(conn, f"arsiv:{report.bank_id}", report.end_seq)
+            if dry_run:
+                raise _ArchiveDryRun()
+    except _ArchiveDryRun:
+        pass
+    else:
+        prune_change_log()
+    report.bytes = total_bytes
+    return report
@@ -0,0 +1,184 @@
+"""Instrumentation for Mini Soru Bankası: timing spans, counters, log setup and a cProfile hook.
+
+Qt-free and dependency-free, so the data layer, the server and the GUI all report into the
+same recorder. Spans and counters are recorded only while tracing is on (enable(), the
+SORU_BANKASI_TRACE environment variable, the CLI's --trace or the Performans dialog).
+When it is off span() hands back one shared no-op context manager and timed() functions
+pay a single global check, so the hooks can stay on hot paths. Log messages go through
+the "soru_bankasi" logger with lazy %-arguments, so a filtered-out message is never
+formatted.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+log = logging.getLogger("soru_bankasi")
+
+LOG_LEVELS = ("debug", "info", "warning", "error", "off")
+DEFAULT_LOG_LEVEL = "info"
+SPAN_SAMPLES = 1024  # recent durations kept per span name for the percentiles
+
+_enabled = False
+_lock = threading.Lock()
+_samples = {}   # name -> deque of recent durations in ns
+_totals = {}    # name -> [count, total ns, max ns] since the last reset
+_counters = {}
+_listeners = []
+_NO_SPAN = nullcontext()
+
+
+def configure_logging(level=None, stream=None):
+    """Sends the soru_bankasi logger to stream (stderr) at level; None reads SORU_BANKASI_LOG."""
+    level = (level or os.environ.get("SORU_BANKASI_LOG") or DEFAULT_LOG_LEVEL).lower()
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Geçersiz günlük düzeyi: {level} ({', '.join(LOG_LEVELS)})")
+    for handler in [handler for handler in log.handlers if getattr(handler, "_soru_bankasi", False)]:
+        log.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    handler._soru_bankasi = True
+    log.addHandler(handler)
+    log.setLevel(logging.CRITICAL + 1 if level == "off" else getattr(logging, level.upper()))
+    log.propagate = False
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+        _counters.clear()
+
+
+def _record(name, elapsed_ns):
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=SPAN_SAMPLES)
+            _totals[name] = [0, 0, 0]
+        samples.append(elapsed_ns)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += elapsed_ns
+        if elapsed_ns > totals[2]:
+            totals[2] = elapsed_ns
+    for listener in _listeners:
+        listener(name, elapsed_ns)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+def span(name):
+    """Context manager timing its block under name while tracing is on."""
+    return _Span(name) if _enabled else _NO_SPAN
+
+def timed(name):
+    """Decorator form of span() for plain functions (a generator would only time its creation)."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+def count(name, value=1):
+    """Adds value to a counter (rows, bytes, cache hits...) while tracing is on."""
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+
+
+def add_span_listener(listener):
+    """Tracing hook: listener(name, elapsed_ns) is called after every recorded span, on the
+    thread that ran it; use it to forward spans to an external tracer or a live log."""
+    _listeners.append(listener)
+
+def remove_span_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def span_statistics():
+    """[(name, count, total ms, p50 ms, p95 ms, max ms)] sorted by total time; the
+    percentiles cover the last SPAN_SAMPLES runs of each span, the rest everything since reset()."""
+    with _lock:
+        snapshot = [(name, list(samples), list(_totals[name])) for name, samples in _samples.items()]
+    rows = []
+    for name, samples, (total_count, total_ns, max_ns) in snapshot:
+        samples.sort()
+        rows.append((name, total_count, total_ns / 1e6, _percentile(samples, 0.5) / 1e6,
+                     _percentile(samples, 0.95) / 1e6, max_ns / 1e6))
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+def counter_values():
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+def format_report(statistics=None, counters=None):
+    """The span table and counters (by default this process's) as plain text, for the CLI and logs."""
+    statistics = span_statistics() if statistics is None else statistics
+    counters = counter_values() if counters is None else counters
+    lines = [f"{'Ölçüm':<28} {'Sayı':>7} {'Toplam ms':>11} {'p50 ms':>9} {'p95 ms':>9} {'En çok ms':>10}"]
+    lines += [f"{name:<28} {total_count:>7} {total_ms:>11.1f} {p50:>9.3f} {p95:>9.3f} {max_ms:>10.3f}"
+              for name, total_count, total_ms, p50, p95, max_ms in statistics]
+    if counters:
+        lines.append("Sayaçlar: " + "  ".join(f"{name}={value:,}" for name, value in counters.items()))
+    return "\n".join(lines)
+
+
+@contextmanager
+def profiling(path=None, limit=30):
+    """Runs the block under cProfile (calling thread only). The stats are dumped to path for
+    pstats/snakeviz, or, without a path, the top `limit` functions by cumulative time go to the log."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+            log.info("cProfile çıktısı yazıldı: %s", path)
+        else:
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+            log.info("cProfile özeti:\n%s", report.getvalue())
+
+
+if os.environ.get("SORU_BANKASI_TRACE", "").lower() in ("1", "true", "yes", "evet"):
+    enable()
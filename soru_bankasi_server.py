@@ -0,0 +1,464 @@
+"""Local HTTP/JSON server that lets several Mini Soru Bankası clients share one database.
+
+SQLite over a shared folder is unsafe with writers on several machines, so the server
+owns the database file instead: every write goes through one writer thread, and reads
+run on a small thread pool of their own connections (WAL lets them proceed while the
+writer commits). Writes that arrive while the writer is busy are committed together in
+one transaction, each inside its own savepoint so a failing request only undoes itself.
+
+Responses that depend only on the question table carry an ETag built from the change
+log cursor; a client repeating a request with If-None-Match gets 304 without the query
+being run. Started with `soru_bankasi_cli.py serve`.
+"""
+import asyncio
+import base64
+import binascii
+import json
+import random
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+import soru_bankasi_core
+import soru_bankasi_metrics as metrics
+from soru_bankasi_metrics import log
+from soru_bankasi_core import (DUPLICATE_THRESHOLD, QUESTION_SORT_COLUMNS, QuestionFilter, add_attachment,
+                               add_question_to_db, answer_key_rows, booklet_label, build_booklet, count_questions, delete_question,
+                               draw_exam_questions, find_similar_questions, get_category_counts, get_change_cursor,
+                               get_attachment, get_pool, get_statistics, get_questions_by_ids, get_questions_page, get_schema_version,
+                               load_question_changes, load_question_snapshot, question_from_record, question_to_dict,
+                               search_questions, sync_duplicate_index, update_question, validate_question)
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_READERS = 4
+MAX_WRITE_BATCH = 64
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_REQUESTS = 500
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params, name, default, low=0, high=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' bir tam sayı olmalı.")
+    if value < low or (high is not None and value > high):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' {low}..{high if high is not None else ''} aralığında olmalı.")
+    return value
+
+def _sort_params(params):
+    sort = params.get("sort", "id")
+    if sort == "alaka":
+        return None, False
+    if sort not in QUESTION_SORT_COLUMNS:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Geçersiz sıralama: {sort}")
+    return QUESTION_SORT_COLUMNS.index(sort), params.get("desc") in ("1", "true")
+
+def _question_filter(request):
+    """The QuestionFilter of a list request: q, repeated kategori, min_id, max_id, bos_secenek."""
+    try:
+        return QuestionFilter.from_params(request["query"])
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "'min_id' ve 'max_id' tam sayı olmalı.")
+
+def _question_args(body):
+    """Validates a question body (same keys as the JSONL import) into add_question_to_db arguments."""
+    if not isinstance(body, dict):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Gövde bir JSON nesnesi olmalı.")
+    soru_metni, secenekler, dogru_secenek_index, kategori = question_from_record(body)
+    error = validate_question(soru_metni, secenekler, dogru_secenek_index)
+    if error:
+        raise HttpError(HTTPStatus.BAD_REQUEST, error)
+    return soru_metni, secenekler, dogru_secenek_index, kategori
+
+def _read_unless_current(etag, func, *args):
+    """Runs func in a read transaction unless the client's ETag still matches; returns (etag, result or None)."""
+    with get_pool().transaction():
+        current = f'W/"{get_change_cursor()}"'
+        if etag == current:
+            return current, None
+        return current, func(*args)
+
+def _run_write_batch(jobs):
+    """Writer thread: runs [(func, args)] in one transaction, one savepoint each; returns [(ok, result)]."""
+    results = []
+    with get_pool().transaction() as conn:
+        for func, args in jobs:
+            conn.execute("SAVEPOINT istek")
+            try:
+                result = func(*args)
+            except Exception as e:
+                conn.execute("ROLLBACK TO istek")
+                results.append((False, e))
+            else:
+                if result is False:  # the data functions report a failed write this way
+                    conn.execute("ROLLBACK TO istek")
+                results.append((True, result))
+            conn.execute("RELEASE istek")
+    return results
+
+
+class BankServer:
+    ROUTES = (
+        ("GET", r"/api/durum", "get_status"),
+        ("GET", r"/api/sorular", "list_questions"),
+        ("POST", r"/api/sorular", "create_question"),
+        ("GET", r"/api/sorular/(\d+)", "get_question"),
+        ("PUT", r"/api/sorular/(\d+)", "replace_question"),
+        ("DELETE", r"/api/sorular/(\d+)", "remove_question"),
+        ("GET", r"/api/ara", "search"),
+        ("GET", r"/api/kategoriler", "list_categories"),
+        ("GET", r"/api/istatistik", "statistics"),
+        ("GET", r"/api/anlik", "snapshot"),
+        ("GET", r"/api/degisiklikler", "changes"),
+        ("POST", r"/api/benzer", "similar"),
+        ("POST", r"/api/sinav", "exam"),
+        ("POST", r"/api/toplu", "batch"),
+        ("GET", r"/api/ekler/([0-9a-f]{64})", "get_attachment"),
+        ("POST", r"/api/ekler", "create_attachment"),
+        ("GET", r"/api/performans", "performance"),
+        ("POST", r"/api/performans", "configure_performance"),
+    )
+
+    def __init__(self, readers=SERVER_READERS, max_write_batch=MAX_WRITE_BATCH):
+        self.max_write_batch = max_write_batch
+        self.readers = ThreadPoolExecutor(readers, thread_name_prefix="soru-okuyucu")
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix="soru-yazici")
+        self.write_queue = None
+        self.write_batches = 0
+        self.writes = 0
+        self._routes = [(method, re.compile(pattern + "$"), getattr(self, name), f"http.{name}")
+                        for method, pattern, name in self.ROUTES]
+
+    async def read(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, func, *args)
+
+    async def write(self, func, *args):
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((func, args, future))
+        ok, result = await future
+        if not ok:
+            raise result
+        return result
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self.write_queue.get()]
+            while len(jobs) < self.max_write_batch and not self.write_queue.empty():
+                jobs.append(self.write_queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self.writer, _run_write_batch, [(f, a) for f, a, _ in jobs])
+            except Exception as e:  # the commit itself failed; nothing in the batch was written
+                results = [(False, e)] * len(jobs)
+            self.write_batches += 1
+            self.writes += len(jobs)
+            for (_, _, future), result in zip(jobs, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _cached_read(self, request, func, *args):
+        etag, result = await self.read(_read_unless_current, request["if_none_match"], func, *args)
+        if result is None:
+            return HTTPStatus.NOT_MODIFIED, None, etag
+        return HTTPStatus.OK, result, etag
+
+    # Endpoints take (request, *path groups) and return (status, JSON body[, etag]).
+    async def get_status(self, request):
+        def status():
+            return {"imlec": get_change_cursor(), "soru_sayisi": count_questions(), "sema_surumu": get_schema_version()}
+        return HTTPStatus.OK, {**await self.read(status), "yazma": self.writes, "yazma_grubu": self.write_batches}
+
+    async def list_questions(self, request):
+        params = request["params"]
+        sort_column, descending = _sort_params(params)
+        limit = _int_param(params, "limit", 50, 1, MAX_PAGE_SIZE)
+        offset = _int_param(params, "offset", 0)
+        question_filter = _question_filter(request)
+        def page():
+            return {"toplam": count_questions(question_filter),
+                    "sorular": [question_to_dict(row) for row in
+                                get_questions_page(sort_column, descending, limit, offset, question_filter)]}
+        return await self._cached_read(request, page)
+
+    async def get_question(self, request, soru_id):
+        status, rows, etag = await self._cached_read(request, get_questions_by_ids, [int(soru_id)])
+        if status == HTTPStatus.NOT_MODIFIED:
+            return status, None, etag
+        if int(soru_id) not in rows:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Soru bulunamadı: {soru_id}")
+        return status, question_to_dict(rows[int(soru_id)]), etag
+
+    async def create_question(self, request):
+        soru_id = await self.write(add_question_to_db, *_question_args(request["body"]))
+        if not soru_id:
+            raise HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, "Soru eklenirken bir veritabanı hatası oluştu.")
+        return HTTPStatus.CREATED, {"id": soru_id}
+
+    async def replace_question(self, request, soru_id):
+        if not await self.write(update_question, int(soru_id), *_question_args(request["body"])):
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Soru bulunamadı: {soru_id}")
+        return HTTPStatus.OK, {"id": int(soru_id)}
+
+    async def remove_question(self, request, soru_id):
+        if not await self.write(delete_question, int(soru_id)):
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Soru bulunamadı: {soru_id}")
+        return HTTPStatus.NO_CONTENT, None
+
+    async def get_attachment(self, request, ozet):
+        # An attachment never changes under its digest, so the digest is its ETag.
+        etag = f'"{ozet}"'
+        if request["if_none_match"] == etag:
+            return HTTPStatus.NOT_MODIFIED, None, etag
+        attachment = await self.read(get_attachment, ozet)
+        if attachment is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Resim bulunamadı: {ozet}")
+        return HTTPStatus.OK, {"ozet": ozet, "tur": attachment[0],
+                               "veri": base64.b64encode(attachment[1]).decode("ascii")}, etag
+
+    async def create_attachment(self, request):
+        body = request["body"]
+        if not isinstance(body, dict) or not isinstance(body.get("veri"), str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Gövde base64 'veri' alanı olan bir JSON nesnesi olmalı.")
+        try:
+            data = base64.b64decode(body["veri"], validate=True)
+        except binascii.Error:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'veri' geçerli base64 değil.")
+        return HTTPStatus.CREATED, {"ozet": await self.write(add_attachment, data)}
+
+    async def search(self, request):
+        text = request["params"].get("q", "")
+        limit = _int_param(request["params"], "limit", 20, 1, MAX_PAGE_SIZE)
+        return await self._cached_read(
+            request, lambda: {"sorular": [question_to_dict(row) for row in search_questions(text, limit)]})
+
+    async def list_categories(self, request):
+        return await self._cached_read(request, get_category_counts)
+
+    async def statistics(self, request):
+        return await self._cached_read(request, get_statistics)
+
+    async def snapshot(self, request):
+        params = request["params"]
+        sort_column, descending = _sort_params(params)
+        limit = _int_param(params, "limit", 200, 1, MAX_PAGE_SIZE)
+        change_seq, total, rows = await self.read(load_question_snapshot, sort_column, descending,
+                                                  _question_filter(request), limit)
+        return HTTPStatus.OK, {"imlec": change_seq, "toplam": total, "sorular": [question_to_dict(row) for row in rows]}
+
+    async def changes(self, request):
+        params = request["params"]
+        sort_column, descending = _sort_params(params)
+        since = _int_param(params, "since", 0)
+        limit = _int_param(params, "limit", 200, 1, MAX_PAGE_SIZE)
+        max_changes = _int_param(params, "max", 500, 1, 10000)
+        # The client's cursor doubles as an ETag: polling an unchanged bank costs one max(seq) lookup.
+        _, result = await self.read(_read_unless_current, f'W/"{since}"', load_question_changes,
+                                    since, sort_column, descending, _question_filter(request), limit, max_changes)
+        if result is None:
+            return HTTPStatus.OK, {"tur": "yok"}
+        if result[0] == "full":
+            _, change_seq, total, rows = result
+            return HTTPStatus.OK, {"tur": "tam", "imlec": change_seq, "toplam": total,
+                                   "sorular": [question_to_dict(row) for row in rows]}
+        _, change_seq, deleted_positions, inserted_count, updated_rows = result
+        return HTTPStatus.OK, {"tur": "fark", "imlec": change_seq, "silinen_konumlar": deleted_positions,
+                               "eklenen": inserted_count,
+                               "guncellenen": [question_to_dict(row) for row in updated_rows.values()]}
+
+    async def similar(self, request):
+        body = request["body"]
+        if not isinstance(body, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Gövde bir JSON nesnesi olmalı.")
+        soru_metni, secenekler, _, _ = question_from_record(body)
+        # Runs on the writer: the lookup first brings the signature index up to date.
+        matches = await self.write(find_similar_questions, soru_metni, secenekler,
+                                   float(body.get("esik", DUPLICATE_THRESHOLD)), int(body.get("limit", 5)),
+                                   body.get("haric_id"))
+        return HTTPStatus.OK, {"benzerler": [{"id": soru_id, "benzerlik": similarity} for soru_id, similarity in matches]}
+
+    async def exam(self, request):
+        """Body: {"agirliklar": {kategori: sayı veya ağırlık}, "toplam": null, "kitapcik_sayisi": 2, "tohum": null}."""
+        body = request["body"]
+        weights = body.get("agirliklar") if isinstance(body, dict) else None
+        if not isinstance(weights, dict) or not weights:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'agirliklar' bir {kategori: sayı} nesnesi olmalı.")
+        total = body.get("toplam")
+        total = None if total is None else _int_param(body, "toplam", 0, 1)
+        weights = {str(kategori): float(value) if total else int(value) for kategori, value in weights.items()}
+        variants = _int_param(body, "kitapcik_sayisi", 2, 1, 26)
+        seed = body.get("tohum")
+        seed = random.SystemRandom().randrange(2**32) if seed is None else _int_param(body, "tohum", 0)
+
+        def draw():
+            sections = draw_exam_questions(weights, total, random.Random(seed))
+            booklets, answer_key = [], []
+            for label in (booklet_label(i) for i in range(variants)):
+                questions = build_booklet(sections, label, seed)
+                booklets.append({"kitapcik": label, "sorular": [
+                    {"no": number, "soru_id": q[0], "soru_metni": q[1], "secenekler": q[2], "kategori": q[4]}
+                    for number, q in enumerate(questions, start=1)]})
+                answer_key.extend(answer_key_rows(label, questions))
+            return booklets, answer_key
+        booklets, answer_key = await self.read(draw)
+        if not booklets[0]["sorular"]:
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, "Sınava seçilecek soru bulunamadı.")
+        return HTTPStatus.OK, {"tohum": seed, "kitapciklar": booklets, "cevap_anahtari": answer_key}
+
+    async def batch(self, request):
+        """Body: {"istekler": [{"method", "path", "body"}, ...]}; sub-requests run concurrently, so
+        their writes share the writer's group commits, and answers come back in order."""
+        requests = request["body"].get("istekler") if isinstance(request["body"], dict) else None
+        if not isinstance(requests, list) or len(requests) > MAX_BATCH_REQUESTS:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"'istekler' en fazla {MAX_BATCH_REQUESTS} öğelik bir liste olmalı.")
+        async def run(item):
+            if not isinstance(item, dict) or str(item.get("path", "")).startswith("/api/toplu"):
+                return {"durum": HTTPStatus.BAD_REQUEST, "govde": {"hata": "Geçersiz alt istek."}}
+            status, body, _ = await self.dispatch(str(item.get("method", "GET")).upper(), str(item.get("path", "")),
+                                                  item.get("body"), None)
+            return {"durum": status, "govde": body}
+        return HTTPStatus.OK, {"yanitlar": await asyncio.gather(*(run(item) for item in requests))}
+
+    async def performance(self, request):
+        """Span statistics (p50/p95 over recent runs) and counters of this server process."""
+        return HTTPStatus.OK, {
+            "acik": metrics.is_enabled(),
+            "olcumler": [{"ad": name, "sayi": total_count, "toplam_ms": total_ms, "p50_ms": p50, "p95_ms": p95,
+                          "en_cok_ms": max_ms}
+                         for name, total_count, total_ms, p50, p95, max_ms in metrics.span_statistics()],
+            "sayaclar": metrics.counter_values()}
+
+    async def configure_performance(self, request):
+        """Body: {"acik": true/false, "sifirla": false}; switches tracing and optionally clears the figures."""
+        body = request["body"] if isinstance(request["body"], dict) else {}
+        if "acik" in body:
+            metrics.enable(bool(body["acik"]))
+        if body.get("sifirla"):
+            metrics.reset()
+        return await self.performance(request)
+
+    async def dispatch(self, method, target, body, if_none_match):
+        """Returns (status, JSON-able body or None, etag or None)."""
+        url = urlsplit(target)
+        query = parse_qsl(url.query)
+        request = {"params": dict(query), "query": query, "body": body, "if_none_match": if_none_match}
+        allowed = False
+        for route_method, pattern, handler, span_name in self._routes:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            try:
+                with metrics.span(span_name):
+                    result = await handler(request, *match.groups())
+            except HttpError as e:
+                return e.status, {"hata": str(e)}, None
+            except sqlite3.Error as e:
+                log.error("%s %s isteğinde veritabanı hatası: %s", method, url.path, e)
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"hata": str(e)}, None
+            except (ValueError, TypeError, KeyError) as e:
+                return HTTPStatus.BAD_REQUEST, {"hata": f"Geçersiz istek: {e}"}, None
+            return result if len(result) == 3 else (*result, None)
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"hata": f"{method} desteklenmiyor: {url.path}"}, None
+        return HTTPStatus.NOT_FOUND, {"hata": f"Bulunamadı: {url.path}"}, None
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"hata": "Geçersiz istek satırı."}, None, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"hata": "Geçersiz Content-Length başlığı."}, None, False)
+                    break
+                metrics.count("http.requests")
+                metrics.count("http.bytes_in", length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"hata": "İstek gövdesi çok büyük."}, None, False)
+                    break
+                body = None
+                if length:
+                    try:
+                        body = json.loads(await reader.readexactly(length))
+                    except (UnicodeDecodeError, json.JSONDecodeError):
+                        await self._respond(writer, HTTPStatus.BAD_REQUEST, {"hata": "Gövde geçerli bir JSON değil."}, None, keep_alive)
+                        continue
+                status, payload, etag = await self.dispatch(method.upper(), target, body, headers.get("if-none-match"))
+                await self._respond(writer, status, payload, etag, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, etag, keep_alive):
+        status = HTTPStatus(status)
+        data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(data)}",
+                   f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if data:
+            headers.append("Content-Type: application/json; charset=utf-8")
+        if etag:
+            headers.append(f"ETag: {etag}")
+        metrics.count("http.bytes_out", len(data))
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT, ready=None):
+        self.write_queue = asyncio.Queue()
+        # Catch the duplicate index up on the writer thread (in its own batches) before the first write.
+        self.writer.submit(sync_duplicate_index)
+        writer_task = asyncio.create_task(self._writer_loop())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+            self.readers.shutdown(wait=False, cancel_futures=True)
+            self.writer.shutdown(wait=True)
+
+
+def serve(host=SERVER_HOST, port=SERVER_PORT, readers=SERVER_READERS):
+    """Runs the server until interrupted; the database must already be initialized."""
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Soru bankası sunucusu http://{address[0]}:{address[1]} adresinde ({soru_bankasi_core.DB_NAME}, "
+              f"{readers} okuyucu). Durdurmak için Ctrl+C.", flush=True)
+    try:
+        asyncio.run(BankServer(readers).serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import soru_bankasi_core as core
+
+
+@pytest.fixture
+def use_bank(tmp_path, monkeypatch):
+    """use_bank(name) closes the open bank and opens (creating it if needed) tmp_path/name."""
+    def use(name):
+        core.close_db()
+        monkeypatch.setattr(core, "DB_NAME", str(tmp_path / name))
+        core.init_db()
+    yield use
+    core.close_db()
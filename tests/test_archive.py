@@ -0,0 +1,123 @@
+import gzip
+import shutil
+
+import pytest
+
+import soru_bankasi_core as core
+
+OPTIONS = ["Ankara", "İzmir", "Bursa", "Van", "Muş"]
+
+
+def questions():
+    return sorted(row[1] for row in core.get_questions_by_ids(range(1, 1000)).values())
+
+
+@pytest.fixture
+def source(use_bank, tmp_path):
+    """A bank with three questions; returns a function writing an archive of it to tmp_path."""
+    use_bank("kaynak.db")
+    for i in range(3):
+        core.add_question_to_db(f"Soru {i}: Türkiye'nin başkenti hangisidir?", OPTIONS, 0, "Coğrafya")
+
+    def write(name, incremental=False):
+        use_bank("kaynak.db")
+        core.write_archive(str(tmp_path / name), incremental=incremental)
+        return str(tmp_path / name)
+    return write
+
+
+def test_full_archive_round_trip(source, use_bank):
+    path = source("tam.jsonl.gz")
+    expected = questions()
+    use_bank("hedef.db")
+    report = core.apply_archive(path)
+    assert (report.full, report.added) == (True, 3)
+    assert questions() == expected
+
+
+def test_incremental_archive_round_trip(source, use_bank):
+    full = source("tam.jsonl.gz")
+    core.update_question(1, "Soru 0 değişti", OPTIONS, 1, "Coğrafya")
+    core.delete_question(2)
+    core.add_question_to_db("Yeni soru", OPTIONS, 2, "Tarih")
+    incremental = source("artimli.jsonl.gz", incremental=True)
+    expected = questions()
+    use_bank("hedef.db")
+    core.apply_archive(full)
+    report = core.apply_archive(incremental)
+    assert (report.full, report.added, report.deleted) == (False, 1, 1)
+    assert questions() == expected
+
+
+def rewrite_archive(path, edit):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.writelines(edit(lines))
+
+
+@pytest.mark.parametrize("edit", [
+    lambda lines: lines[:-1],
+    lambda lines: lines[:-1] + [lines[-1].replace('"sorular": 3', '"sorular": 2')],
+    lambda lines: lines[:1] + [lines[1].replace("Ankara", "Ankaraa")] + lines[2:],
+], ids=["manifest yok", "manifest bozuk", "kayıt bozuk"])
+def test_corrupted_archive_changes_nothing(source, use_bank, edit):
+    path = source("tam.jsonl.gz")
+    rewrite_archive(path, edit)
+    use_bank("hedef.db")
+    with pytest.raises(ValueError):
+        core.apply_archive(path)
+    assert core.count_questions() == 0
+
+
+def test_truncated_archive_changes_nothing(source, use_bank):
+    path = source("tam.jsonl.gz")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    use_bank("hedef.db")
+    with pytest.raises(ValueError):
+        core.apply_archive(path)
+    assert core.count_questions() == 0
+
+
+def test_incremental_archive_with_gap_is_refused(source, use_bank):
+    full = source("tam.jsonl.gz")
+    core.add_question_to_db("İkinci arşivdeki soru", OPTIONS, 0, "Genel")
+    source("artimli1.jsonl.gz", incremental=True)
+    core.add_question_to_db("Üçüncü arşivdeki soru", OPTIONS, 0, "Genel")
+    second = source("artimli2.jsonl.gz", incremental=True)
+    use_bank("hedef.db")
+    with pytest.raises(ValueError):
+        core.apply_archive(second)
+    core.apply_archive(full)
+    with pytest.raises(ValueError):
+        core.apply_archive(second)
+    assert core.count_questions() == 3
+
+
+def test_applying_twice_changes_nothing(source, use_bank):
+    path = source("tam.jsonl.gz")
+    use_bank("hedef.db")
+    core.apply_archive(path)
+    expected = questions()
+    report = core.apply_archive(path)
+    assert (report.added, report.deleted, report.unchanged) == (0, 0, 3)
+    assert questions() == expected
+
+
+def test_bank_copied_as_file_syncs_both_ways(source, use_bank, tmp_path):
+    path = source("tam.jsonl.gz")
+    core.close_db()
+    shutil.copy(tmp_path / "kaynak.db", tmp_path / "kopya.db")
+    use_bank("kopya.db")
+    with pytest.raises(ValueError):
+        core.apply_archive(path)
+    core.reset_bank_identity()
+    core.add_question_to_db("Kopyada yazılan soru", OPTIONS, 0, "Genel")
+    assert core.apply_archive(path).added == 0
+    core.write_archive(str(tmp_path / "kopya.jsonl.gz"))
+    use_bank("kaynak.db")
+    assert core.apply_archive(str(tmp_path / "kopya.jsonl.gz")).added == 1
+    assert core.count_questions() == 4
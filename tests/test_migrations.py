@@ -0,0 +1,37 @@
+import os
+import shutil
+
+import soru_bankasi_core as core
+
+SHIPPED_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "soru_bankasi.db")
+TRIGGERS = ("sorular_fts_ai", "sorular_fts_au", "sorular_fts_ad",
+            "sorular_changelog_ai", "sorular_changelog_au", "sorular_changelog_ad",
+            "sorular_istatistik_ai", "sorular_istatistik_au", "sorular_istatistik_ad")
+
+
+def test_shipped_v0_bank_migrates(tmp_path, use_bank, monkeypatch):
+    shutil.copy(SHIPPED_DB, tmp_path / "v0.db")
+    use_bank("v0.db")
+    conn = core.get_pool().connection()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == core.SCHEMA_VERSION
+
+    rows = core.get_questions_by_ids([1, 2])
+    assert [(rows[i][1], rows[i][7]) for i in (1, 2)] == [("Soru 1", 0), ("Soru 2", 4)]
+    assert conn.execute("SELECT ad FROM kategoriler").fetchall() == [("Genel",)]
+    assert conn.execute("SELECT count(*) FROM sorular WHERE kategori_id IS NULL").fetchone()[0] == 0
+    assert conn.execute("SELECT soru_id, group_concat(metin, '') FROM secenekler GROUP BY soru_id").fetchall() == \
+        [(1, "ABCDE"), (2, "ABCDE")]
+    triggers = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert triggers.issuperset(TRIGGERS)
+    assert [soru_id for soru_id, *_ in core.search_questions("Soru")] == [1, 2]
+    assert core.get_category_counts() == {"Genel": 2}
+
+    calls = []
+    migrations = [(version, lambda conn, version=version: calls.append(version), None, ())
+                  for version, *_ in core.SCHEMA_MIGRATIONS]
+    monkeypatch.setattr(core, "SCHEMA_MIGRATIONS", migrations)
+    bank_id = core.get_bank_info("banka_kimligi")
+    use_bank("v0.db")
+    assert calls == []
+    assert core.get_bank_info("banka_kimligi") == bank_id
+    assert core.get_category_counts() == {"Genel": 2}